@@ -11,6 +11,7 @@ import os
 import disnake
 import sentry_sdk
 from aiohttp import web
+from core import cache_profiles, codec, metrics
 from disnake.ext import commands
 from logger import VyLogger
 from sentry_sdk.integrations.argv import ArgvIntegration
@@ -20,6 +21,10 @@ from sentry_sdk.integrations.excepthook import ExcepthookIntegration
 from sentry_sdk.integrations.modules import ModulesIntegration
 from sentry_sdk.integrations.stdlib import StdlibIntegration
 from sentry_sdk.integrations.threading import ThreadingIntegration
+from services import cluster, command_cache, ingestion
+from services.backend_client import client as backend_client
+from services.backend_client import set_deadline
+from services.watchdog import watchdog
 
 sentry_sdk.init(
     dsn=os.environ.get("SENTRY_DSN", ""),
@@ -38,21 +43,65 @@ sentry_sdk.init(
 
 logger = VyLogger("default")
 
-intents = disnake.Intents.default()
-# noinspection PyDunderSlots, PyUnresolvedReferences
-intents.message_content = True
-
 command_sync_flags = commands.CommandSyncFlags.default()
 # noinspection PyDunderSlots, PyUnresolvedReferences
 command_sync_flags.sync_commands_debug = False
 
-bot = commands.AutoShardedInteractionBot(
-    intents=intents,
+
+class BibleBot(commands.AutoShardedInteractionBot):
+    """The bot, which also owns the lifecycle of the backend connection pool and the loop watchdog."""
+
+    async def before_identify_hook(self, shard_id, *, initial=False):
+        # In cluster mode, other processes IDENTIFY too, the coordinator keeps us all within the limit.
+        if cluster.enabled:
+            await cluster.wait_for_identify(shard_id)
+        else:
+            await super().before_identify_hook(shard_id, initial=initial)
+
+    async def start(self, *args, **kwargs):
+        await backend_client.open()
+        watchdog.start()
+        await super().start(*args, **kwargs)
+
+    async def close(self):
+        await super().close()
+        watchdog.stop()
+        await backend_client.close()
+
+
+bot = BibleBot(
+    # Intents and gateway caches, see core/cache_profiles.py.
+    **cache_profiles.options(cache_profiles.profile),
     command_sync_flags=command_sync_flags,
     default_install_types=disnake.ApplicationInstallTypes.all(),
     default_contexts=disnake.InteractionContextTypes.all(),
+    # Only set for a worker started by coordinator.py, otherwise every shard runs here.
+    shard_count=cluster.shard_count(),
+    shard_ids=cluster.shard_ids(),
 )
 
+cache_profiles.install(bot._connection, cache_profiles.profile)
+
+# bot.latency is NaN until the first heartbeat has been acknowledged.
+metrics.discord_gateway_latency_seconds.set_function(lambda: bot.latency)
+
+
+@bot.before_slash_command_invoke
+@bot.before_message_command_invoke
+@bot.before_user_command_invoke
+async def start_interaction(inter: disnake.ApplicationCommandInteraction):
+    # Backend calls made while answering share what's left of the interaction's budget.
+    set_deadline(inter.created_at)
+    # Passive detections make room for interactions while they're being answered.
+    ingestion.queue.interaction_started()
+
+
+@bot.after_slash_command_invoke
+@bot.after_message_command_invoke
+@bot.after_user_command_invoke
+async def finish_interaction(inter: disnake.ApplicationCommandInteraction):
+    ingestion.queue.interaction_finished()
+
 
 async def health_check(request):
     return web.Response(
@@ -61,15 +110,56 @@ async def health_check(request):
     )
 
 
+async def metrics_endpoint(request):
+    return web.Response(
+        body=metrics.render(), headers={"Content-Type": metrics.content_type}
+    )
+
+
+async def stats_endpoint(request):
+    # What this process sees, in cluster mode the coordinator adds the workers up.
+    return web.Response(
+        body=codec.dumps(
+            {
+                "guilds": len(bot.guilds),
+                "users": sum(guild.member_count or 0 for guild in bot.guilds),
+                "channels": sum(len(guild.channels) for guild in bot.guilds),
+            }
+        ),
+        content_type="application/json",
+    )
+
+
+async def invalidate_endpoint(request):
+    # Sent by the coordinator when staff reload something in another worker. This server
+    # listens on every interface, only the coordinator on this host may flush the cache.
+    if request.remote not in ("127.0.0.1", "::1"):
+        return web.Response(status=403)
+
+    commands = codec.loads(await request.read()).get("commands")
+
+    if commands is None:
+        command_cache.cache.clear()
+    else:
+        command_cache.cache.invalidate(*commands)
+
+    return web.Response(status=204)
+
+
 async def start_health_server():
     app = web.Application()
     app.router.add_get("/health", health_check)
+    app.router.add_get("/metrics", metrics_endpoint)
+    app.router.add_get("/stats", stats_endpoint)
+    if cluster.enabled:
+        app.router.add_post("/invalidate", invalidate_endpoint)
     app.router.add_get("/", health_check)
     runner = web.AppRunner(app)
     await runner.setup()
-    site = web.TCPSite(runner, "0.0.0.0", 5054)
+    port = int(os.environ.get("HEALTH_PORT", "5054"))
+    site = web.TCPSite(runner, "0.0.0.0", port)
     await site.start()
-    logger.info("Health check server started on port 5054")
+    logger.info(f"Health check server started on port {port}")
 
 
 health_server_started = False
@@ -0,0 +1,93 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Measures /verse's book-name autocomplete on every keystroke of every book name, typed
+# on its own and after an earlier reference, before (a startswith scan over every name
+# for every suffix of the input) and after the prefix index. Neither makes a network
+# call, the experiment lookup the old version made on each keystroke isn't counted.
+#
+# Run from src/BibleBot.Frontend: python -m benchmarks.bench_autocomplete
+
+import time
+from typing import List
+
+from helpers import book_names
+
+
+def previous(names: List[str], string: str) -> List[str]:
+    string_lower = string.lower()
+    suggestions = []
+
+    potential_starts = [0]
+    for i, char in enumerate(string):
+        if char == " " or char == "/":
+            potential_starts.append(i + 1)
+
+    for start_index in reversed(potential_starts):
+        query = string_lower[start_index:].strip()
+        if not query:
+            continue
+
+        if query.isdigit():
+            continue
+
+        prefix = string[:start_index]
+
+        matches = []
+        for name in names:
+            if name.lower().startswith(query):
+                matches.append(prefix + name)
+
+        if matches:
+            suggestions = matches
+            break
+
+    if not string:
+        return names[:25]
+
+    return suggestions[:25]
+
+
+def percentiles(timings: List[float]) -> str:
+    timings.sort()
+    p50 = timings[len(timings) // 2] * 1e6
+    p99 = timings[int(len(timings) * 0.99)] * 1e6
+    return f"p50 {p50:>7.1f} µs   p99 {p99:>7.1f} µs   max {timings[-1] * 1e6:>7.1f} µs"
+
+
+def main():
+    index = book_names.index
+
+    if not index.names:
+        raise SystemExit("book names couldn't be loaded, see BOOK_NAMES_PATH")
+
+    names = sorted(set(index.names))
+    inputs = [
+        before + name[:length]
+        for before in ("", "John 3:16 / ")
+        for name in names
+        for length in range(1, len(name) + 1)
+    ]
+    print(f"{len(names)} book names, {len(inputs)} keystrokes")
+
+    for label, suggest in (
+        ("before", lambda string: previous(names, string)),
+        ("after", index.suggest),
+    ):
+        timings = []
+
+        for string in inputs:
+            start = time.perf_counter()
+            suggest(string)
+            timings.append(time.perf_counter() - start)
+
+        print(f"{label:<7} {percentiles(timings)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Compares one request per passive detection against micro-batched requests,
+# both against the stand-in backend.
+# Run from src/BibleBot.Frontend: python -m benchmarks.bench_batching
+
+import asyncio
+import statistics
+import time
+
+from benchmarks import payloads
+from benchmarks.standin_backend import StandinBackend
+from core import codec
+from services.backend_client import BackendClient
+from services.verse_batcher import VerseBatcher
+
+PORT = 18080
+
+
+async def drive(fetch, messages: int, rate: float):
+    """Sends `messages` detections arriving at `rate` per second, returns per-message latencies."""
+    latencies = []
+
+    async def one(i: int):
+        start = time.perf_counter()
+        await fetch(payloads.request_body(f"John {i % 21 + 1}:{i % 30 + 1}", user_id=i))
+        latencies.append(time.perf_counter() - start)
+
+    # Arrivals are released in 1 ms ticks, asyncio.sleep() can't pace single messages that finely.
+    tasks = []
+    start = time.perf_counter()
+    for i in range(messages):
+        due = start + i / rate
+
+        if due > time.perf_counter():
+            await asyncio.sleep(max(due - time.perf_counter(), 0.001))
+
+        tasks.append(asyncio.ensure_future(one(i)))
+
+    await asyncio.gather(*tasks)
+    return latencies
+
+
+async def run(label: str, make_fetch, messages: int, rate: float):
+    backend = StandinBackend()
+    runner = await backend.start(PORT)
+    client = BackendClient(f"http://127.0.0.1:{PORT}", "token")
+
+    start = time.perf_counter()
+    latencies = await drive(make_fetch(client), messages, rate)
+    elapsed = time.perf_counter() - start
+
+    await client.close()
+    await runner.cleanup()
+
+    latencies.sort()
+    print(
+        f"  {label:<24} {messages / elapsed:>8.0f} msg/s"
+        f" {sum(backend.requests.values()):>6} requests"
+        f" p50 {statistics.median(latencies) * 1000:>7.1f} ms"
+        f" p99 {latencies[int(len(latencies) * 0.99)] * 1000:>7.1f} ms"
+    )
+
+
+def unbatched(client: BackendClient):
+    async def fetch(req_body: dict):
+        async with client.post("/verses/process", json=req_body) as resp:
+            return codec.loads(await resp.read())
+
+    return fetch
+
+
+def batched(max_batch: int, max_delay: float):
+    def make(client: BackendClient):
+        return VerseBatcher(client, max_batch=max_batch, max_delay=max_delay).submit
+
+    return make
+
+
+async def main():
+    for rate in (1000, 4000, 8000):
+        messages = rate * 2
+        print(f"{messages} detections at {rate}/s")
+        await run("one request each", unbatched, messages, rate)
+        await run("batched 16 / 10 ms", batched(16, 0.01), messages, rate)
+        await run("batched 64 / 10 ms", batched(64, 0.01), messages, rate)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
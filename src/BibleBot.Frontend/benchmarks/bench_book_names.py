@@ -0,0 +1,66 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Counts how many of the messages that match the verse pattern would still be sent to the
+# backend once the book name matcher has looked at them, over a synthetic chat corpus,
+# and what the matcher costs per candidate.
+#
+# Run from src/BibleBot.Frontend: python -m benchmarks.bench_book_names [messages]
+
+import sys
+import time
+
+from benchmarks.corpus import messages
+from helpers import book_names, detection
+
+
+def main():
+    if book_names.matcher is None:
+        raise SystemExit("book names couldn't be loaded, see BOOK_NAMES_PATH")
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    corpus = messages(count)
+
+    start = time.perf_counter()
+    book_names._load()
+    print(f"building the matcher took {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    candidates = [
+        clean_msg
+        for clean_msg in map(detection.find_verse_candidate, corpus)
+        if clean_msg is not None
+    ]
+    forwarded = [
+        clean_msg
+        for clean_msg in candidates
+        if book_names.matcher.has_reference(clean_msg)
+    ]
+    rejected = sorted(set(candidates) - set(forwarded))
+
+    print(
+        f"{count} messages, {len(candidates)} match the verse pattern, "
+        f"{len(forwarded)} have a book name and are sent to the backend"
+    )
+    print(
+        f"backend calls saved: {len(candidates) - len(forwarded)} "
+        f"({(len(candidates) - len(forwarded)) / len(candidates):.0%} of candidates)"
+    )
+    print(f"rejected, e.g. {rejected[:3]}")
+
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for clean_msg in candidates:
+            book_names.matcher.has_reference(clean_msg)
+        best = min(best, time.perf_counter() - start)
+
+    print(f"matcher cost: {best / len(candidates) * 1e9:.0f} ns per candidate")
+
+
+if __name__ == "__main__":
+    main()
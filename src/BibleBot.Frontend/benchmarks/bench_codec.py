@@ -0,0 +1,73 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Compares the orjson codec against the previous stdlib path.
+# Run from src/BibleBot.Frontend: python -m benchmarks.bench_codec
+
+import json
+import timeit
+
+from benchmarks import payloads
+from core import codec
+
+
+def stdlib_command(raw: bytes):
+    # What submit_command_raw used to do: decode, copy with replace, then parse.
+    resp_text = raw.decode("utf-8")
+    resp_text = resp_text.replace("\\\\n", "\\n")
+    return json.loads(resp_text)
+
+
+def stdlib_verse(raw: bytes):
+    # aiohttp's resp.json() decodes to str and uses json.loads.
+    return json.loads(raw.decode("utf-8"))
+
+
+def run(label: str, fn, number: int):
+    best = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"  {label:<28} {best * 1e6:>10.1f} µs")
+    return best
+
+
+def main():
+    cases = [
+        ("/search, 40 pages", payloads.search_response(40, fields=5), True),
+        ("/search, 200 pages", payloads.search_response(200, fields=5), True),
+        ("verses, 10", payloads.verse_response(10), False),
+        ("verses, 100", payloads.verse_response(100, words=120), False),
+    ]
+
+    for name, payload, is_command in cases:
+        raw = json.dumps(payload).encode()
+        print(f"{name} ({len(raw) / 1024:.0f} KiB)")
+
+        number = max(10, 2_000_000 // len(raw))
+
+        if is_command:
+            old = run("stdlib decode", lambda: stdlib_command(raw), number)
+            new = run(
+                "orjson decode",
+                lambda: codec.loads(raw, unescape_newlines=True),
+                number,
+            )
+            assert stdlib_command(raw) == codec.loads(raw, unescape_newlines=True)
+        else:
+            old = run("stdlib decode", lambda: stdlib_verse(raw), number)
+            new = run("orjson decode", lambda: codec.loads(raw), number)
+
+        print(f"  {'speedup':<28} {old / new:>10.1f}x")
+
+    body = payloads.request_body()
+    print("request body")
+    old = run("stdlib encode", lambda: json.dumps(body).encode(), 100_000)
+    new = run("orjson encode", lambda: codec.dumps(body), 100_000)
+    print(f"  {'speedup':<28} {old / new:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Compares the per-message cost of deciding what on_message should do with a message,
+# before (a regex compiled and a copy made for every message) and after the prefilter,
+# over a synthetic corpus of chat messages. Both pipelines must agree on every message.
+#
+# Run from src/BibleBot.Frontend: python -m benchmarks.bench_detection [messages]
+
+import re
+import sys
+import time
+
+from benchmarks.corpus import messages
+from helpers import detection
+
+_RESOURCE_GUILD = 238001909716353025
+
+
+def previous(content: str, guild_id: int):
+    clean_msg = content.replace("://", "")
+    verse_regex = re.compile(
+        r" [0-9]{1,3}:[0-9]{1,3}((,[0-9]{1,3})*)?([-–—‒－])?([0-9]{1,3})?((,[0-9]{1,3})*)?(:[0-9]{1,3})?"
+    )
+
+    if verse_regex.search(clean_msg):
+        return ("verse", clean_msg)
+    elif "ccc" in clean_msg.lower():
+        if guild_id in [238001909716353025, 769709969796628500]:
+            match = re.compile(r"ccc [0-9]+(-[0-9]+)?").search(clean_msg.lower())
+            if match:
+                return ("resource", match[0])
+    elif "mh" in clean_msg.lower() or "magnifica humanitas" in clean_msg.lower():
+        if guild_id in [238001909716353025, 769709969796628500]:
+            if "magnifica humanitas" in clean_msg.lower():
+                clean_msg = clean_msg.replace("magnifica humanitas", "mh")
+
+            match = re.compile(r"mh [0-9]+(-[0-9]+)?").search(clean_msg.lower())
+            if match:
+                return ("resource", match[0])
+
+    return None
+
+
+def current(content: str, guild_id: int):
+    verse_msg = detection.find_verse_candidate(content)
+
+    if verse_msg is not None:
+        return ("verse", verse_msg)
+
+    if not detection.resource_detection_enabled(guild_id):
+        return None
+
+    reference = detection.find_resource_reference(detection.clean_content(content))
+    return ("resource", reference) if reference is not None else None
+
+
+def measure(pipeline, corpus, guild_id: int, repeat: int = 5) -> float:
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for content in corpus:
+            pipeline(content, guild_id)
+        best = min(best, time.perf_counter() - start)
+
+    return best / len(corpus) * 1e9
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    corpus = messages(count)
+
+    for guild_id in (_RESOURCE_GUILD, 1):
+        for content in corpus:
+            if previous(content, guild_id) != current(content, guild_id):
+                raise AssertionError(f"pipelines disagree on {content!r}")
+
+    detected = sum(current(content, _RESOURCE_GUILD) is not None for content in corpus)
+    print(f"{count} messages, {detected} with something to respond to")
+
+    for label, guild_id in (("resource guild", _RESOURCE_GUILD), ("other guild", 1)):
+        before = measure(previous, corpus, guild_id)
+        after = measure(current, corpus, guild_id)
+        print(
+            f"{label:<15} before {before:>6.0f} ns/msg   after {after:>6.0f} ns/msg   "
+            f"{before / after:>4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
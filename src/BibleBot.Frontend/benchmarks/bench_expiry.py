@@ -0,0 +1,106 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Compares expiring 10,000 live paginators before (a task per message that sleeps in 5
+# second steps, cancelled and recreated on every click) and after services/expiry.py, on
+# registering them, clicking each once, and the memory they take until they expire.
+#
+# Run from src/BibleBot.Frontend: python -m benchmarks.bench_expiry
+
+import asyncio
+import time
+import tracemalloc
+from functools import partial
+
+from services.expiry import ExpiryScheduler
+
+count = 10_000
+timeout = 180.0
+
+
+class Previous:
+    def __init__(self):
+        self.tasks = {}
+
+    async def _runner(self, key):
+        try:
+            deadline = time.time() + timeout
+
+            while (remaining := deadline - time.time()) > 0:
+                await asyncio.sleep(min(remaining, 5))
+        except asyncio.CancelledError:
+            return
+
+    def schedule(self, key):
+        task = self.tasks.get(key)
+        if task and not task.done():
+            task.cancel()
+        self.tasks[key] = asyncio.create_task(self._runner(key))
+
+    def stop(self):
+        for task in self.tasks.values():
+            task.cancel()
+
+
+class Current:
+    def __init__(self):
+        self.scheduler = ExpiryScheduler()
+
+    async def _expire(self, key):
+        pass
+
+    def schedule(self, key):
+        self.scheduler.schedule(key, timeout, partial(self._expire, key))
+
+    def stop(self):
+        for key in range(count):
+            self.scheduler.cancel(key)
+
+
+async def register(implementation):
+    for key in range(count):
+        implementation.schedule(key)
+
+    # Lets new tasks start and reach their first sleep.
+    await asyncio.sleep(0)
+
+
+async def measure(implementation_type) -> tuple[float, float, float]:
+    implementation = implementation_type()
+    started = time.perf_counter()
+    await register(implementation)
+    registered = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await register(implementation)
+    clicked = time.perf_counter() - started
+    implementation.stop()
+    await asyncio.sleep(0)
+
+    implementation = implementation_type()
+    tracemalloc.start()
+    await register(implementation)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    implementation.stop()
+    await asyncio.sleep(0)
+
+    return registered, clicked, memory
+
+
+async def main():
+    for name, implementation in (("before", Previous), ("after", Current)):
+        registered, clicked, memory = await measure(implementation)
+        print(
+            f"{name:<7} register {registered * 1e3:>7.1f} ms   click {clicked * 1e3:>7.1f} ms   "
+            f"{memory / 1024 / 1024:>5.1f} MiB for {count} paginators"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
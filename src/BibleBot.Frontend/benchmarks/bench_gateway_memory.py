@@ -0,0 +1,285 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Reports the resident memory disnake's gateway state takes per 1,000 guilds under each
+# cache profile in core/cache_profiles.py.
+#
+# Every profile is measured in a fresh interpreter. Synthetic GUILD_CREATE payloads are fed
+# to a ConnectionState set up with the profile's options, through the same parsers the
+# gateway calls, then some traffic: messages in
+# every guild and, when the profile subscribes to them, members joining voice. Payloads
+# only carry what Discord would send with the profile's intents.
+#
+# Run from src/BibleBot.Frontend: python -m benchmarks.bench_gateway_memory [guilds]
+
+import asyncio
+import gc
+import os
+import random
+import subprocess
+import sys
+
+import disnake
+from disnake.state import ConnectionState
+
+from core import cache_profiles
+
+_BOT_ID = 361033318273384449
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def rss() -> int:
+    gc.collect()
+
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * _PAGE_SIZE
+
+
+def snowflake(rng: random.Random) -> int:
+    return rng.randrange(100_000_000_000_000_000, 1_300_000_000_000_000_000)
+
+
+def user(rng: random.Random, user_id: int = None) -> dict:
+    return {
+        "id": str(user_id or snowflake(rng)),
+        "username": f"user{rng.randrange(1_000_000)}",
+        "global_name": None,
+        "discriminator": "0",
+        "avatar": "a" * 32 if rng.random() < 0.7 else None,
+        "bot": user_id == _BOT_ID,
+    }
+
+
+def member(rng: random.Random, roles: list, user_id: int = None) -> dict:
+    return {
+        "user": user(rng, user_id),
+        "nick": None,
+        "roles": rng.sample(roles, min(len(roles), rng.randint(0, 3))),
+        "joined_at": "2021-04-01T12:00:00.000000+00:00",
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+def guild(rng: random.Random, intents: disnake.Intents) -> dict:
+    guild_id = snowflake(rng)
+    role_ids = [str(snowflake(rng)) for _ in range(rng.randint(3, 40))]
+    roles = [
+        {
+            "id": str(guild_id) if i == 0 else role_id,
+            "name": "@everyone" if i == 0 else f"role {i}",
+            "color": 0,
+            "colors": {
+                "primary_color": 0,
+                "secondary_color": None,
+                "tertiary_color": None,
+            },
+            "hoist": False,
+            "position": i,
+            "permissions": "1071698660929",
+            "managed": False,
+            "mentionable": False,
+            "flags": 0,
+        }
+        for i, role_id in enumerate(role_ids)
+    ]
+
+    channels = []
+    for position in range(rng.randint(5, 80)):
+        channel_type = rng.choices((0, 2, 4, 5, 15), weights=(60, 20, 10, 5, 5))[0]
+        channels.append(
+            {
+                "id": str(snowflake(rng)),
+                "type": channel_type,
+                "name": f"channel-{position}",
+                "position": position,
+                "parent_id": None,
+                "topic": "a channel topic" if rng.random() < 0.4 else None,
+                "nsfw": False,
+                "rate_limit_per_user": 0,
+                "permission_overwrites": [
+                    {
+                        "id": rng.choice(role_ids),
+                        "type": 0,
+                        "allow": "1024",
+                        "deny": "2048",
+                    }
+                    for _ in range(rng.randint(0, 3))
+                ],
+            }
+        )
+
+    text_channels = [c["id"] for c in channels if c["type"] == 0]
+    voice_channels = [c["id"] for c in channels if c["type"] == 2]
+
+    # Without the members intent, GUILD_CREATE only has the bot's own member and those
+    # in voice channels, and the latter only with the voice states intent.
+    members = [member(rng, role_ids[1:], _BOT_ID)]
+    voice_states = []
+
+    if intents.voice_states and voice_channels:
+        for _ in range(rng.choice((0, 0, 0, 1, 3, 8))):
+            voice_member = member(rng, role_ids[1:])
+            members.append(voice_member)
+            voice_states.append(
+                voice_state(rng, voice_member, rng.choice(voice_channels))
+            )
+
+    return {
+        "id": str(guild_id),
+        "name": f"guild {guild_id}",
+        "icon": "b" * 32,
+        "owner_id": str(snowflake(rng)),
+        "features": ["COMMUNITY"] if rng.random() < 0.2 else [],
+        "member_count": int(rng.lognormvariate(4, 1.5)) + 1,
+        "large": False,
+        "unavailable": False,
+        "roles": roles,
+        "channels": channels,
+        "threads": [],
+        "members": members,
+        "voice_states": voice_states,
+        "presences": [],
+        "emojis": [
+            {
+                "id": str(snowflake(rng)),
+                "name": f"emoji{i}",
+                "roles": [],
+                "require_colons": True,
+                "managed": False,
+                "animated": False,
+                "available": True,
+            }
+            for i in range(rng.choice((0, 5, 20, 50)))
+        ],
+        "stickers": [],
+        "stage_instances": [],
+        "guild_scheduled_events": [],
+        "_text_channels": text_channels,
+        "_voice_channels": voice_channels,
+    }
+
+
+def voice_state(rng: random.Random, voice_member: dict, channel_id: str) -> dict:
+    return {
+        "channel_id": channel_id,
+        "user_id": voice_member["user"]["id"],
+        "member": voice_member,
+        "session_id": "c" * 32,
+        "deaf": False,
+        "mute": False,
+        "self_deaf": False,
+        "self_mute": rng.random() < 0.5,
+        "self_video": False,
+        "suppress": False,
+    }
+
+
+def message(rng: random.Random, guild_id: str, channel_id: str, roles: list) -> dict:
+    author = member(rng, roles)
+
+    return {
+        "id": str(snowflake(rng)),
+        "type": 0,
+        "guild_id": guild_id,
+        "channel_id": channel_id,
+        "author": author.pop("user"),
+        "member": author,
+        "content": "and the LORD said unto them behold I am with you always " * 2,
+        "timestamp": "2026-10-18T12:00:00.000000+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+    }
+
+
+def measure(profile: str, guilds: int, seed: int = 0):
+    """Runs in the child process, prints the profile's footprint."""
+    rng = random.Random(seed)
+    options = cache_profiles.options(profile)
+    intents = options["intents"]
+    state = ConnectionState(
+        dispatch=lambda *args, **kwargs: None,
+        handlers={},
+        hooks={},
+        http=None,
+        loop=asyncio.new_event_loop(),
+        **{key: value for key, value in options.items() if key != "intents"},
+        intents=intents,
+    )
+    state.user = disnake.ClientUser(state=state, data=user(rng, _BOT_ID))
+    cache_profiles.install(state, profile)
+
+    payloads = [guild(rng, intents) for _ in range(guilds)]
+    before = rss()
+
+    for payload in payloads:
+        text_channels = payload.pop("_text_channels")
+        voice_channels = payload.pop("_voice_channels")
+        payload["_traffic"] = (text_channels, voice_channels)
+        state.parsers["GUILD_CREATE"](payload)
+
+    after_guilds = rss()
+
+    for payload in payloads:
+        text_channels, voice_channels = payload.pop("_traffic")
+        role_ids = [role["id"] for role in payload["roles"][1:]]
+
+        for channel_id in rng.sample(text_channels, min(len(text_channels), 3)):
+            state.parsers["MESSAGE_CREATE"](
+                message(rng, payload["id"], channel_id, role_ids)
+            )
+
+        if intents.voice_states and voice_channels and rng.random() < 0.3:
+            voice_member = member(rng, role_ids)
+            data = voice_state(rng, voice_member, rng.choice(voice_channels))
+            data["guild_id"] = payload["id"]
+            state.parsers["VOICE_STATE_UPDATE"](data)
+
+    del payloads
+    after_traffic = rss()
+
+    print(after_guilds - before, after_traffic - before)
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        measure(sys.argv[2], int(sys.argv[3]))
+        return
+
+    guilds = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    print(f"{guilds} guilds, memory per 1,000 guilds")
+
+    results = {}
+    for profile in cache_profiles.profiles:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_gateway_memory"]
+            + ["--child", profile, str(guilds)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results[profile] = [int(value) for value in output.split()]
+
+    baseline = results["default"][1]
+    for profile, (after_guilds, after_traffic) in results.items():
+        print(
+            f"{profile:<12} after GUILD_CREATE {after_guilds / guilds * 1000 / 2**20:>6.2f} MiB   "
+            f"after traffic {after_traffic / guilds * 1000 / 2**20:>6.2f} MiB   "
+            f"{after_traffic / baseline:>5.0%} of default"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Compares rendering straight from decoded dicts against decoding to models first.
+# Run from src/BibleBot.Frontend: python -m benchmarks.bench_models
+
+import timeit
+
+from benchmarks import payloads
+from core import codec, constants
+from core.models import decode_response
+
+
+def render_dicts(resp_body: dict) -> list[str]:
+    # What submit_verse_raw used to do for the blockquote style.
+    processed_verses = []
+
+    for verse in resp_body["verses"]:
+        reference_title = (
+            verse["reference"]["asString"]
+            + " - "
+            + verse["reference"]["version"]["name"]
+        )
+        verse_title = (
+            ("**" + verse["title"] + "**\n> \n> ") if len(verse["title"]) > 0 else ""
+        )
+
+        processed_verses.append(
+            f"**{reference_title}**\n\n> {verse_title}{verse['text']}\n\n-# {constants.logo_emoji}  {resp_body['cultureFooter']}"
+            + (
+                f" ∙ [{constants.publisher_to_url[verse['reference']['version']['publisher']]['name']}](<{constants.publisher_to_url[verse['reference']['version']['publisher']]['url']}>)"
+                if verse["reference"]["version"]["publisher"] is not None
+                else ""
+            )
+        )
+
+    return processed_verses
+
+
+def render_models(resp_body: dict) -> list[str]:
+    resp = decode_response(resp_body)
+    footer = resp.culture_footer
+    processed_verses = []
+
+    for verse in resp.verses:
+        verse_title = (
+            ("**" + verse.title + "**\n> \n> ") if len(verse.title) > 0 else ""
+        )
+        publisher = verse.reference.version.publisher
+        suffix = ""
+
+        if publisher is not None:
+            publisher_info = constants.publisher_to_url[publisher]
+            suffix = f" ∙ [{publisher_info['name']}](<{publisher_info['url']}>)"
+
+        processed_verses.append(
+            f"**{verse.reference_title}**\n\n> {verse_title}{verse.text}\n\n-# {constants.logo_emoji}  {footer}"
+            + suffix
+        )
+
+    return processed_verses
+
+
+def run(label: str, fn, number: int):
+    best = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"  {label:<28} {best * 1e6:>10.1f} µs")
+    return best
+
+
+def main():
+    for count in (1, 10, 100):
+        resp_body = codec.loads(
+            codec.dumps(payloads.verse_response(count, "blockquote"))
+        )
+        assert render_dicts(resp_body) == render_models(resp_body)
+
+        print(f"{count} verses")
+        number = max(100, 20_000 // count)
+        run("dicts", lambda: render_dicts(resp_body), number)
+        run("decode to models + render", lambda: render_models(resp_body), number)
+        run("decode to models only", lambda: decode_response(resp_body), number)
+
+
+if __name__ == "__main__":
+    main()
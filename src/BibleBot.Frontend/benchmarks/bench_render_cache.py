@@ -0,0 +1,63 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Renders verse containers for a stream of requests where a few passages (the daily
+# verse, John 3:16, ...) are asked for far more often than the rest, with the render
+# cache disabled and enabled, and reports the cost per render and the hit ratio.
+#
+# Run from src/BibleBot.Frontend: python -m benchmarks.bench_render_cache [renders] [passages]
+
+import random
+import sys
+import time
+
+from benchmarks import payloads
+from core.models import decode_response
+from services import render_cache
+from ui import renderers
+
+
+def measure(verses, stream, footer: str, max_bytes: int):
+    render_cache.cache = render_cache.RenderCache(max_bytes)
+
+    start = time.perf_counter()
+    for index in stream:
+        renderers.convert_verse_to_container(verses[index], footer)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / len(stream) * 1e6, render_cache.cache
+
+
+def main():
+    renders = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    passages = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+
+    resp = decode_response(payloads.verse_response(passages))
+    rng = random.Random(0)
+    # Zipf-like popularity: the n-th most popular passage is asked for ~1/n as often.
+    stream = rng.choices(
+        range(passages), weights=[1 / (n + 1) for n in range(passages)], k=renders
+    )
+    print(f"{renders} renders of {passages} passages")
+
+    uncached, _ = measure(resp.verses, stream, resp.culture_footer, 0)
+    print(f"uncached           {uncached:>6.2f} µs/render")
+
+    for megabytes in (1, 16):
+        cached, cache = measure(
+            resp.verses, stream, resp.culture_footer, megabytes * 1024 * 1024
+        )
+        print(
+            f"cached, {megabytes:>2} MiB cap  {cached:>6.2f} µs/render   "
+            f"hit ratio {cache.hit_ratio():>4.0%}   {len(cache)} renders kept in "
+            f"{cache.bytes / 2**20:.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Counts the /verses/process calls made for bursts of the same reference, with and
+# without coalescing identical in-flight requests (backend.verse_flights, keyed by
+# backend._verse_flight_key). Requests arrive spread evenly over 100 ms and the backend
+# takes 120 ms to answer each one.
+#
+# The key is per user and guild: the backend resolves preferences, opt-outs and verse
+# metrics per user, so a reference posted by many different users is never coalesced,
+# and the first scenario shows no reduction on purpose. Neither does the last, commands
+# aren't coalesced with passive detections.
+#
+# Run from src/BibleBot.Frontend: python -m benchmarks.bench_singleflight
+
+import asyncio
+from typing import List
+
+from services import backend
+
+latency = 0.12
+spread = 0.1
+
+
+def _request(user_id: int, guild_id: int, channel_id: int, body: str) -> dict:
+    return {
+        "UserId": user_id,
+        "GuildId": guild_id,
+        "ChannelId": channel_id,
+        "ThreadId": 0,
+        "IsThread": False,
+        "IsBot": False,
+        "IsDM": False,
+        "Body": body,
+    }
+
+
+scenarios = {
+    # 200 users in 50 guilds posting John 3:16 at once.
+    "many users, one reference": [
+        (_request(user, user % 50, user, "John 3:16"), False) for user in range(200)
+    ],
+    # 20 users each posting a reference to 10 channels of their guild (announcements,
+    # a streamer's chat and its mirror channels).
+    "cross-posted to 10 channels": [
+        (_request(user, user, user * 100 + channel, f"Psalm {user}:1"), False)
+        for user in range(20)
+        for channel in range(10)
+    ],
+    # 100 users sending their message twice while the first is in flight, the second
+    # time with different whitespace.
+    "resent while in flight": [
+        (_request(user, user, user, "Romans 8:28 " + " " * repeat), False)
+        for user in range(100)
+        for repeat in range(2)
+    ],
+    # A /verse command for the same reference a passive detection is waiting on, which
+    # mustn't wait in the detection's batch window.
+    "command beside a detection (kept apart)": [
+        (_request(user, user, user, "Genesis 1:1"), is_command)
+        for user in range(100)
+        for is_command in (False, True)
+    ],
+}
+
+
+async def run(requests: List[tuple], coalesce: bool) -> int:
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(latency)
+
+    async def submit(index: int, req_body: dict, is_command: bool):
+        await asyncio.sleep(spread * index / len(requests))
+
+        if coalesce:
+            key = backend._verse_flight_key(req_body, is_command)
+            await backend.verse_flights.do(key, fetch)
+        else:
+            await fetch()
+
+    await asyncio.gather(
+        *(submit(index, *request) for index, request in enumerate(requests))
+    )
+    return calls
+
+
+async def main():
+    for name, requests in scenarios.items():
+        before = await run(requests, coalesce=False)
+        after = await run(requests, coalesce=True)
+        print(
+            f"{name:<40} {len(requests):>4} requests   before {before:>4} calls   "
+            f"after {after:>4} calls   {1 - after / before:>4.0%} fewer"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Compares rendering verses as message text in the blockquote and code display styles,
+# before (f-strings rebuilt in submit_verse_raw, with a publisher lookup per verse) and
+# after ui/text_renderers.py, on 1-verse and 100-verse responses. Both must render the
+# same text for the synthetic verses, which have no line breaks.
+#
+# Run from src/BibleBot.Frontend: python -m benchmarks.bench_text_render
+
+import timeit
+
+from benchmarks import payloads
+from core import constants
+from core.models import Verse, decode_response
+from ui import text_renderers
+
+
+def _publisher_suffix(verse: Verse) -> str:
+    publisher = verse.reference.version.publisher
+
+    if publisher is None:
+        return ""
+
+    publisher_info = constants.publisher_to_url[publisher]
+
+    if publisher_info is None:
+        return ""
+
+    return f" ∙ [{publisher_info['name']}](<{publisher_info['url']}>)"
+
+
+def previous(verses, display_style: str, footer: str) -> list[str]:
+    processed_verses = []
+
+    if display_style == "blockquote":
+        for verse in verses:
+            verse_title = (
+                ("**" + verse.title + "**\n> \n> ") if len(verse.title) > 0 else ""
+            )
+
+            processed_verses.append(
+                f"**{verse.reference_title}**\n\n> {verse_title}{verse.text}\n\n-# {constants.logo_emoji}  {footer}"
+                + _publisher_suffix(verse)
+            )
+    elif display_style == "code":
+        for verse in verses:
+            verse_title = (verse.title + "\n\n") if len(verse.title) > 0 else ""
+            verse_text = verse.text.replace("*", "")
+
+            processed_verses.append(
+                f"**{verse.reference_title}**\n\n```json\n{verse_title} {verse_text}```\n\n-# {constants.logo_emoji}  {footer}"
+                + _publisher_suffix(verse)
+            )
+
+    return processed_verses
+
+
+def main():
+    for display_style in text_renderers.text_styles:
+        for count in (1, 100):
+            resp = decode_response(payloads.verse_response(count, display_style))
+            args = (resp.verses, display_style, resp.culture_footer)
+            assert previous(*args) == text_renderers.render_verses(*args)
+
+            number = max(100, 50_000 // count)
+            timings = [
+                min(timeit.repeat(lambda: render(*args), number=number, repeat=5))
+                / number
+                for render in (previous, text_renderers.render_verses)
+            ]
+            print(
+                f"{display_style:<10} {count:>3} verses   before {timings[0] * 1e6:>7.2f} µs   "
+                f"after {timings[1] * 1e6:>7.2f} µs   {timings[0] / timings[1]:>4.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
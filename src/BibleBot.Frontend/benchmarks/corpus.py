@@ -0,0 +1,79 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# A synthetic corpus of chat messages, mixed roughly like what a bot in many guilds sees:
+# mostly ordinary chatter, some links, custom emoji and times, and a few verse references.
+
+import random
+
+_CHATTER = [
+    "lol",
+    "good morning everyone",
+    "has anyone started the reading plan yet?",
+    "I'll be a little late tonight, save me a seat",
+    "that's a really good point, I hadn't thought about it like that",
+    "praying for you and your family this week",
+    "does anybody know if the study group is still on for thursday",
+    "thank you so much!!",
+    "ok",
+    "we talked about this in small group and honestly it was a great discussion, "
+    "a lot of people had questions about how the prophets fit into the bigger story",
+    "can someone explain the difference between the two translations",
+    "amen",
+    "welcome to the server! make sure to read the rules channel",
+    "haha yeah",
+    "I think the sermon on sunday covered most of this already",
+]
+
+_LINKS = [
+    "check this out https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "here's the article: https://example.org/blog/2024/03/on-prayer",
+    "https://discord.gg/abcdef",
+    "the notes are at https://docs.google.com/document/d/1AbCdEf/edit",
+]
+
+_EMOJI = [
+    "<:pray:123456789012345678>",
+    "that's great <:heart:876543210987654321> <:heart:876543210987654321>",
+    "good night all <a:wave:111111111111111111>",
+    ":pray: :pray:",
+]
+
+_TIMES = [
+    "meet at 7:30 in the hall",
+    "service starts at 10:00 tomorrow",
+    "the call is 19:00 UTC",
+]
+
+_VERSES = [
+    "John 3:16",
+    "I love Romans 8:28 so much",
+    "read Psalm 23:1-6 tonight",
+    "Genesis 1:1 and John 1:1 go together",
+    "what does Matthew 5:3-12 mean to you?",
+    "Isaiah 40:31 is my favourite",
+]
+
+_RESOURCES = ["see ccc 1234", "ccc 27-30 says it well", "mh 12"]
+
+
+def messages(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    pools = [
+        (_CHATTER, 0.80),
+        (_LINKS, 0.06),
+        (_EMOJI, 0.07),
+        (_TIMES, 0.02),
+        (_VERSES, 0.04),
+        (_RESOURCES, 0.01),
+    ]
+
+    return [
+        rng.choice(rng.choices([pool for pool, _ in pools], [w for _, w in pools])[0])
+        for _ in range(count)
+    ]
@@ -0,0 +1,143 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Synthetic stand-ins for the disnake objects the cogs touch, shaped just enough to be
+# driven through EventListeners.on_message and the VerseCommands handlers without a gateway.
+# Sending to Discord is modelled as a fixed delay and timed, so it can be told apart
+# from time spent in the backend and in the bot itself.
+
+import asyncio
+import itertools
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from disnake import ChannelType, Locale
+
+_ids = itertools.count(1_000_000_000_000_000)
+
+
+class Timings:
+    """Collects how long each stage of handling an event took, in seconds."""
+
+    def __init__(self):
+        self.stages: dict[str, List[float]] = {}
+
+    def record(self, stage: str, seconds: float):
+        self.stages.setdefault(stage, []).append(seconds)
+
+
+class FakeUser:
+    def __init__(self, user_id: Optional[int] = None, bot: bool = False):
+        self.id = user_id if user_id is not None else next(_ids)
+        self.bot = bot
+        self.name = f"user{self.id}"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FakeUser) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+
+class FakeGuild:
+    def __init__(self, guild_id: Optional[int] = None):
+        self.id = guild_id if guild_id is not None else next(_ids)
+        self.me = FakeUser(bot=True)
+
+
+class FakeSentMessage:
+    def __init__(self, channel: "FakeChannel", components):
+        self.id = next(_ids)
+        self.channel = channel
+        self.components = components
+
+    async def edit(self, **kwargs):
+        await self.channel.deliver()
+
+
+class FakeChannel:
+    """A guild text channel, sending costs `send_latency` seconds."""
+
+    type = ChannelType.text
+
+    def __init__(self, guild: FakeGuild, timings: Timings, send_latency: float = 0.05):
+        self.id = next(_ids)
+        self.guild = guild
+        self.parent_id = None
+        self.timings = timings
+        self.send_latency = send_latency
+        self.sent = 0
+
+    async def _get_channel(self) -> "FakeChannel":
+        return self
+
+    async def deliver(self):
+        start = time.perf_counter()
+        await asyncio.sleep(self.send_latency)
+        self.timings.record("discord", time.perf_counter() - start)
+        self.sent += 1
+
+    async def send(self, content=None, components=None, **kwargs) -> FakeSentMessage:
+        await self.deliver()
+        return FakeSentMessage(self, components)
+
+
+class FakeMessage:
+    def __init__(self, content: str, author: FakeUser, channel: FakeChannel):
+        self.id = next(_ids)
+        self.content = content
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild
+        self.webhook_id = None
+        self.created_at = datetime.now(timezone.utc)
+
+
+class FakeFollowup:
+    def __init__(self, channel: FakeChannel):
+        self.channel = channel
+
+    async def send(self, content=None, components=None, **kwargs) -> FakeSentMessage:
+        return await self.channel.send(content, components=components, **kwargs)
+
+
+class FakeResponse:
+    def __init__(self, channel: FakeChannel):
+        self.channel = channel
+        self.deferred = False
+
+    async def defer(self, **kwargs):
+        await self.channel.deliver()
+        self.deferred = True
+
+
+class FakeInteraction:
+    """An application command interaction, deferring and following up both go to Discord."""
+
+    def __init__(self, author: FakeUser, channel: FakeChannel):
+        self.id = next(_ids)
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild
+        self.locale = Locale.en_US
+        self.created_at = datetime.now(timezone.utc)
+        self.response = FakeResponse(channel)
+        self.followup = FakeFollowup(channel)
+        self.authorizing_integration_owners = None
+
+    async def send(self, content=None, **kwargs) -> FakeSentMessage:
+        return await self.followup.send(content, **kwargs)
+
+
+class FakeBot:
+    def __init__(self):
+        self.user = FakeUser(bot=True)
+
+    def is_ready(self) -> bool:
+        return True
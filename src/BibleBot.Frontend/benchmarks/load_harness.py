@@ -0,0 +1,229 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Drives synthetic messages through EventListeners.on_message and /verse interactions
+# through VerseCommands against the stand-in backend, and reports throughput and
+# latency percentiles for each stage:
+#
+#   total    from the event arriving until its handler returned
+#   backend  each backend request, as seen by the bot
+#   discord  each (simulated) send, defer or edit
+#   bot      what's left of `total` for an event, time spent in the bot and its event loop
+#
+# Run from src/BibleBot.Frontend: python -m benchmarks.load_harness --help
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from benchmarks.fakes import (
+    FakeBot,
+    FakeChannel,
+    FakeGuild,
+    FakeInteraction,
+    FakeMessage,
+    FakeUser,
+    Timings,
+)
+from benchmarks.standin_backend import StandinBackend
+from cogs.events import EventListeners
+from cogs.verse_cmds import VerseCommands
+from services import backend_client, ingestion
+
+_BOOKS = ["Genesis", "Exodus", "Psalms", "Isaiah", "Matthew", "John", "Romans"]
+
+# The stage times of the event being handled, backend and Discord time is added as it's spent.
+current_event: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "current_event", default=None
+)
+
+
+class EventTimings(Timings):
+    def record(self, stage: str, seconds: float):
+        super().record(stage, seconds)
+        event = current_event.get()
+
+        if event is not None:
+            event[stage] = event.get(stage, 0.0) + seconds
+
+
+def time_backend(client: backend_client.BackendClient, timings: Timings):
+    """Records the duration of every request made through `client`."""
+    request = client.request
+
+    @asynccontextmanager
+    async def timed_request(method: str, path: str, **kwargs):
+        start = time.perf_counter()
+
+        try:
+            async with request(method, path, **kwargs) as resp:
+                yield resp
+        finally:
+            timings.record("backend", time.perf_counter() - start)
+
+    client.request = timed_request
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def report(timings: Timings, elapsed: float):
+    print(f"{'stage':<18} {'count':>7} {'per s':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+
+    for stage, values in sorted(timings.stages.items()):
+        values.sort()
+        print(
+            f"{stage:<18} {len(values):>7} {len(values) / elapsed:>8.0f}"
+            + "".join(
+                f" {percentile(values, fraction) * 1000:>6.1f} ms"
+                for fraction in (0.5, 0.95, 0.99)
+            )
+        )
+
+
+async def run(args):
+    timings = EventTimings()
+    standin = StandinBackend(
+        overhead=args.backend_ms / 1000,
+        per_item=args.per_item_ms / 1000,
+        workers=args.workers,
+        verses=args.verses,
+        words=args.words,
+        display_style=args.display_style,
+    )
+    runner = await standin.start(args.port)
+
+    backend_client.client.endpoint = f"http://127.0.0.1:{args.port}"
+    ingestion.queue.concurrency = args.concurrency
+    ingestion.queue.reserved = args.reserved
+    ingestion.queue.max_queued = args.queue_size
+    time_backend(backend_client.client, timings)
+
+    bot = FakeBot()
+    events = EventListeners(bot)
+    verse_cmds = VerseCommands(bot)
+
+    rng = random.Random(args.seed)
+    channels = [
+        FakeChannel(guild, timings, send_latency=args.discord_ms / 1000)
+        for guild in (FakeGuild() for _ in range(args.guilds))
+        for _ in range(args.channels)
+    ]
+    users = [FakeUser() for _ in range(args.users)]
+    references = [
+        f"{rng.choice(_BOOKS)} {rng.randint(1, 50)}:{rng.randint(1, 30)}"
+        for _ in range(args.references)
+    ]
+
+    async def handle(kind: str, handler):
+        stages = {}
+        current_event.set(stages)
+        start = time.perf_counter()
+
+        await handler
+
+        total = time.perf_counter() - start
+        timings.record(f"{kind} total", total)
+        timings.record(
+            f"{kind} bot",
+            total - stages.get("backend", 0.0) - stages.get("discord", 0.0),
+        )
+
+    async def verse_command(inter: FakeInteraction, reference: str):
+        # What the bot's before and after slash command hooks do.
+        backend_client.set_deadline(inter.created_at)
+        ingestion.queue.interaction_started()
+
+        try:
+            await verse_cmds.verse.callback(verse_cmds, inter, reference)
+        finally:
+            ingestion.queue.interaction_finished()
+
+    def next_event():
+        channel = rng.choice(channels)
+        user = rng.choice(users)
+        reference = rng.choice(references)
+
+        if rng.random() < args.interactions:
+            inter = FakeInteraction(user, channel)
+            return handle("/verse", verse_command(inter, reference))
+
+        msg = FakeMessage(f"have a look at {reference} today", user, channel)
+        return handle("message", events.on_message(msg))
+
+    events_total = int(args.rate * args.duration)
+    tasks = []
+    start = time.perf_counter()
+
+    for i in range(events_total):
+        due = start + i / args.rate
+
+        # Arrivals are released in 1 ms ticks, asyncio.sleep() can't pace single events that finely.
+        if due > time.perf_counter():
+            await asyncio.sleep(max(due - time.perf_counter(), 0.001))
+
+        tasks.append(asyncio.ensure_future(next_event()))
+
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{events_total} events at {args.rate:.0f}/s offered, "
+        f"{events_total / elapsed:.0f}/s handled, "
+        f"{sum(standin.requests.values())} backend requests, "
+        f"{ingestion.queue.shed} detections shed"
+    )
+    report(timings, elapsed)
+
+    await backend_client.client.close()
+    await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=float, default=500, help="events per second")
+    parser.add_argument("--duration", type=float, default=10, help="seconds")
+    parser.add_argument(
+        "--interactions",
+        type=float,
+        default=0.1,
+        help="fraction of events that are /verse interactions rather than messages",
+    )
+    parser.add_argument("--guilds", type=int, default=100)
+    parser.add_argument("--channels", type=int, default=5, help="per guild")
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--references", type=int, default=2000)
+    parser.add_argument("--discord-ms", type=float, default=50.0)
+    parser.add_argument("--backend-ms", type=float, default=5.0)
+    parser.add_argument("--per-item-ms", type=float, default=0.5)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--verses", type=int, default=1)
+    parser.add_argument("--words", type=int, default=60)
+    parser.add_argument(
+        "--display-style", choices=("embed", "blockquote", "code"), default="embed"
+    )
+    parser.add_argument("--concurrency", type=int, default=ingestion.queue.concurrency)
+    parser.add_argument("--reserved", type=int, default=ingestion.queue.reserved)
+    parser.add_argument("--queue-size", type=int, default=ingestion.queue.max_queued)
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Every handled verse is logged at INFO, which would drown out the report.
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
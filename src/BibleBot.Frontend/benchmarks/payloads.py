@@ -0,0 +1,131 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Synthetic backend payloads, shaped like BibleBot.Models' VerseResponse and CommandResponse.
+
+import random
+
+_WORDS = (
+    "and the LORD said unto them behold I am with you always even unto the end "
+    "of the world for God so loved that he gave his only begotten Son whosoever "
+    "believeth in him should not perish but have everlasting life"
+).split()
+
+_BOOKS = ["Genesis", "Psalms", "Isaiah", "Matthew", "John", "Romans", "Hebrews"]
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def verse(
+    rng: random.Random, words: int = 60, version: str = "RSV", publisher=None
+) -> dict:
+    book = rng.choice(_BOOKS)
+    chapter = rng.randint(1, 50)
+    start = rng.randint(1, 20)
+
+    return {
+        "reference": {
+            "asString": f"{book} {chapter}:{start}-{start + 3}",
+            "startingChapter": chapter,
+            "startingVerse": start,
+            "endingChapter": chapter,
+            "endingVerse": start + 3,
+            "isOT": False,
+            "isNT": True,
+            "isDEU": False,
+            "version": {
+                "id": version,
+                "name": f"Revised Standard Version ({version})",
+                "source": "bg",
+                "publisher": publisher,
+                "locale": "en",
+            },
+        },
+        "title": _text(rng, 4) if rng.random() < 0.3 else "",
+        "psalmTitle": "",
+        "text": " ".join(
+            f"<**{i}**> {_text(rng, words // 4)}" for i in range(start, start + 4)
+        ),
+    }
+
+
+def verse_response(
+    count: int, display_style: str = "embed", words: int = 60, seed: int = 0
+) -> dict:
+    rng = random.Random(seed)
+
+    return {
+        "ok": True,
+        "logStatement": f"{count} verses fetched",
+        "type": "verse",
+        "culture": "en-US",
+        "cultureFooter": "BibleBot {0} by Kerygma Digital",
+        "verses": [
+            verse(rng, words, publisher=rng.choice([None, "biblica", "lockman"]))
+            for _ in range(count)
+        ],
+        "displayStyle": display_style,
+        "paginate": count > 1,
+    }
+
+
+def embed(rng: random.Random, fields: int = 5) -> dict:
+    return {
+        "title": 'Search results for "love"',
+        "type": "rich",
+        "description": "Page 1 of 40",
+        "url": None,
+        "color": 6709986,
+        "footer": {"text": "BibleBot v9.3 by Kerygma Digital", "icon_url": None},
+        "image": None,
+        "thumbnail": None,
+        "video": None,
+        "provider": None,
+        "author": None,
+        "fields": [
+            {
+                # Command responses carry the double-escaped newlines that the codec unescapes.
+                "name": f"{rng.choice(_BOOKS)} {rng.randint(1, 50)}:{rng.randint(1, 30)}",
+                "value": _text(rng, 30) + "\\n" + _text(rng, 20),
+                "inline": False,
+                "add_separator_after": False,
+            }
+            for _ in range(fields)
+        ],
+    }
+
+
+def search_response(pages: int, fields: int = 5, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+
+    return {
+        "ok": True,
+        "logStatement": "+search love",
+        "type": "cmd",
+        "culture": "en-US",
+        "cultureFooter": None,
+        "pages": [embed(rng, fields) for _ in range(pages)],
+        "createWebhook": False,
+        "removeWebhook": False,
+        "sendAnnouncement": False,
+    }
+
+
+def request_body(body: str = "John 3:16", user_id: int = 186046294286925824) -> dict:
+    return {
+        "UserId": user_id,
+        "GuildId": 238001909716353025,
+        "ChannelId": 769709969796628500,
+        "ThreadId": 769709969796628500,
+        "IsThread": False,
+        "IsBot": False,
+        "IsDM": False,
+        "Body": body,
+    }
@@ -0,0 +1,120 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# A local stand-in for the backend's verse endpoints, for measuring the frontend without it.
+# Run from src/BibleBot.Frontend: python -m benchmarks.standin_backend [--port 18080]
+#
+# The backend's cost is modelled as a fixed overhead per HTTP request (auth, middleware,
+# preference lookups) plus a small cost per verse request, spent while holding one of a
+# limited number of workers. Every request is answered with the same synthetic verses.
+
+import argparse
+import asyncio
+from collections import Counter
+
+from aiohttp import web
+
+from benchmarks import payloads
+from core import codec
+
+
+class StandinBackend:
+    def __init__(
+        self,
+        overhead: float = 0.002,
+        per_item: float = 0.0002,
+        workers: int = 8,
+        verses: int = 1,
+        words: int = 60,
+        display_style: str = "embed",
+    ):
+        self.overhead = overhead
+        self.per_item = per_item
+        self.workers = asyncio.Semaphore(workers)
+        self.requests: Counter = Counter()
+        self.items = 0
+        self._response = {
+            **payloads.verse_response(verses, display_style, words),
+            "paginate": False,
+        }
+
+    async def _work(self, items: int):
+        async with self.workers:
+            await asyncio.sleep(self.overhead + self.per_item * items)
+
+        self.items += items
+
+    def _answer(self, req_body: dict) -> dict:
+        return {**self._response, "logStatement": req_body["Body"]}
+
+    async def verses_process(self, request: web.Request) -> web.Response:
+        self.requests["/verses/process"] += 1
+        req_body = codec.loads(await request.read())
+        await self._work(1)
+
+        return web.Response(
+            body=codec.dumps(self._answer(req_body)), content_type="application/json"
+        )
+
+    async def verses_batch(self, request: web.Request) -> web.Response:
+        self.requests["/verses/batch"] += 1
+        req_bodies = codec.loads(await request.read())
+        await self._work(len(req_bodies))
+
+        return web.Response(
+            body=codec.dumps([self._answer(req_body) for req_body in req_bodies]),
+            content_type="application/json",
+        )
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/verses/process", self.verses_process)
+        app.router.add_post("/verses/batch", self.verses_batch)
+        return app
+
+    async def start(self, port: int) -> web.AppRunner:
+        runner = web.AppRunner(self.create_app())
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        return runner
+
+
+async def serve(port: int, **kwargs):
+    await StandinBackend(**kwargs).start(port)
+    print(f"stand-in backend listening on http://127.0.0.1:{port}")
+    await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--overhead-ms", type=float, default=2.0)
+    parser.add_argument("--per-item-ms", type=float, default=0.2)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--verses", type=int, default=1)
+    parser.add_argument("--words", type=int, default=60)
+    parser.add_argument(
+        "--display-style", choices=("embed", "blockquote", "code"), default="embed"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(
+        serve(
+            args.port,
+            overhead=args.overhead_ms / 1000,
+            per_item=args.per_item_ms / 1000,
+            workers=args.workers,
+            verses=args.verses,
+            words=args.words,
+            display_style=args.display_style,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,21 +6,21 @@ License, v. 2.0. If a copy of the MPL was not distributed with this file,
 You can obtain one at https://mozilla.org/MPL/2.0/.
 """
 
-import os
-import re
+from typing import Optional
 
-import aiohttp
 import disnake
 from disnake import Thread, DMChannel, GroupChannel
 
 from core import constants
 from disnake.ext import commands
-from helpers import sending
+from helpers import detection, sending
 from logger import VyLogger
-from services import backend
+from services import backend, ingestion, webhooks
+from services.backend_client import client, set_deadline
 from ui.confirmation_prompt import ConfirmationPrompt
 from ui.helpfulness_prompt import HelpfulnessPrompt
 from ui.paginator import ComponentPaginator
+from ui.renderers import LazyPages
 
 logger = VyLogger("default")
 
@@ -93,33 +93,31 @@ class EventListeners(commands.Cog):
     #         # the only other scenario here is that they've removed Manage Webhooks perms
     #         pass
 
+    @commands.Cog.listener()
+    async def on_webhooks_update(self, ch: disnake.abc.GuildChannel):
+        webhooks.owned_webhooks.invalidate(ch.id)
+
     @commands.Cog.listener()
     async def on_guild_remove(self, guild: disnake.Guild):
         if self.bot.is_ready():
             # yeet the webhook from the database, if applicable
             req_body = {"GuildId": guild.id, "Body": "delete"}
 
-            endpoint = os.environ.get("ENDPOINT")
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{endpoint}/webhooks/process",
-                    json=req_body,
-                    headers={"Authorization": os.environ.get("ENDPOINT_TOKEN", "")},
-                ) as resp:
-                    if resp.status == 200:
-                        logger.info(
-                            f"<global@{guild.id}#global> we've left this server, deleting webhook..."
-                        )
+            async with client.post("/webhooks/process", json=req_body) as resp:
+                if resp.status == 200:
+                    logger.info(
+                        f"<global@{guild.id}#global> we've left this server, deleting webhook..."
+                    )
 
     @commands.Cog.listener()
     async def on_button_click(self, inter: disnake.MessageInteraction):
+        set_deadline(inter.created_at)
         await inter.response.defer()
         if not inter.data or not getattr(inter.data, "custom_id", None):
             return
 
         if inter.data.custom_id.startswith("pagination:"):
-            await ComponentPaginator.handle_click(inter)
+            await ComponentPaginator.handle_click(inter, backend.fetch_pages)
         elif inter.data.custom_id.startswith("confirmation:"):
             await ConfirmationPrompt.handle_click(inter)
         elif inter.data.custom_id.startswith("helpfulness:"):
@@ -130,76 +128,65 @@ class EventListeners(commands.Cog):
         if msg.author == self.bot.user:
             return
 
+        set_deadline(msg.created_at)
+
+        verse_msg = detection.find_verse_candidate(msg.content)
+
+        if verse_msg is not None and not detection.has_book_name(verse_msg):
+            verse_msg = None
+
+        resource_reference = None
+
+        if verse_msg is None:
+            if not detection.resource_detection_enabled(
+                msg.guild.id if msg.guild else None
+            ):
+                return
+
+            resource_reference = detection.find_resource_reference(
+                detection.clean_content(msg.content)
+            )
+
+            if resource_reference is None:
+                return
+
+        # Only messages with something to respond to are worth fetching the channel's webhooks for.
         if msg.webhook_id is not None and self.bot.is_ready():
-            try:
-                if not isinstance(msg.channel, (Thread, DMChannel, GroupChannel)) and msg.channel.webhooks is not None:
-                    webhooks = await msg.channel.webhooks()
-                    for webhook in webhooks:
-                        if webhook.id == msg.webhook_id:
-                            if webhook.user is not None and webhook.user.id == self.bot.user.id:
-                                return
-            except (AttributeError, disnake.errors.Forbidden, disnake.errors.DiscordServerError):
-                pass
-
-        clean_msg = msg.content.replace("://", "")
-        verse_regex = re.compile(
-            r" [0-9]{1,3}:[0-9]{1,3}((,[0-9]{1,3})*)?([-–—‒－])?([0-9]{1,3})?((,[0-9]{1,3})*)?(:[0-9]{1,3})?"
+            if not isinstance(msg.channel, (Thread, DMChannel, GroupChannel)):
+                if await webhooks.is_own_webhook(
+                    msg.channel, msg.webhook_id, self.bot.user.id
+                ):
+                    return
+
+        # Passive detections wait their turn behind interactions and other guilds, or are dropped under load.
+        await ingestion.queue.run_passive(
+            msg.guild.id if msg.guild else None,
+            msg.channel.id,
+            lambda: self.respond_to_message(msg, verse_msg, resource_reference),
         )
 
-        if verse_regex.search(clean_msg):
-            await backend.submit_verse(msg.channel, msg.author, clean_msg)
-        elif "ccc" in clean_msg.lower() and msg.guild:
-            if msg.guild.id in [
-                238001909716353025,
-                769709969796628500,
-                362503610006765568,
-                636984073226813449,
-            ]:
-                reference_regex = re.compile(r"ccc [0-9]+(-[0-9]+)?")
-                reference_regex_match = reference_regex.search(clean_msg.lower())
-                if reference_regex_match:
-                    resp = await backend.submit_command(
-                        msg.channel,
-                        msg.author,
-                        f"+resource {reference_regex_match[0]}",
-                    )
+    async def respond_to_message(
+        self,
+        msg: disnake.Message,
+        verse_msg: Optional[str],
+        resource_reference: Optional[str],
+    ):
+        if verse_msg is not None:
+            await backend.submit_verse(msg.channel, msg.author, verse_msg)
+            return
 
-                    if isinstance(resp, list):
-                        if len(resp) > 3:
-                            paginator = ComponentPaginator(resp, msg.author.id)
-                            await paginator.send(msg.channel)
-                        else:
-                            await sending.safe_send_channel(
-                                msg.channel, components=resp
-                            )
-                    else:
-                        await sending.safe_send_channel(msg.channel, components=resp)
-        elif ("mh" in clean_msg.lower() or "magnifica humanitas" in clean_msg.lower()) and msg.guild:
-            if msg.guild.id in [
-                238001909716353025,
-                769709969796628500,
-                362503610006765568,
-                636984073226813449,
-            ]:
-                if "magnifica humanitas" in clean_msg.lower():
-                    clean_msg = clean_msg.replace("magnifica humanitas", "mh")
-
-                reference_regex = re.compile(r"mh [0-9]+(-[0-9]+)?")
-                reference_regex_match = reference_regex.search(clean_msg.lower())
-                if reference_regex_match:
-                    resp = await backend.submit_command(
-                        msg.channel,
-                        msg.author,
-                        f"+resource {reference_regex_match[0]}",
-                    )
+        resp = await backend.submit_command(
+            msg.channel,
+            msg.author,
+            f"+resource {resource_reference}",
+        )
 
-                    if isinstance(resp, list):
-                        if len(resp) > 3:
-                            paginator = ComponentPaginator(resp, msg.author.id)
-                            await paginator.send(msg.channel)
-                        else:
-                            await sending.safe_send_channel(
-                                msg.channel, components=resp
-                            )
-                    else:
-                        await sending.safe_send_channel(msg.channel, components=resp)
+        if isinstance(resp, LazyPages):
+            # Sectioned resources are always paginated, as in /resource.
+            if resource_reference.startswith("lsc ") or len(resp) > 3:
+                paginator = ComponentPaginator(resp, msg.author.id)
+                await paginator.send(msg.channel)
+            else:
+                await sending.safe_send_channel(msg.channel, components=resp)
+        else:
+            await sending.safe_send_channel(msg.channel, components=resp)
@@ -17,7 +17,7 @@ from disnake.ext import commands
 from disnake.interactions import ApplicationCommandInteraction
 from helpers import sending
 from logger import VyLogger
-from services import backend
+from services import backend, command_cache
 
 i18n = bb_i18n()
 
@@ -68,24 +68,27 @@ class Information(commands.Cog):
 
         localization = i18n.get_i18n_or_default(inter.locale.name)
 
-        campaigns = patreon_api.fetch_campaign().data()
-        campaign = campaigns[0].id()  # type: ignore
-        pledges = []
-        names = []
-        cursor = None
-
-        while True:
-            pledges_resp = patreon_api.fetch_page_of_pledges(
-                campaign, 25, cursor=cursor
-            )
-            pledges += pledges_resp.data()  # type: ignore
-            cursor = patreon_api.extract_cursor(pledges_resp)
-            if not cursor:
-                break
-
-        names = [
-            x.relationship("patron").attribute("full_name").strip() for x in pledges
-        ]
+        names = command_cache.cache.get("supporters")
+
+        if names is None:
+            campaigns = patreon_api.fetch_campaign().data()
+            campaign = campaigns[0].id()  # type: ignore
+            pledges = []
+            cursor = None
+
+            while True:
+                pledges_resp = patreon_api.fetch_page_of_pledges(
+                    campaign, 25, cursor=cursor
+                )
+                pledges += pledges_resp.data()  # type: ignore
+                cursor = patreon_api.extract_cursor(pledges_resp)
+                if not cursor:
+                    break
+
+            names = [
+                x.relationship("patron").attribute("full_name").strip() for x in pledges
+            ]
+            command_cache.cache.put("supporters", names)
 
         container = disnake.ui.Container()
         container.accent_color = 6709986
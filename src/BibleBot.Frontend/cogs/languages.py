@@ -16,6 +16,7 @@ from logger import VyLogger
 from services import backend
 from ui import renderers as containers
 from ui.paginator import ComponentPaginator
+from ui.renderers import LazyPages
 
 i18n = bb_i18n()
 
@@ -99,7 +100,7 @@ class Languages(commands.Cog):
             inter.channel, inter.author, "+language list"
         )
 
-        if isinstance(resp, list):
+        if isinstance(resp, LazyPages):
             paginator = ComponentPaginator(resp, inter.author.id)
             await paginator.send(inter)
         else:
@@ -14,6 +14,7 @@ from helpers import sending
 from logger import VyLogger
 from services import backend
 from ui.paginator import ComponentPaginator
+from ui.renderers import LazyPages
 
 logger = VyLogger("default")
 
@@ -82,7 +83,7 @@ class Resources(commands.Cog):
 
         resp = await backend.submit_command(inter.channel, inter.author, cmd)
 
-        if isinstance(resp, list):
+        if isinstance(resp, LazyPages):
             if resource in ["lsc"] or len(resp) > 3:
                 paginator = ComponentPaginator(resp, inter.author.id)
                 await paginator.send(inter)
@@ -121,7 +122,7 @@ class Resources(commands.Cog):
             f"+search resource resource:{resource} {query}",
         )
 
-        if isinstance(resp, list):
+        if isinstance(resp, LazyPages):
             paginator = ComponentPaginator(resp, inter.author.id)
             await paginator.send(inter)
         else:
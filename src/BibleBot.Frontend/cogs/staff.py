@@ -16,7 +16,7 @@ from disnake.abc import GuildChannel, PrivateChannel
 from disnake.ext import commands
 from disnake.interactions import ApplicationCommandInteraction
 from helpers import sending
-from services import backend
+from services import backend, cluster, command_cache
 from ui import renderers as containers
 
 from core import checks
@@ -24,6 +24,18 @@ from core import checks
 i18n = bb_i18n()
 
 
+async def _flush_command_cache(*commands: str):
+    """Flushes `commands`, or every cached response if none are given, from every process's command cache."""
+    if commands:
+        command_cache.cache.invalidate(*commands)
+    else:
+        command_cache.cache.clear()
+
+    # Other workers cache the same responses, the coordinator forwards this to all of them.
+    if cluster.enabled:
+        await cluster.invalidate_command_cache(commands or None)
+
+
 class Staff(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -164,6 +176,7 @@ class Staff(commands.Cog):
         resp = await backend.submit_command(
             inter.channel, inter.author, "+staff reload_versions"
         )
+        await _flush_command_cache(*command_cache.VERSION_COMMANDS, "+stats")
         await sending.safe_send_interaction(inter.followup, components=resp)
 
     @commands.slash_command(description=Localized(key="CMD_RELOAD_LANGUAGES_DESC"))
@@ -172,6 +185,8 @@ class Staff(commands.Cog):
         resp = await backend.submit_command(
             inter.channel, inter.author, "+staff reload_languages"
         )
+        # Every cached response is localized, so none of them can be trusted anymore.
+        await _flush_command_cache()
         await sending.safe_send_interaction(inter.followup, components=resp)
 
     @commands.slash_command(description=Localized(key="CMD_RELOAD_EXPERIMENTS_DESC"))
@@ -181,6 +196,8 @@ class Staff(commands.Cog):
         resp = await backend.submit_command(
             inter.channel, inter.author, "+staff reload_experiments"
         )
+        # The backend hands active experiments to every command, any response may differ now.
+        await _flush_command_cache()
 
         await sending.safe_send_interaction(inter.followup, components=resp)
 
@@ -194,13 +211,22 @@ class Staff(commands.Cog):
         modules_to_reload = [
             "logger",
             "core.constants",
+            "core.codec",
+            "core.models",
             "core.i18n",
             "core.checks",
+            "helpers.book_names",
             "helpers.channels",
+            "helpers.custom_ids",
+            "helpers.detection",
             "helpers.sending",
+            "helpers.singleflight",
             "services.webhooks",
             "services.experiments",
+            "services.command_cache",
+            "services.verse_batcher",
             "ui.renderers",
+            "ui.text_renderers",
             "ui.paginator",
             "ui.views",
             "ui.components",
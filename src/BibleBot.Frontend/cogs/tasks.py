@@ -9,6 +9,7 @@ You can obtain one at https://mozilla.org/MPL/2.0/.
 import asyncio
 import os
 import subprocess
+from typing import Optional, Tuple
 
 import aiohttp
 import disnake
@@ -16,9 +17,15 @@ import sentry_sdk
 from core import constants
 from disnake.ext import commands, tasks
 from logger import VyLogger
+from services import cluster
+from services.backend_client import client
 
 logger = VyLogger("default")
 
+# Bot lists get their own short-lived session, a stalled one mustn't take connections from
+# the backend pool or hold up the rest of run_tasks.
+_bot_list_timeout = aiohttp.ClientTimeout(total=30, sock_connect=10)
+
 
 class Tasks(commands.Cog):
     def __init__(self, bot):
@@ -40,6 +47,11 @@ class Tasks(commands.Cog):
         await self._run_safe(
             constants.check_version_changes(self.bot), "check_version_changes"
         )
+
+        # In cluster mode, the first worker reports for the whole cluster.
+        if cluster.enabled and cluster.cluster_id != 0:
+            return
+
         await self._run_safe(self.update_shards(self.bot), "update_shards")
         await self._run_safe(self.send_stats(self.bot), "send_stats")
         await self._run_safe(self.update_topgg(self.bot), "update_topgg")
@@ -60,56 +72,102 @@ class Tasks(commands.Cog):
     async def before_run_tasks(self):
         await self.bot.wait_until_ready()
 
+    async def get_counts(
+        self, bot: disnake.AutoShardedClient
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """Returns the shard, guild, user and channel counts of the whole bot."""
+        if cluster.enabled:
+            stats = await cluster.get_stats()
+
+            if stats is None:
+                return None
+
+            return (
+                stats["shardCount"],
+                stats["guilds"],
+                stats["users"],
+                stats["channels"],
+            )
+
+        return (
+            bot.shard_count,
+            len(bot.guilds),
+            sum([x.member_count for x in bot.guilds]),
+            sum([len(x.channels) for x in bot.guilds]),
+        )
+
     async def update_topgg(self, bot: disnake.AutoShardedClient):
         topgg_auth = os.environ.get("TOPGG_TOKEN")
 
         if topgg_auth:
-            body = {"server_count": len(bot.guilds)}
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"https://top.gg/api/bots/{bot.user.id}/stats",
-                    json=body,
-                    headers={"Authorization": topgg_auth},
-                ) as resp:
-                    if resp.status != 200:
-                        if resp.status != 429:
-                            logger.warning(
-                                "couldn't submit stats to top.gg, it may be offline"
-                            )
-                    else:
-                        logger.info("submitted stats to top.gg")
+            counts = await self.get_counts(bot)
+
+            if counts is None:
+                logger.warning("couldn't count guilds, not submitting stats to top.gg")
+                return
+
+            body = {"server_count": counts[1]}
+            try:
+                async with aiohttp.ClientSession(timeout=_bot_list_timeout) as session:
+                    async with session.post(
+                        f"https://top.gg/api/bots/{bot.user.id}/stats",
+                        json=body,
+                        headers={"Authorization": topgg_auth},
+                    ) as resp:
+                        if resp.status != 200:
+                            if resp.status != 429:
+                                logger.warning(
+                                    "couldn't submit stats to top.gg, it may be offline"
+                                )
+                        else:
+                            logger.info("submitted stats to top.gg")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                logger.warning(f"couldn't reach top.gg to submit stats: {err!r}")
 
     async def update_discordbotlist(self, bot: disnake.AutoShardedClient):
         discordbotlist_auth = os.environ.get("DISCORDBOTLIST_TOKEN")
 
         if discordbotlist_auth:
+            counts = await self.get_counts(bot)
+
+            if counts is None:
+                logger.warning(
+                    "couldn't count guilds, not submitting stats to discordbotlist.com"
+                )
+                return
+
             body = {
-                "users": sum([x.member_count for x in bot.guilds]),
-                "guilds": len(bot.guilds),
+                "users": counts[2],
+                "guilds": counts[1],
             }
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"https://discordbotlist.com/api/v1/bots/{bot.user.id}/stats",
-                    json=body,
-                    headers={"Authorization": discordbotlist_auth},
-                ) as resp:
-                    if resp.status != 200:
-                        if resp.status != 429:
-                            logger.warning(
-                                "couldn't submit stats to discordbotlist.com, it may be offline"
-                            )
-                    else:
-                        logger.info("submitted stats to discordbotlist.com")
+            try:
+                async with aiohttp.ClientSession(timeout=_bot_list_timeout) as session:
+                    async with session.post(
+                        f"https://discordbotlist.com/api/v1/bots/{bot.user.id}/stats",
+                        json=body,
+                        headers={"Authorization": discordbotlist_auth},
+                    ) as resp:
+                        if resp.status != 200:
+                            if resp.status != 429:
+                                logger.warning(
+                                    "couldn't submit stats to discordbotlist.com, it may be offline"
+                                )
+                        else:
+                            logger.info("submitted stats to discordbotlist.com")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                logger.warning(
+                    f"couldn't reach discordbotlist.com to submit stats: {err!r}"
+                )
 
     async def send_stats(self, bot: disnake.AutoShardedClient):
-        endpoint = os.environ.get("ENDPOINT")
-        token = os.environ.get("ENDPOINT_TOKEN", "")
-
         try:
-            shard_count = bot.shard_count
-            guild_count = len(bot.guilds)
-            user_count = sum([x.member_count for x in bot.guilds])
-            channel_count = sum([len(x.channels) for x in bot.guilds])
+            counts = await self.get_counts(bot)
+
+            if counts is None:
+                logger.error("couldn't get the cluster's stats, bailing out")
+                return
+
+            shard_count, guild_count, user_count, channel_count = counts
             user_install_count = (
                 await bot.application_info()
             ).approximate_user_install_count
@@ -126,20 +184,25 @@ class Tasks(commands.Cog):
             .strip()
         )
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{endpoint}/stats/process",
-                json={
-                    "Body": f"{shard_count}||{guild_count}||{user_count}||{channel_count}||{user_install_count}||{repo_sha}",
-                },
-                headers={"Authorization": token},
-            ) as resp:
-                if resp.status != 200:
-                    logger.error("couldn't submit stats to backend")
-                elif resp.status == 200:
-                    logger.info("submitted stats to backend")
+        async with client.post(
+            "/stats/process",
+            json={
+                "Body": f"{shard_count}||{guild_count}||{user_count}||{channel_count}||{user_install_count}||{repo_sha}",
+            },
+        ) as resp:
+            if resp.status != 200:
+                logger.error("couldn't submit stats to backend")
+            elif resp.status == 200:
+                logger.info("submitted stats to backend")
 
     async def update_shards(self, bot: disnake.AutoShardedClient):
+        if cluster.enabled:
+            # A worker only runs some of the shards, all of them have to change together.
+            if await cluster.request_reshard():
+                logger.info("asked the coordinator to check the shard count")
+
+            return
+
         if bot._connection.shard_count is None:
             logger.error("couldn't get shard count to potentially update")
             return
@@ -6,10 +6,7 @@ License, v. 2.0. If a copy of the MPL was not distributed with this file,
 You can obtain one at https://mozilla.org/MPL/2.0/.
 """
 
-import json
-import os
 import re
-from pathlib import Path
 
 from core import checks
 from core.i18n import bb_i18n
@@ -17,12 +14,13 @@ from disnake import Localized, Message, OptionChoice, Role
 from disnake.ext import commands
 from disnake.interactions import ApplicationCommandInteraction
 from disnake.ui import Container
-from helpers import channels, sending
+from helpers import book_names, channels, sending
 from logger import VyLogger
 from services import backend
 from ui import renderers as containers
 from ui.confirmation_prompt import ConfirmationPrompt
 from ui.paginator import ComponentPaginator
+from ui.renderers import LazyPages
 
 i18n = bb_i18n()
 
@@ -33,80 +31,6 @@ class VerseCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-        # Load book names for autocompletion
-        try:
-            cwd = Path(__file__).parent
-            json_path = cwd / "../../BibleBot.Backend/Data/NameFetching/book_names.json"
-            with open(json_path.resolve(), "r", encoding="utf-8") as f:
-                data = json.load(f)
-                # Flatten the list of lists into a single list of names
-                self.book_names = sorted(
-                    list(set(name for names in data.values() for name in names))
-                )
-        except Exception as e:
-            logger.error(f"Failed to load book names for autocomplete: {e}")
-            self.book_names = []
-
-    # async def verse_autocomplete(
-    #     self, inter: ApplicationCommandInteraction, string: str
-    # ) -> Optional[list[str]]:
-    #     user_experiments = await experiments.get_user_frontend_experiments(
-    #         inter.author.id
-    #     )
-    #     if "VerseCmdAutocompleteExperiment" not in user_experiments:
-    #         return []
-    #     elif (
-    #         user_experiments["VerseCmdAutocompleteExperiment"] == "Control"
-    #         and inter.author.id != 186046294286925824
-    #     ):
-    #         return []
-
-    #     try:
-    #         if not hasattr(self, "book_names") or not self.book_names:
-    #             return []
-
-    #         string_lower = string.lower()
-    #         suggestions = []
-
-    #         # Find the last word boundary to use as a potential start for a book name
-    #         # We search backwards for spaces or the start of the string
-    #         potential_starts = [0]
-    #         for i, char in enumerate(string):
-    #             if char == " " or char == "/":
-    #                 potential_starts.append(i + 1)
-
-    #         # Iterate potential starts from right to left
-    #         for start_index in reversed(potential_starts):
-    #             query = string_lower[start_index:].strip()
-    #             if not query:
-    #                 continue
-
-    #             # If the query is just a number (e.g. "1"), don't autocomplete yet
-    #             # This prevents "Genesis 1" from suggesting "Genesis 1 Corinthians"
-    #             if query.isdigit():
-    #                 continue
-
-    #             prefix = string[:start_index]
-
-    #             # Check if this query matches any book name
-    #             matches = []
-    #             for name in self.book_names:
-    #                 if name.lower().startswith(query):
-    #                     matches.append(prefix + name)
-
-    #             if matches:
-    #                 suggestions = matches
-    #                 break  # Found the most specific suffix match
-
-    #         if not string:
-    #             return self.book_names[:25]
-
-    #         return suggestions[:25]
-    #     except Exception as e:
-    #         sentry_sdk.set_context("experiment", "VerseCmdAutocompleteExperiment")
-    #         sentry_sdk.capture_exception(error=e)
-    #         return []
-
     @commands.slash_command(description=Localized(key="CMD_SEARCH_DESC"))
     async def search(
         self,
@@ -136,7 +60,7 @@ class VerseCommands(commands.Cog):
             f"+search subset:{subset} version:{version} {query}",
         )
 
-        if isinstance(resp, list):
+        if isinstance(resp, LazyPages):
             paginator = ComponentPaginator(resp, inter.author.id)
             await paginator.send(inter)
         else:
@@ -167,9 +91,7 @@ class VerseCommands(commands.Cog):
             "Body": reference,
         }
 
-        endpoint = os.environ.get("ENDPOINT", "")
-
-        resp = await backend.submit_verse_raw(endpoint, req_body)
+        resp = await backend.submit_verse_raw(req_body, is_command=True)
 
         localization = i18n.get_i18n_or_default(inter.locale.name)
 
@@ -192,6 +114,13 @@ class VerseCommands(commands.Cog):
                 for item in resp:
                     await sending.safe_send_interaction(inter.followup, item)
 
+    @verse.autocomplete("reference")
+    async def verse_autocomplete(
+        self, inter: ApplicationCommandInteraction, string: str
+    ) -> list[str]:
+        # Answered from memory, Discord only waits 3 seconds for autocomplete.
+        return book_names.index.suggest(string)
+
     @commands.message_command(name=Localized(key="CMD_VERSE_MSG_NAME"))
     @commands.install_types(user=True)
     async def verse_msg(self, inter: ApplicationCommandInteraction, msg: Message):
@@ -203,8 +132,10 @@ class VerseCommands(commands.Cog):
 
         resp = await backend.submit_command(inter.channel, inter.author, "+random")
 
-        if isinstance(resp, str):
-            await sending.safe_send_interaction(inter.followup, content=resp)
+        # Text display styles come back as message texts, verses already packed into them.
+        if isinstance(resp, list) and len(resp) > 0 and isinstance(resp[0], str):
+            for item in resp:
+                await sending.safe_send_interaction(inter.followup, content=item)
         else:
             await sending.safe_send_interaction(inter.followup, components=resp)
 
@@ -214,8 +145,10 @@ class VerseCommands(commands.Cog):
 
         resp = await backend.submit_command(inter.channel, inter.author, "+random true")
 
-        if isinstance(resp, str):
-            await sending.safe_send_interaction(inter.followup, content=resp)
+        # Text display styles come back as message texts, verses already packed into them.
+        if isinstance(resp, list) and len(resp) > 0 and isinstance(resp[0], str):
+            for item in resp:
+                await sending.safe_send_interaction(inter.followup, content=item)
         else:
             await sending.safe_send_interaction(inter.followup, components=resp)
 
@@ -280,9 +213,7 @@ class VerseCommands(commands.Cog):
             "Body": finalized_query,
         }
 
-        endpoint = os.environ.get("ENDPOINT", "")
-
-        resp = await backend.submit_verse_raw(endpoint, req_body)
+        resp = await backend.submit_verse_raw(req_body, is_command=True)
 
         localization = i18n.get_i18n_or_default(inter.locale.name)
 
@@ -310,8 +241,10 @@ class VerseCommands(commands.Cog):
         await inter.response.defer()
         resp = await backend.submit_command(inter.channel, inter.author, "+dailyverse")
 
-        if isinstance(resp, str):
-            await sending.safe_send_interaction(inter.followup, content=resp)
+        # Text display styles come back as message texts, verses already packed into them.
+        if isinstance(resp, list) and len(resp) > 0 and isinstance(resp[0], str):
+            for item in resp:
+                await sending.safe_send_interaction(inter.followup, content=item)
         else:
             await sending.safe_send_interaction(inter.followup, components=resp)
 
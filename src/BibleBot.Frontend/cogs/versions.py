@@ -16,6 +16,7 @@ from logger import VyLogger
 from services import backend
 from ui import renderers
 from ui.paginator import ComponentPaginator
+from ui.renderers import LazyPages
 
 i18n = bb_i18n()
 logger = VyLogger("default")
@@ -155,7 +156,7 @@ class Versions(commands.Cog):
             "+version list" + (" language" if sort_by_language else ""),
         )
 
-        if isinstance(resp, list):
+        if isinstance(resp, LazyPages):
             paginator = ComponentPaginator(resp, inter.author.id)
             await paginator.send(inter)
         else:
@@ -177,7 +178,7 @@ class Versions(commands.Cog):
             command += f" {acronym}"
 
         resp = await backend.submit_command(inter.channel, inter.author, command)
-        if isinstance(resp, list):
+        if isinstance(resp, LazyPages):
             paginator = ComponentPaginator(resp, inter.author.id)
             await paginator.send(inter)
         else:
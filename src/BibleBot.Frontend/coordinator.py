@@ -0,0 +1,456 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Cluster mode: runs the bot as several worker processes, each owning a contiguous range of
+# shards, so gateway decompression, JSON parsing and rendering can use more than one core.
+#
+# The coordinator
+#   - asks Discord for the shard count and splits it between CLUSTER_WORKERS processes,
+#   - lets workers IDENTIFY one at a time per max_concurrency bucket, across the cluster,
+#   - restarts workers that exit, backing off when they keep crashing,
+#   - serves the cluster's health at /health (and its own metrics at /metrics) on HEALTH_PORT,
+#   - adds up the workers' guild, user and channel counts for the stats tasks,
+#   - reshards the whole cluster when a worker's update_shards task asks it to,
+#   - flushes every worker's command cache when staff reload versions, languages or experiments.
+#
+# Run from src/BibleBot.Frontend: python coordinator.py
+
+import asyncio
+import contextlib
+import os
+import signal
+import sys
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+from aiohttp import web
+
+from core import codec, metrics
+from logger import VyLogger
+from services.cluster import format_shard_ids
+
+logger = VyLogger("default")
+
+_frontend_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def split_shards(shard_count: int, workers: int) -> List[List[int]]:
+    """Splits shard IDs into `workers` contiguous ranges whose sizes differ by at most one."""
+    workers = max(1, min(workers, shard_count))
+    size, extra = divmod(shard_count, workers)
+    ranges = []
+    first = 0
+
+    for index in range(workers):
+        last = first + size + (1 if index < extra else 0)
+        ranges.append(list(range(first, last)))
+        first = last
+
+    return ranges
+
+
+class Worker:
+    """
+    A bot process owning a range of shards.
+    Parameters:
+    ----------
+    cluster_id: int
+        The worker's index in the cluster.
+    shard_ids: List[int]
+        The shards it runs.
+    health_port: int
+        The port its health check server listens on.
+    """
+
+    def __init__(self, cluster_id: int, shard_ids: List[int], health_port: int):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.health_port = health_port
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.healthy = False
+        self.stopping = False
+        self.supervisor: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    def status(self) -> dict:
+        return {
+            "cluster": self.cluster_id,
+            "shards": format_shard_ids(self.shard_ids),
+            "pid": self.process.pid if self.alive else None,
+            "alive": self.alive,
+            "healthy": self.healthy,
+            "restarts": self.restarts,
+            "uptime": round(time.monotonic() - self.started_at) if self.alive else 0,
+        }
+
+
+class Coordinator:
+    """
+    Starts and supervises the workers of a cluster.
+    Parameters:
+    ----------
+    token: str
+        The bot's token, to ask Discord for the recommended shard count.
+    workers: int
+        How many worker processes to run.
+    shard_count: Optional[int]
+        A fixed shard count, or None to use the one Discord recommends.
+    port: int
+        The port workers reach the coordinator on, on localhost.
+    health_port: int
+        The port of the cluster's health check server, workers get the ones after it.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        workers: int,
+        shard_count: Optional[int] = None,
+        port: int = 5060,
+        health_port: int = 5054,
+    ):
+        self.token = token
+        self.worker_count = workers
+        self.fixed_shard_count = shard_count
+        self.port = port
+        self.health_port = health_port
+        self.shard_count = 0
+        self.max_concurrency = 1
+        self.workers: List[Worker] = []
+        self.stopping = False
+        self._identify_locks: Dict[int, asyncio.Lock] = {}
+        self._last_identify: Dict[int, float] = {}
+        self._reshard_task: Optional[asyncio.Task] = None
+        self._runners: List[web.AppRunner] = []
+
+    async def get_gateway(self) -> dict:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(
+                "https://discord.com/api/v10/gateway/bot",
+                headers={"Authorization": f"Bot {self.token}"},
+                timeout=aiohttp.ClientTimeout(total=30),
+            ) as resp:
+                resp.raise_for_status()
+                return codec.loads(await resp.read())
+
+    async def start(self):
+        gateway = await self.get_gateway()
+        limit = gateway["session_start_limit"]
+        self.max_concurrency = limit["max_concurrency"]
+        self.shard_count = self.fixed_shard_count or gateway["shards"]
+
+        if limit["remaining"] < self.shard_count:
+            logger.error(
+                f"only {limit['remaining']} session starts left for {self.shard_count} shards, "
+                f"resets in {limit['reset_after'] / 1000:.0f}s"
+            )
+
+        await self._serve()
+
+        for cluster_id, shard_ids in enumerate(
+            split_shards(self.shard_count, self.worker_count)
+        ):
+            self._start_worker(
+                Worker(cluster_id, shard_ids, self.health_port + 1 + cluster_id)
+            )
+
+        logger.info(
+            f"started {len(self.workers)} workers for {self.shard_count} shards "
+            f"(max_concurrency {self.max_concurrency})"
+        )
+        metrics.cluster_shards.set(self.shard_count)
+
+    def _start_worker(self, worker: Worker):
+        if worker.cluster_id < len(self.workers):
+            self.workers[worker.cluster_id] = worker
+        else:
+            self.workers.append(worker)
+
+        worker.supervisor = asyncio.create_task(self._supervise(worker))
+
+    async def _spawn(self, worker: Worker):
+        env = dict(
+            os.environ,
+            CLUSTER_COORDINATOR=f"http://127.0.0.1:{self.port}",
+            CLUSTER_ID=str(worker.cluster_id),
+            SHARD_COUNT=str(self.shard_count),
+            SHARD_IDS=format_shard_ids(worker.shard_ids),
+            HEALTH_PORT=str(worker.health_port),
+        )
+
+        worker.process = await asyncio.create_subprocess_exec(
+            sys.executable, "application.py", cwd=_frontend_dir, env=env
+        )
+        worker.started_at = time.monotonic()
+        worker.healthy = False
+
+        logger.info(
+            f"cluster {worker.cluster_id} started with shards "
+            f"{format_shard_ids(worker.shard_ids)} as pid {worker.process.pid}"
+        )
+
+    async def _supervise(self, worker: Worker):
+        crashes = 0
+
+        while not (self.stopping or worker.stopping):
+            await self._spawn(worker)
+            returncode = await worker.process.wait()
+
+            if self.stopping or worker.stopping:
+                break
+
+            # A worker that ran for a while before exiting gets restarted right away,
+            # one that keeps dying waits longer each time.
+            crashes = crashes + 1 if time.monotonic() - worker.started_at < 60 else 0
+            delay = min(5 * 2 ** (crashes - 1), 300) if crashes else 0
+
+            worker.restarts += 1
+            metrics.cluster_worker_restarts_total.labels(str(worker.cluster_id)).inc()
+            logger.error(
+                f"cluster {worker.cluster_id} exited with {returncode}, restarting in {delay}s"
+            )
+            await asyncio.sleep(delay)
+
+    async def _stop_worker(self, worker: Worker):
+        worker.stopping = True
+
+        if worker.alive:
+            worker.process.terminate()
+
+            try:
+                await asyncio.wait_for(worker.process.wait(), timeout=30)
+            except asyncio.TimeoutError:
+                logger.warning(f"cluster {worker.cluster_id} didn't stop, killing it")
+                worker.process.kill()
+                await worker.process.wait()
+
+        # The supervisor may be waiting to restart a crashed worker.
+        if worker.supervisor is not None:
+            worker.supervisor.cancel()
+
+            with contextlib.suppress(asyncio.CancelledError):
+                await worker.supervisor
+
+    async def stop(self):
+        self.stopping = True
+        await asyncio.gather(*(self._stop_worker(worker) for worker in self.workers))
+
+        for runner in self._runners:
+            await runner.cleanup()
+
+    async def reshard(self):
+        gateway = await self.get_gateway()
+        shard_count = self.fixed_shard_count or gateway["shards"]
+
+        if shard_count <= self.shard_count:
+            logger.info("no shards to launch")
+            return
+
+        remaining = gateway["session_start_limit"]["remaining"]
+        if remaining < shard_count:
+            logger.error(
+                f"insufficient session starts for resharding: need {shard_count}, have {remaining}"
+            )
+            return
+
+        logger.warning(
+            f"shard count changed from {self.shard_count} to {shard_count}, "
+            f"restarting workers one by one"
+        )
+
+        # Every shard has to IDENTIFY again with the new count, so each worker is replaced
+        # by one with its new range. Workers are replaced one at a time to keep most of the
+        # cluster online, IDENTIFYs still go through the coordinator.
+        self.shard_count = shard_count
+        metrics.cluster_shards.set(shard_count)
+
+        for cluster_id, shard_ids in enumerate(
+            split_shards(shard_count, self.worker_count)
+        ):
+            if cluster_id < len(self.workers):
+                await self._stop_worker(self.workers[cluster_id])
+
+            self._start_worker(
+                Worker(cluster_id, shard_ids, self.health_port + 1 + cluster_id)
+            )
+
+        logger.warning(f"resharding complete, {len(self.workers)} workers")
+
+    async def invalidate(self, body: bytes) -> bool:
+        """Forwards a command cache invalidation to every running worker, returns whether all applied it."""
+
+        async def forward(session: aiohttp.ClientSession, worker: Worker) -> bool:
+            try:
+                async with session.post(
+                    f"http://127.0.0.1:{worker.health_port}/invalidate",
+                    data=body,
+                    headers={"Content-Type": "application/json"},
+                    timeout=aiohttp.ClientTimeout(total=10),
+                ) as resp:
+                    resp.raise_for_status()
+                    return True
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                logger.warning(
+                    f"couldn't flush the command cache of cluster {worker.cluster_id}: {err}"
+                )
+                return False
+
+        # A worker that isn't running starts again with an empty cache.
+        async with aiohttp.ClientSession() as session:
+            results = await asyncio.gather(
+                *(forward(session, worker) for worker in self.workers if worker.alive)
+            )
+
+        return all(results)
+
+    async def check_health(self):
+        async with aiohttp.ClientSession() as session:
+            while not self.stopping:
+                for worker in list(self.workers):
+                    if not worker.alive:
+                        worker.healthy = False
+                        continue
+
+                    try:
+                        async with session.get(
+                            f"http://127.0.0.1:{worker.health_port}/health",
+                            timeout=aiohttp.ClientTimeout(total=5),
+                        ) as resp:
+                            worker.healthy = resp.status == 200
+                    except (aiohttp.ClientError, asyncio.TimeoutError):
+                        worker.healthy = False
+
+                metrics.cluster_workers_healthy.set(
+                    sum(worker.healthy for worker in self.workers)
+                )
+                await asyncio.sleep(15)
+
+    async def _identify(self, request: web.Request) -> web.Response:
+        shard_id = int(request.match_info["shard_id"])
+        bucket = shard_id % self.max_concurrency
+        lock = self._identify_locks.setdefault(bucket, asyncio.Lock())
+
+        # Each bucket may IDENTIFY once every 5 seconds, whichever worker the shard is in.
+        async with lock:
+            wait = self._last_identify.get(bucket, float("-inf")) + 5 - time.monotonic()
+
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            self._last_identify[bucket] = time.monotonic()
+
+        return web.Response(status=200)
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        totals = {
+            "shardCount": self.shard_count,
+            "guilds": 0,
+            "users": 0,
+            "channels": 0,
+        }
+
+        async with aiohttp.ClientSession() as session:
+            for worker in self.workers:
+                try:
+                    async with session.get(
+                        f"http://127.0.0.1:{worker.health_port}/stats",
+                        timeout=aiohttp.ClientTimeout(total=10),
+                    ) as resp:
+                        resp.raise_for_status()
+                        stats = codec.loads(await resp.read())
+                except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                    # Partial counts would be reported as if they were the whole bot's.
+                    logger.warning(
+                        f"couldn't get stats from cluster {worker.cluster_id}: {err}"
+                    )
+                    return web.Response(status=503)
+
+                for key in ("guilds", "users", "channels"):
+                    totals[key] += stats[key]
+
+        return web.Response(body=codec.dumps(totals), content_type="application/json")
+
+    async def _reshard(self, request: web.Request) -> web.Response:
+        if self._reshard_task is None or self._reshard_task.done():
+            self._reshard_task = asyncio.create_task(self.reshard())
+
+        return web.Response(status=202)
+
+    async def _invalidate(self, request: web.Request) -> web.Response:
+        applied = await self.invalidate(await request.read())
+        return web.Response(status=200 if applied else 503)
+
+    async def _health(self, request: web.Request) -> web.Response:
+        workers = [worker.status() for worker in self.workers]
+        healthy = all(worker["healthy"] for worker in workers)
+
+        return web.Response(
+            status=200 if healthy else 503,
+            body=codec.dumps({"shardCount": self.shard_count, "workers": workers}),
+            content_type="application/json",
+        )
+
+    async def _metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=metrics.render(), headers={"Content-Type": metrics.content_type}
+        )
+
+    async def _serve(self):
+        internal = web.Application()
+        internal.router.add_post("/identify/{shard_id}", self._identify)
+        internal.router.add_post("/reshard", self._reshard)
+        internal.router.add_post("/invalidate", self._invalidate)
+        internal.router.add_get("/stats", self._stats)
+
+        public = web.Application()
+        public.router.add_get("/health", self._health)
+        public.router.add_get("/metrics", self._metrics)
+        public.router.add_get("/", self._health)
+
+        for app, host, port in (
+            (internal, "127.0.0.1", self.port),
+            (public, "0.0.0.0", self.health_port),
+        ):
+            runner = web.AppRunner(app)
+            await runner.setup()
+            await web.TCPSite(runner, host, port).start()
+            self._runners.append(runner)
+
+
+async def main():
+    coordinator = Coordinator(
+        os.environ.get("DISCORD_TOKEN", ""),
+        workers=int(os.environ.get("CLUSTER_WORKERS", str(os.cpu_count() or 1))),
+        shard_count=(
+            int(os.environ["SHARD_COUNT"]) if os.environ.get("SHARD_COUNT") else None
+        ),
+        port=int(os.environ.get("CLUSTER_COORDINATOR_PORT", "5060")),
+        health_port=int(os.environ.get("HEALTH_PORT", "5054")),
+    )
+
+    stopped = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        asyncio.get_running_loop().add_signal_handler(signum, stopped.set)
+
+    await coordinator.start()
+    health_checks = asyncio.create_task(coordinator.check_health())
+
+    await stopped.wait()
+    logger.info("stopping cluster")
+    await coordinator.stop()
+    health_checks.cancel()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
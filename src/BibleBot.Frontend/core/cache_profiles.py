@@ -0,0 +1,94 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# What the bot subscribes to and keeps from the gateway, chosen with GATEWAY_CACHE_PROFILE.
+#
+# The cogs only read guild IDs, channels (with their overwrites and the bot's own roles,
+# for permission checks and the channel count in stats), `member_count` and the bot's own
+# member. Everything else disnake caches by default is never looked at:
+#
+#   default      disnake's defaults plus message content, what the bot always ran with
+#   low_memory   only the intents the cogs handle, no message cache, no members but the
+#                bot's own (which GUILD_CREATE always includes and is kept regardless), and
+#                guild emojis, stickers and soundboard sounds dropped before they're parsed
+#
+# See benchmarks/bench_gateway_memory.py for what each profile costs per 1,000 guilds.
+
+import os
+from typing import Any, Dict, Tuple
+
+import disnake
+from disnake.state import ConnectionState
+
+
+def _default() -> Dict[str, Any]:
+    intents = disnake.Intents.default()
+    # noinspection PyDunderSlots, PyUnresolvedReferences
+    intents.message_content = True
+
+    return {"intents": intents}
+
+
+def _low_memory() -> Dict[str, Any]:
+    intents = disnake.Intents(
+        guilds=True,
+        guild_messages=True,
+        dm_messages=True,
+        message_content=True,
+        # on_webhooks_update keeps the webhook ownership cache honest.
+        webhooks=True,
+    )
+
+    return {
+        "intents": intents,
+        "max_messages": None,
+        "member_cache_flags": disnake.MemberCacheFlags.none(),
+        "chunk_guilds_at_startup": False,
+    }
+
+
+profiles = {"default": _default, "low_memory": _low_memory}
+
+# GUILD_CREATE and GUILD_UPDATE always carry these, whatever the intents. Without the
+# emojis and stickers intent they would also never be updated.
+_dropped_guild_fields: Dict[str, Tuple[str, ...]] = {
+    "default": (),
+    "low_memory": ("emojis", "stickers", "soundboard_sounds"),
+}
+
+
+def options(profile: str) -> Dict[str, Any]:
+    """Returns the bot's keyword arguments for `profile`."""
+    if profile not in profiles:
+        raise ValueError(
+            f"unknown cache profile {profile!r}, expected one of {', '.join(profiles)}"
+        )
+
+    return profiles[profile]()
+
+
+def install(state: ConnectionState, profile: str):
+    """Makes `state` drop the guild fields `profile` doesn't keep before they're parsed."""
+    fields = _dropped_guild_fields[profile]
+
+    if not fields:
+        return
+
+    for event in ("GUILD_CREATE", "GUILD_UPDATE"):
+        parse = state.parsers[event]
+
+        def parse_trimmed(data, parse=parse):
+            for field in fields:
+                data.pop(field, None)
+
+            return parse(data)
+
+        state.parsers[event] = parse_trimmed
+
+
+profile = os.environ.get("GATEWAY_CACHE_PROFILE", "low_memory")
@@ -7,6 +7,7 @@ You can obtain one at https://mozilla.org/MPL/2.0/.
 """
 
 import disnake
+from core.models import EmbedPage
 from disnake.interactions import ApplicationCommandInteraction
 # from os import environ
 # import sentry_sdk
@@ -42,7 +43,7 @@ async def user_is_bb_staff(inter: ApplicationCommandInteraction) -> bool:
         await sending.safe_send_interaction(
             inter.followup,
             components=containers.convert_embed_to_container(
-                staff_check_resp_body["pages"][0]
+                EmbedPage.from_dict(staff_check_resp_body["pages"][0])
             ),
         )
     elif staff_check_resp.status == 200:
@@ -0,0 +1,33 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+import orjson
+
+JSONDecodeError = orjson.JSONDecodeError
+
+# The backend double-escapes newlines in some command responses, so `\\n` arrives
+# where `\n` was meant. Both sides of the replacement are JSON-escaped bytes.
+_ESCAPED_NEWLINE = b"\\\\n"
+_NEWLINE = b"\\n"
+
+
+def dumps(obj) -> bytes:
+    """Serializes a request body to JSON bytes."""
+    return orjson.dumps(obj)
+
+
+def loads(raw: bytes, unescape_newlines: bool = False):
+    """Deserializes a response body straight from bytes.
+
+    When `unescape_newlines` is set, double-escaped newlines are fixed before decoding,
+    the body is only copied if it actually contains one.
+    """
+    if unescape_newlines and _ESCAPED_NEWLINE in raw:
+        raw = raw.replace(_ESCAPED_NEWLINE, _NEWLINE)
+
+    return orjson.loads(raw)
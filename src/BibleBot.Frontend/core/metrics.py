@@ -0,0 +1,196 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Prometheus metrics, served at /metrics on the health check server.
+# Metrics register themselves in the global registry when created, so this module
+# must not be hot-reloaded (reloading it would register every metric twice).
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+backend_request_seconds = Histogram(
+    "biblebot_frontend_backend_request_seconds",
+    "Time from sending a backend request until its response has been handled.",
+    ["endpoint", "method"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0),
+)
+
+backend_responses_total = Counter(
+    "biblebot_frontend_backend_responses_total",
+    "Backend responses by status code, or by failure when no response arrived.",
+    ["endpoint", "status"],
+)
+
+backend_decode_failures_total = Counter(
+    "biblebot_frontend_backend_decode_failures_total",
+    "Backend responses that couldn't be decoded as JSON or into a response model.",
+    ["endpoint"],
+)
+
+backend_in_flight = Gauge(
+    "biblebot_frontend_backend_in_flight_requests",
+    "Backend requests that have been sent and not yet handled.",
+    ["endpoint"],
+)
+
+backend_circuit_open = Gauge(
+    "biblebot_frontend_backend_circuit_open",
+    "Whether the backend circuit breaker is refusing requests.",
+)
+
+discord_gateway_latency_seconds = Gauge(
+    "biblebot_frontend_discord_gateway_latency_seconds",
+    "Average heartbeat latency across the bot's shards.",
+)
+
+verse_candidates_without_book_total = Counter(
+    "biblebot_frontend_verse_candidates_without_book_total",
+    "Messages that looked like they had a verse but no book name, so weren't sent to the backend.",
+)
+
+ingestion_running = Gauge(
+    "biblebot_frontend_ingestion_running",
+    "Passive detections being handled.",
+)
+
+ingestion_queued = Gauge(
+    "biblebot_frontend_ingestion_queued",
+    "Passive detections waiting for a slot.",
+)
+
+ingestion_wait_seconds = Histogram(
+    "biblebot_frontend_ingestion_wait_seconds",
+    "Time passive detections spent waiting for a slot.",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+ingestion_shed_total = Counter(
+    "biblebot_frontend_ingestion_shed_total",
+    "Passive detections dropped because too many were already waiting.",
+    ["reason"],
+)
+
+cluster_shards = Gauge(
+    "biblebot_frontend_cluster_shards",
+    "The cluster's shard count, as used by its workers.",
+)
+
+cluster_workers_healthy = Gauge(
+    "biblebot_frontend_cluster_workers_healthy",
+    "Cluster workers whose health check passed.",
+)
+
+cluster_worker_restarts_total = Counter(
+    "biblebot_frontend_cluster_worker_restarts_total",
+    "Cluster workers restarted after exiting on their own.",
+    ["cluster"],
+)
+
+event_loop_lag_seconds = Histogram(
+    "biblebot_frontend_event_loop_lag_seconds",
+    "How late the event loop ran a callback that was due.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+event_loop_lag_recent_seconds = Gauge(
+    "biblebot_frontend_event_loop_lag_recent_seconds",
+    "Event loop lag over the last minute, by quantile (1.0 is the worst).",
+    ["quantile"],
+)
+
+event_loop_stalls_total = Counter(
+    "biblebot_frontend_event_loop_stalls_total",
+    "Times a single callback held the event loop past the watchdog's threshold.",
+)
+
+command_cache_requests_total = Counter(
+    "biblebot_frontend_command_cache_requests_total",
+    "Lookups in the cache of command responses, by command and result (hit or miss).",
+    ["command", "result"],
+)
+
+render_cache_requests_total = Counter(
+    "biblebot_frontend_render_cache_requests_total",
+    "Lookups in the cache of rendered verse containers, by result (hit or miss).",
+    ["result"],
+)
+
+render_cache_hit_ratio = Gauge(
+    "biblebot_frontend_render_cache_hit_ratio",
+    "Share of render cache lookups that were hits since the process started.",
+)
+
+render_cache_bytes = Gauge(
+    "biblebot_frontend_render_cache_bytes",
+    "Estimated memory taken by cached renders.",
+)
+
+render_cache_entries = Gauge(
+    "biblebot_frontend_render_cache_entries",
+    "Renders in the render cache.",
+)
+
+render_cache_evictions_total = Counter(
+    "biblebot_frontend_render_cache_evictions_total",
+    "Renders evicted from the render cache to stay within its memory cap.",
+)
+
+expiry_entries = Gauge(
+    "biblebot_frontend_expiry_entries",
+    "Paginators and prompts waiting to expire.",
+)
+
+expiry_heap_size = Gauge(
+    "biblebot_frontend_expiry_heap_size",
+    "Items in the expiry scheduler's heap, live entries plus those left by rescheduling and cancelling.",
+)
+
+expiry_lag_seconds = Histogram(
+    "biblebot_frontend_expiry_lag_seconds",
+    "How long after its deadline a paginator or prompt was expired.",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 1.5, 2.5, 5.0, 10.0),
+)
+
+expiry_batch_size = Histogram(
+    "biblebot_frontend_expiry_batch_size",
+    "Paginators and prompts expired together by one run of the expiry timer.",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500),
+)
+
+page_cache_entries = Gauge(
+    "biblebot_frontend_page_cache_entries",
+    "Paginators whose pages are in the page cache.",
+)
+
+paginator_page_lookups_total = Counter(
+    "biblebot_frontend_paginator_page_lookups_total",
+    "Where a paginator click found its pages: cache, backend, or missing when they couldn't be fetched again.",
+    ["result"],
+)
+
+
+def endpoint_label(path: str) -> str:
+    """Returns the label for a backend path, keeping the number of label values bounded."""
+    path = path.split("?", 1)[0]
+
+    if path.startswith("/experiments/"):
+        return "/experiments/*"
+
+    return path
+
+
+def render() -> bytes:
+    return generate_latest()
+
+
+content_type = CONTENT_TYPE_LATEST
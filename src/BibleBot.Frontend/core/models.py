@@ -0,0 +1,183 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Frontend views of BibleBot.Models' responses, holding only what the frontend renders.
+# They're decoded once where a response comes in. Coalesced and cached responses are
+# shared between callers, so treat them as read-only. They aren't frozen because
+# frozen dataclasses are noticeably slower to construct.
+
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+
+class MalformedResponseError(ValueError):
+    """Raised when a backend response doesn't have the shape of a BibleBot.Models response."""
+
+
+@dataclass(slots=True)
+class VersionInfo:
+    name: str
+    publisher: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "VersionInfo":
+        return cls(name=data["name"], publisher=data.get("publisher"))
+
+
+@dataclass(slots=True)
+class Reference:
+    as_string: str
+    version: VersionInfo
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Reference":
+        return cls(
+            as_string=data["asString"],
+            version=VersionInfo.from_dict(data["version"]),
+        )
+
+
+@dataclass(slots=True)
+class Verse:
+    reference: Reference
+    title: str
+    text: str
+
+    @property
+    def reference_title(self) -> str:
+        return self.reference.as_string + " - " + self.reference.version.name
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Verse":
+        return cls(
+            reference=Reference.from_dict(data["reference"]),
+            title=data.get("title") or "",
+            text=data["text"],
+        )
+
+
+@dataclass(slots=True)
+class EmbedField:
+    name: str
+    value: str
+    add_separator_after: bool
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EmbedField":
+        return cls(
+            name=data["name"],
+            value=data["value"],
+            add_separator_after=bool(data.get("add_separator_after")),
+        )
+
+
+@dataclass(slots=True)
+class EmbedPage:
+    title: Optional[str]
+    description: Optional[str]
+    url: Optional[str]
+    color: int
+    thumbnail_url: Optional[str]
+    footer_text: Optional[str]
+    fields: Optional[Tuple[EmbedField, ...]]
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EmbedPage":
+        thumbnail = data.get("thumbnail")
+        footer = data.get("footer")
+        fields = data.get("fields")
+
+        return cls(
+            title=data.get("title"),
+            description=data.get("description"),
+            url=data.get("url"),
+            color=data.get("color") or 0,
+            thumbnail_url=thumbnail["url"] if thumbnail is not None else None,
+            footer_text=footer["text"] if footer is not None else None,
+            fields=(
+                tuple(EmbedField.from_dict(field) for field in fields)
+                if fields is not None
+                else None
+            ),
+        )
+
+
+@dataclass(slots=True)
+class VerseResponse:
+    ok: bool
+    log_statement: Optional[str]
+    culture: Optional[str]
+    culture_footer: Optional[str]
+    verses: Tuple[Verse, ...]
+    display_style: Optional[str]
+    paginate: bool
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "VerseResponse":
+        verses = data.get("verses")
+
+        return cls(
+            ok=data["ok"],
+            log_statement=data.get("logStatement"),
+            culture=data.get("culture"),
+            culture_footer=data.get("cultureFooter"),
+            verses=(
+                tuple(Verse.from_dict(verse) for verse in verses)
+                if verses is not None
+                else ()
+            ),
+            display_style=data.get("displayStyle"),
+            paginate=bool(data.get("paginate")),
+        )
+
+
+@dataclass(slots=True)
+class CommandResponse:
+    ok: bool
+    log_statement: Optional[str]
+    culture: Optional[str]
+    culture_footer: Optional[str]
+    pages: Tuple[EmbedPage, ...]
+    create_webhook: bool
+    remove_webhook: bool
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CommandResponse":
+        pages = data.get("pages")
+
+        return cls(
+            ok=data["ok"],
+            log_statement=data.get("logStatement"),
+            culture=data.get("culture"),
+            culture_footer=data.get("cultureFooter"),
+            pages=(
+                tuple(EmbedPage.from_dict(page) for page in pages)
+                if pages is not None
+                else ()
+            ),
+            create_webhook=bool(data.get("createWebhook")),
+            remove_webhook=bool(data.get("removeWebhook")),
+        )
+
+
+Response = Union[VerseResponse, CommandResponse]
+
+
+def decode_response(data) -> Response:
+    """Decodes a backend response by its `type`, raising MalformedResponseError if it doesn't fit."""
+    try:
+        if data["type"] == "verse":
+            return VerseResponse.from_dict(data)
+        elif data["type"] == "cmd":
+            return CommandResponse.from_dict(data)
+    except (KeyError, TypeError) as err:
+        raise MalformedResponseError(
+            f"malformed backend response, {err.__class__.__name__}: {err}"
+        ) from err
+
+    raise MalformedResponseError(f"unknown backend response type {data['type']!r}")
@@ -0,0 +1,225 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+import os
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Iterable, List, Optional
+
+import orjson
+
+from logger import VyLogger
+
+logger = VyLogger("default")
+
+# Mirrors what the backend's PurifyBody does to a message before looking for book names in it.
+_angle_brackets = re.compile(r"<[^>]*>")
+_variant_dashes = re.compile("[–—‒－]")
+_ignored_punctuation = re.compile(r"[!\"#$%&'()*+./;<=>?@\[\\\]^_`{|}~]")
+
+_terminal = ""
+
+# Discord rejects autocomplete choices longer than this.
+_max_choice_length = 100
+
+
+class BookNameMatcher:
+    """Tells whether a message has a book name directly before a chapter:verse token,
+    the only place the backend will look for a reference.
+
+    The names are kept in a trie of the reversed names, so a lookup walks backwards
+    from each token with a colon in it and costs at most the length of the longest name.
+
+    Parameters:
+    ----------
+    names : Iterable[str]
+        Every book name and abbreviation the backend recognizes, in any language.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.trie: dict = {}
+        self.size = 0
+
+        for name in names:
+            name = name.lower()
+
+            if not name:
+                continue
+
+            node = self.trie
+            for character in reversed(name):
+                node = node.setdefault(character, {})
+
+            if _terminal not in node:
+                node[_terminal] = True
+                self.size += 1
+
+    @classmethod
+    def from_directory(cls, path: str) -> "BookNameMatcher":
+        """Loads the backend's `book_names.json` and `abbreviations.json` from `path`."""
+        return cls(
+            _read_names(path, "book_names.json")
+            + _read_names(path, "abbreviations.json")
+        )
+
+    def _ends_with_name(self, text: str) -> bool:
+        node = self.trie
+
+        for index in range(len(text) - 1, -1, -1):
+            node = node.get(text[index])
+
+            if node is None:
+                return False
+
+            if _terminal in node and (index == 0 or text[index - 1].isspace()):
+                return True
+
+        return False
+
+    def has_reference(self, content: str) -> bool:
+        content = _angle_brackets.sub(
+            "", content.lower().replace("\r", " ").replace("\n", " ")
+        )
+        content = _ignored_punctuation.sub(" ", _variant_dashes.sub("-", content))
+
+        start = 0
+        for token in content.split(" "):
+            if (":" in token or "：" in token) and start > 0:
+                if self._ends_with_name(content[: start - 1]):
+                    return True
+
+            start += len(token) + 1
+
+        return False
+
+
+def fold(text: str) -> str:
+    """Folds case and strips diacritics, so "genese" matches "Genèse"."""
+    return "".join(
+        character
+        for character in unicodedata.normalize("NFKD", text.casefold())
+        if not unicodedata.combining(character)
+    )
+
+
+class BookNameIndex:
+    """Suggests book names for a partially typed reference, for /verse's autocomplete.
+
+    The names are kept sorted by their folded form, so the names starting with a prefix
+    are a contiguous run found by bisection.
+
+    Parameters:
+    ----------
+    names : Iterable[str]
+        The book names to suggest, in any language.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        entries = sorted({(fold(name), name) for name in names if name})
+        self.keys = [key for key, _ in entries]
+        self.names = [name for _, name in entries]
+
+    @classmethod
+    def from_directory(cls, path: str) -> "BookNameIndex":
+        """Loads the backend's `book_names.json` from `path`, abbreviations aren't suggested."""
+        return cls(_read_names(path, "book_names.json"))
+
+    def starting_with(self, prefix: str, limit: int) -> List[str]:
+        """Returns up to `limit` names whose folded form starts with `prefix`, already folded."""
+        index = bisect_left(self.keys, prefix)
+        matches = []
+
+        while (
+            index < len(self.keys)
+            and len(matches) < limit
+            and self.keys[index].startswith(prefix)
+        ):
+            matches.append(self.names[index])
+            index += 1
+
+        return matches
+
+    def suggest(self, text: str, limit: int = 25) -> List[str]:
+        """Completes the book name being typed at the end of `text`.
+
+        The name may start after any space or slash, the longest such ending that starts
+        a book name wins, e.g. "1 Co" suggests "1 Corinthians" rather than names
+        starting with "Co". Whatever comes before it is kept in each suggestion.
+        """
+        if not text.strip():
+            return self.names[:limit]
+
+        starts = [0] + [
+            index + 1 for index, character in enumerate(text) if character in " /"
+        ]
+
+        for start in starts:
+            # Keep the space in "Psalm 23 / Ex" where it was typed.
+            while start < len(text) and text[start] == " ":
+                start += 1
+
+            query = fold(text[start:].rstrip())
+
+            # A bare number is a chapter more often than the start of "1 John".
+            if not query or query.isdigit():
+                continue
+
+            matches = self.starting_with(query, limit)
+
+            if matches:
+                return [
+                    text[:start] + name
+                    for name in matches
+                    if start + len(name) <= _max_choice_length
+                ]
+
+        return []
+
+
+def _read_names(path: str, filename: str) -> List[str]:
+    names = []
+
+    with open(os.path.join(path, filename), "rb") as file:
+        for book_names in orjson.loads(file.read()).values():
+            names.extend(book_names)
+
+    return names
+
+
+def _load() -> Optional[BookNameMatcher]:
+    path = os.environ.get(
+        "BOOK_NAMES_PATH", "../../src/BibleBot.Backend/Data/NameFetching"
+    )
+
+    try:
+        book_name_matcher = BookNameMatcher.from_directory(path)
+    except (OSError, orjson.JSONDecodeError, AttributeError) as err:
+        logger.error(
+            f"couldn't load book names, every verse candidate will go to the backend: {err}"
+        )
+        return None
+
+    logger.info(f"loaded {book_name_matcher.size} book names")
+    return book_name_matcher
+
+
+def _load_index() -> BookNameIndex:
+    path = os.environ.get(
+        "BOOK_NAMES_PATH", "../../src/BibleBot.Backend/Data/NameFetching"
+    )
+
+    try:
+        return BookNameIndex.from_directory(path)
+    except (OSError, orjson.JSONDecodeError, AttributeError) as err:
+        logger.error(f"couldn't load book names, /verse won't autocomplete: {err}")
+        return BookNameIndex([])
+
+
+matcher = _load()
+index = _load_index()
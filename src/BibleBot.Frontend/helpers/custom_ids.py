@@ -0,0 +1,117 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Interactive components keep their state in their buttons' custom_ids instead of in memory,
+# so a click can be handled by any process, including one started after the message was sent.
+#
+# A custom_id is "<name>:<token>", where name routes the click (e.g. "pagination:next") and
+# token is the URL-safe base64 of the packed state followed by a signature over the name and
+# the state. Users can't change the state of a button, clicking one that doesn't verify does
+# nothing.
+
+import base64
+import binascii
+import hashlib
+import hmac
+import math
+import os
+import struct
+import time
+from typing import NamedTuple, Optional
+
+# Discord's limit for a custom_id.
+max_length = 100
+
+# owner_id, expires_at, index
+_layout = struct.Struct(">QIH")
+_signature_size = 8
+
+
+class ComponentState(NamedTuple):
+    """What a click on an interactive component needs to be handled."""
+
+    owner_id: int
+    # What the component shows, e.g. the command its pages came from.
+    key: str
+    index: int = 0
+    # Unix time, in seconds.
+    expires_at: int = 0
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at <= time.time()
+
+
+def _load_secret() -> bytes:
+    # Every process has to sign with the same secret for a button to keep working after a
+    # deploy or on another cluster, the bot's token is already shared by all of them.
+    secret = os.environ.get("COMPONENT_SECRET") or os.environ.get("DISCORD_TOKEN", "")
+    return hashlib.blake2b(b"custom_id:" + secret.encode()).digest()
+
+
+_secret = _load_secret()
+
+
+def _sign(name: str, payload: bytes) -> bytes:
+    return hashlib.blake2b(
+        name.encode() + b"\x1f" + payload, key=_secret, digest_size=_signature_size
+    ).digest()
+
+
+def name_of(custom_id: str) -> str:
+    """Returns the name a custom_id was encoded with, e.g. "pagination:next"."""
+    return custom_id.rpartition(":")[0]
+
+
+def fits(name: str, key: str) -> bool:
+    """Returns whether a state with this key can be encoded in a custom_id named `name`."""
+    size = _layout.size + len(key.encode()) + _signature_size
+    return len(name) + 1 + math.ceil(size * 4 / 3) <= max_length
+
+
+def encode(name: str, state: ComponentState) -> str:
+    """Packs and signs a component's state into a custom_id.
+
+    Raises ValueError if the key is too long, check with fits() first.
+    """
+    if not fits(name, state.key):
+        raise ValueError(f"state key doesn't fit in a custom_id: {state.key!r}")
+
+    payload = (
+        _layout.pack(state.owner_id, state.expires_at, state.index) + state.key.encode()
+    )
+    token = base64.urlsafe_b64encode(payload + _sign(name, payload))
+
+    return f"{name}:{token.rstrip(b'=').decode()}"
+
+
+def decode(custom_id: str) -> Optional[ComponentState]:
+    """Returns the state in a custom_id, or None if it's malformed or wasn't signed by us."""
+    name, _, token = custom_id.rpartition(":")
+
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError):
+        return None
+
+    if len(raw) < _layout.size + _signature_size:
+        return None
+
+    payload, signature = raw[:-_signature_size], raw[-_signature_size:]
+
+    if not hmac.compare_digest(signature, _sign(name, payload)):
+        return None
+
+    owner_id, expires_at, index = _layout.unpack_from(payload)
+
+    try:
+        key = payload[_layout.size :].decode()
+    except UnicodeDecodeError:
+        return None
+
+    return ComponentState(owner_id, key, index, expires_at)
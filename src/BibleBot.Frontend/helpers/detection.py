@@ -0,0 +1,124 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+import os
+import re
+from typing import Optional
+
+from core import metrics
+from helpers import book_names
+
+# on_message runs for every message the bot can see, so everything here is compiled once
+# and the cheap checks come first, most messages never reach a regex or get copied.
+
+verse_regex = re.compile(
+    r" [0-9]{1,3}:[0-9]{1,3}((,[0-9]{1,3})*)?([-–—‒－])?([0-9]{1,3})?((,[0-9]{1,3})*)?(:[0-9]{1,3})?"
+)
+
+# Every verse reference has a digit on both sides of a colon, a much simpler pattern to look for.
+_digit_colon_digit = re.compile(r"[0-9]:[0-9]")
+
+# What can be written in a message to get a resource paragraph, mapped to the resource's name
+# in `/resource`. Only resources read by paragraph or section number are here, a creed has no
+# reference to look for and its name alone is ordinary conversation.
+resource_triggers = {
+    "ccc": "ccc",
+    "cic": "cic",
+    "cceo": "cceo",
+    "lsc": "lsc",
+    "mh": "mh",
+    "magnifica humanitas": "mh",
+}
+
+# One pattern for every trigger, finding the reference is one scan however many resources there are.
+resource_regex = re.compile(
+    "("
+    + "|".join(
+        re.escape(trigger)
+        for trigger in sorted(resource_triggers, key=len, reverse=True)
+    )
+    + r") ([0-9]+(-[0-9]+)?)"
+)
+
+
+def _load_resource_guilds() -> Optional[frozenset]:
+    # A comma-separated list of guild IDs, or "*" for every guild.
+    guilds = os.environ.get(
+        "RESOURCE_DETECTION_GUILDS",
+        "238001909716353025,769709969796628500,362503610006765568,636984073226813449",
+    )
+
+    if guilds.strip() == "*":
+        return None
+
+    return frozenset(
+        int(guild_id) for guild_id in guilds.split(",") if guild_id.strip()
+    )
+
+
+# The guilds where resource references in messages are answered, None for all of them.
+resource_guilds = _load_resource_guilds()
+
+
+def clean_content(content: str) -> str:
+    """Removes the "://" of links, only copying the message if it has one."""
+    if "://" in content:
+        return content.replace("://", "")
+
+    return content
+
+
+def find_verse_candidate(content: str) -> Optional[str]:
+    """Returns the cleaned message if it looks like it contains a verse reference."""
+    if ":" not in content:
+        return None
+
+    clean_msg = clean_content(content)
+
+    if _digit_colon_digit.search(clean_msg) is None:
+        return None
+
+    if verse_regex.search(clean_msg) is None:
+        return None
+
+    return clean_msg
+
+
+def has_book_name(clean_msg: str) -> bool:
+    """Returns whether a verse candidate has a book name before its chapter:verse, as the backend needs."""
+    if book_names.matcher is None or book_names.matcher.has_reference(clean_msg):
+        return True
+
+    metrics.verse_candidates_without_book_total.inc()
+    return False
+
+
+def resource_detection_enabled(guild_id: Optional[int]) -> bool:
+    if guild_id is None:
+        return False
+
+    return resource_guilds is None or guild_id in resource_guilds
+
+
+def find_resource_reference(clean_msg: str) -> Optional[str]:
+    """Returns the first resource reference in a cleaned message, as `/resource` arguments."""
+    lowered = clean_msg.lower()
+
+    # Looking for each trigger as a plain substring is much cheaper than running the pattern.
+    for trigger in resource_triggers:
+        if trigger in lowered:
+            break
+    else:
+        return None
+
+    match = resource_regex.search(lowered)
+
+    if match is None:
+        return None
+
+    return f"{resource_triggers[match[1]]} {match[2]}"
@@ -6,115 +6,190 @@ License, v. 2.0. If a copy of the MPL was not distributed with this file,
 You can obtain one at https://mozilla.org/MPL/2.0/.
 """
 
+from collections.abc import Sequence
+from typing import Awaitable, Callable, List
+
 import disnake
 from disnake import abc
 from logger import VyLogger
 
 logger = VyLogger("default")
 
+# Discord's limits for a message with components, across all the components in it.
+max_displayable_text = 4000
+max_components = 40
 
-async def safe_send_interaction(receiver: disnake.Webhook, *args, **kwargs):
-    """A wrapper around interaction responses to ensure proper error handling."""
-    try:
-        await receiver.send(*args, **kwargs)
-    except disnake.errors.Forbidden:
-        message = "unable to send response to previous interaction"
+# Discord's limit for a message's content.
+max_content_length = 2000
 
-        if "components" in kwargs.keys():
-            if hasattr(kwargs["components"], "accent_color"):
-                if str(kwargs["components"].accent_color) == "#ff2e2e":
-                    message += " - this was an error embed"
 
-        logger.error(message)
-    except disnake.errors.HTTPException as ex:
-        if (
-            "Components displayable text size exceeds maximum size of 4000" in ex.text
-            and isinstance(kwargs["components"], list)
-        ):
-            components_list = kwargs["components"]
-            del kwargs["components"]
+def _text_length(text: str) -> int:
+    # Discord counts UTF-16 code units, characters outside the BMP count twice.
+    if text.isascii():
+        return len(text)
 
-            for component in components_list:
-                kwargs["components"] = component
-                await receiver.send(*args, **kwargs)
-        else:
-            message = "unable to send response to channel"
+    return len(text.encode("utf-16-le")) // 2
 
-            if "components" in kwargs.keys():
-                if hasattr(kwargs["components"], "accent_color"):
-                    if str(kwargs["components"].accent_color) == "#ff2e2e":
-                        message += " - this was an error embed"
 
-            logger.error(message)
+def measure_component(component) -> tuple[int, int]:
+    """Returns the displayable text size of a component and how many components it counts as."""
+    size = 0
+    count = 1
 
+    for text in (
+        getattr(component, "content", None),
+        getattr(component, "label", None),
+        getattr(component, "placeholder", None),
+    ):
+        if isinstance(text, str):
+            size += _text_length(text)
 
-async def safe_send_interaction_ephemeral(
-    resp: disnake.InteractionResponse, *args, **kwargs
-):
-    """A wrapper around ephemeral interaction responses to ensure proper error handling."""
-    try:
-        await resp.send_message(*args, **kwargs)
-    except disnake.errors.Forbidden:
-        message = "unable to send response to previous interaction"
+    children = list(getattr(component, "children", ()))
+    accessory = getattr(component, "accessory", None)
 
-        if "components" in kwargs.keys():
-            if hasattr(kwargs["components"], "accent_color"):
-                if str(kwargs["components"].accent_color) == "#ff2e2e":
-                    message += " - this was an error embed"
+    if accessory is not None:
+        children.append(accessory)
 
-        logger.error(message)
-    except disnake.errors.HTTPException as ex:
-        if (
-            "Components displayable text size exceeds maximum size of 4000" in ex.text
-            and isinstance(kwargs["components"], list)
+    for child in children:
+        child_size, child_count = measure_component(child)
+        size += child_size
+        count += child_count
+
+    return size, count
+
+
+def pack_components(components: list) -> List[list]:
+    """Splits components into as few messages as Discord's limits allow, keeping their order.
+
+    Filling each message before starting the next one gives the fewest messages when the
+    order has to be kept. A component over the limits on its own still gets its own message.
+    """
+    batches: List[list] = []
+    batch: list = []
+    batch_size = 0
+    batch_count = 0
+
+    for component in components:
+        size, count = measure_component(component)
+
+        if batch and (
+            batch_size + size > max_displayable_text
+            or batch_count + count > max_components
         ):
-            components_list = kwargs["components"]
-            del kwargs["components"]
+            batches.append(batch)
+            batch = []
+            batch_size = 0
+            batch_count = 0
 
-            for component in components_list:
-                kwargs["components"] = component
-                await resp.send_message(*args, **kwargs)
-        else:
-            message = "unable to send response to channel"
+        batch.append(component)
+        batch_size += size
+        batch_count += count
 
-            if "components" in kwargs.keys():
-                if hasattr(kwargs["components"], "accent_color"):
-                    if str(kwargs["components"].accent_color) == "#ff2e2e":
-                        message += " - this was an error embed"
+    if batch:
+        batches.append(batch)
 
-            logger.error(message)
+    return batches
 
 
-async def safe_send_channel(receiver: abc.Messageable, *args, **kwargs):
-    """A wrapper around channel responses to ensure proper error handling."""
+def pack_texts(texts: List[str], separator: str = "\n\n") -> List[str]:
+    """Joins consecutive texts into as few messages as fit in Discord's content limit.
+
+    Texts are never split, a text over the limit on its own still gets its own message.
+    """
+    messages: List[str] = []
+    batch: List[str] = []
+    batch_length = 0
+    separator_length = _text_length(separator)
+
+    for text in texts:
+        length = _text_length(text)
+
+        if batch and batch_length + separator_length + length > max_content_length:
+            messages.append(separator.join(batch))
+            batch = []
+
+        batch_length = batch_length + separator_length + length if batch else length
+        batch.append(text)
+
+    if batch:
+        messages.append(separator.join(batch))
+
+    return messages
+
+
+def _failure_message(message: str, kwargs: dict) -> str:
+    if "components" in kwargs.keys():
+        if hasattr(kwargs["components"], "accent_color"):
+            if str(kwargs["components"].accent_color) == "#ff2e2e":
+                message += " - this was an error embed"
+
+    return message
+
+
+async def _send_packed(
+    send: Callable[..., Awaitable],
+    send_rest: Callable[..., Awaitable],
+    forbidden_message: str,
+    args: tuple,
+    kwargs: dict,
+):
+    components = kwargs.get("components")
+
+    # Pages that are rendered as they're shown (renderers.LazyPages) are all sent here.
+    if isinstance(components, Sequence) and not isinstance(components, list):
+        components = kwargs["components"] = list(components)
+
+    batches = pack_components(components) if isinstance(components, list) else []
+
     try:
-        await receiver.send(*args, **kwargs)
+        if len(batches) <= 1:
+            await send(*args, **kwargs)
+            return
+
+        for index, batch in enumerate(batches):
+            await (send if index == 0 else send_rest)(
+                *args, **{**kwargs, "components": batch}
+            )
     except disnake.errors.Forbidden:
-        message = "unable to send response to channel"
+        logger.error(_failure_message(forbidden_message, kwargs))
+    except disnake.errors.HTTPException as ex:
+        logger.error(
+            _failure_message("unable to send response to channel", kwargs)
+            + f": {ex.text}"
+        )
 
-        if "components" in kwargs.keys():
-            if hasattr(kwargs["components"], "accent_color"):
-                if str(kwargs["components"].accent_color) == "#ff2e2e":
-                    message += " - this was an error embed"
 
-        logger.error(message)
-    except disnake.errors.HTTPException as ex:
-        if (
-            "Components displayable text size exceeds maximum size of 4000" in ex.text
-            and isinstance(kwargs["components"], list)
-        ):
-            components_list = kwargs["components"]
-            del kwargs["components"]
+async def safe_send_interaction(receiver: disnake.Webhook, *args, **kwargs):
+    """A wrapper around interaction responses to ensure proper error handling."""
+    await _send_packed(
+        receiver.send,
+        receiver.send,
+        "unable to send response to previous interaction",
+        args,
+        kwargs,
+    )
+
 
-            for component in components_list:
-                kwargs["components"] = component
-                await receiver.send(*args, **kwargs)
-        else:
-            message = "unable to send response to channel"
+async def safe_send_interaction_ephemeral(
+    resp: disnake.InteractionResponse, *args, **kwargs
+):
+    """A wrapper around ephemeral interaction responses to ensure proper error handling."""
+    # An interaction can only be responded to once, the rest are followups.
+    await _send_packed(
+        resp.send_message,
+        resp._parent.followup.send,
+        "unable to send response to previous interaction",
+        args,
+        kwargs,
+    )
 
-            if "components" in kwargs.keys():
-                if hasattr(kwargs["components"], "accent_color"):
-                    if str(kwargs["components"].accent_color) == "#ff2e2e":
-                        message += " - this was an error embed"
 
-            logger.error(message)
+async def safe_send_channel(receiver: abc.Messageable, *args, **kwargs):
+    """A wrapper around channel responses to ensure proper error handling."""
+    await _send_packed(
+        receiver.send,
+        receiver.send,
+        "unable to send response to channel",
+        args,
+        kwargs,
+    )
@@ -6,23 +6,36 @@ License, v. 2.0. If a copy of the MPL was not distributed with this file,
 You can obtain one at https://mozilla.org/MPL/2.0/.
 """
 
-import json
-import os
-from typing import Optional, Union
+from typing import Optional, Sequence, Union
 
-import aiohttp
 import disnake
-from core import constants
+from core import codec, constants, metrics
 from core.i18n import bb_i18n
+from core.models import (
+    CommandResponse,
+    MalformedResponseError,
+    Response,
+    VerseResponse,
+    decode_response,
+)
 from helpers import channels, sending
+from helpers.singleflight import SingleFlight
 from logger import VyLogger
-from services import webhooks
+from services import command_cache, verse_batcher, webhooks
+from services.backend_client import BackendUnavailableError, client
 from ui import renderers as containers
+from ui import text_renderers
 from ui.paginator import ComponentPaginator
 
 i18n = bb_i18n()
 logger = VyLogger("default")
-aiohttp_headers = {"Authorization": os.environ.get("ENDPOINT_TOKEN", "")}
+
+# Identical verse requests that are in flight at the same time share one backend call.
+verse_flights = SingleFlight()
+
+# A paginator's pages are fetched again from their source, a request body prefixed with its kind.
+_command_source = "c"
+_verse_source = "v"
 
 
 async def submit_command(
@@ -35,39 +48,37 @@ async def submit_command(
     if ctx is None or ctx.channel is None:
         return None
 
-    req_body = {
-        "UserId": user.id,
-        "GuildId": ctx.guild_id,
-        "ChannelId": ctx.channel_id,
-        "ThreadId": ctx.thread_id,
-        "IsThread": ctx.is_thread,
-        "IsBot": user.bot,
-        "IsDM": ctx.is_dm,
-        "Body": body,
-    }
+    req_body = _request_body(ctx, user, body)
 
-    endpoint = os.environ.get("ENDPOINT", "")
+    resp = command_cache.cache.get_response(req_body)
 
-    resp_body = await submit_command_raw(endpoint, req_body)
+    if resp is None:
+        try:
+            resp = await submit_command_raw(req_body)
+        except (BackendUnavailableError, MalformedResponseError) as err:
+            logger.error(f"<{user.id}@{ctx.guild_id}#{ctx.channel_id}> {err}")
+            return create_unavailable_container(req_body)
 
-    if resp_body["culture"] is not None:
-        localization = i18n.get_i18n_or_default(resp_body["culture"].replace("-", "_"))
-    else:
-        localization = i18n.get_i18n_or_default("en_US")
+        command_cache.cache.put_response(req_body, resp)
 
-    if resp_body["ok"]:
-        logger.info(
-            f"<{user.id}@{ctx.guild_id}#{ctx.channel_id}> " + resp_body["logStatement"]
-        )
+    if body.startswith("+language setserver"):
+        command_cache.cache.forget_cultures(guild_id=ctx.guild_id)
+    elif body.startswith("+language set"):
+        command_cache.cache.forget_cultures(user_id=user.id)
+
+    localization = _localization_for(resp.culture)
+
+    if resp.ok:
+        logger.info(f"<{user.id}@{ctx.guild_id}#{ctx.channel_id}> {resp.log_statement}")
     else:
         logger.error(
-            f"<{user.id}@{ctx.guild_id}#{ctx.channel_id}> " + resp_body["logStatement"]
+            f"<{user.id}@{ctx.guild_id}#{ctx.channel_id}> {resp.log_statement}"
         )
 
-    if resp_body["type"] == "cmd":
-        if len(resp_body["pages"]) == 1:
+    if isinstance(resp, CommandResponse):
+        if len(resp.pages) == 1:
             # todo: webhook stuff should not be dailyverse-specific
-            if resp_body["removeWebhook"] and ctx.guild is not None:
+            if resp.remove_webhook and ctx.guild is not None:
                 try:
                     await webhooks.remove_webhooks(user, ctx.guild)
                 except disnake.errors.Forbidden:
@@ -80,24 +91,22 @@ async def submit_command(
                         ),
                     )
 
-            if resp_body["createWebhook"] and ctx.guild is not None:
+            if resp.create_webhook and ctx.guild is not None:
                 try:
                     webhook_service_body = await webhooks.create_webhook(ctx)
 
                     # Send a request to the webhook controller, which will update the DB.
                     req_body["Body"] = webhook_service_body
-                    async with aiohttp.ClientSession() as subsession:
-                        async with subsession.post(
-                            f"{endpoint}/webhooks/process",
-                            json=req_body,
-                            headers=aiohttp_headers,
-                        ) as subresp:
-                            if subresp.status != 200:
-                                logger.error("couldn't submit webhook")
-                            else:
-                                return containers.convert_embed_to_container(
-                                    resp_body["pages"][0]
-                                )
+                    async with client.post(
+                        "/webhooks/process", json=req_body
+                    ) as subresp:
+                        if subresp.status != 200:
+                            logger.error("couldn't submit webhook")
+                        else:
+                            return containers.convert_embed_to_container(resp.pages[0])
+                except BackendUnavailableError as err:
+                    logger.error(f"couldn't submit webhook: {err}")
+                    return create_unavailable_container(req_body)
                 except disnake.errors.Forbidden:
                     try:
                         await sending.safe_send_channel(
@@ -113,105 +122,58 @@ async def submit_command(
                             f"unable to add webhook for <{user.id}@{ctx.guild_id}#{ctx.channel_id}>"
                         )
 
-            return containers.convert_embed_to_container(resp_body["pages"][0])
+            return containers.convert_embed_to_container(resp.pages[0])
         else:
-            return containers.mass_create_containers(resp_body["pages"], localization)
-    elif resp_body["type"] == "verse":
-        if "does not support the" in resp_body["logStatement"]:
+            return containers.mass_create_containers(
+                resp.pages, localization, source=_command_source + body
+            )
+    elif isinstance(resp, VerseResponse):
+        if resp.log_statement and "does not support the" in resp.log_statement:
             return containers.create_error_container(
-                "Verse Error", resp_body["logStatement"], localization
+                "Verse Error", resp.log_statement, localization
             )
-        elif "too many verses" in resp_body["logStatement"]:
-            return containers.convert_embed_to_container(resp_body["pages"][0])
-
-        display_style = resp_body["displayStyle"]
-        if display_style == "embed":
-            for verse in resp_body["verses"]:
-                return containers.convert_verse_to_container(
-                    verse,
-                    (
-                        resp_body["cultureFooter"]
-                        if resp_body["cultureFooter"] is not None
-                        else constants.verse_footer
-                    ),
-                )
-            return None
-        elif display_style == "blockquote":
-            for verse in resp_body["verses"]:
-                reference_title = (
-                    verse["reference"]["asString"]
-                    + " - "
-                    + verse["reference"]["version"]["name"]
-                )
-                verse_title = (
-                    ("**" + verse["title"] + "**\n> \n> ")
-                    if len(verse["title"]) > 0
-                    else ""
-                )
-                verse_text = verse["text"]
-
-                returning_text = f"**{reference_title}**\n\n> {verse_title}{verse_text}\n\n-# {constants.logo_emoji} {resp_body['cultureFooter']}"
-
-                if verse["reference"]["version"]["publisher"] is not None:
-                    publisher_info = constants.publisher_to_url[
-                        verse["reference"]["version"]["publisher"]
-                    ]
 
-                    if publisher_info is not None:
-                        returning_text += (
-                            f" ∙ [{publisher_info['name']}]({publisher_info['url']})"
-                        )
-
-                return returning_text
+        if len(resp.verses) == 0:
             return None
-        elif display_style == "code":
-            for verse in resp_body["verses"]:
-                reference_title = (
-                    verse["reference"]["asString"]
-                    + " - "
-                    + verse["reference"]["version"]["name"]
-                )
-                verse_title = (
-                    (verse["title"] + "\n\n") if len(verse["title"]) > 0 else ""
-                )
-                verse_text = verse["text"].replace("*", "")
-
-                returning_text = f"**{reference_title}**\n\n```json\n{verse_title} {verse_text}```\n\n-# {constants.logo_emoji} {resp_body['cultureFooter']}"
 
-                if verse["reference"]["version"]["publisher"] is not None:
-                    publisher_info = constants.publisher_to_url[
-                        verse["reference"]["version"]["publisher"]
-                    ]
-
-                    if publisher_info is not None:
-                        returning_text += (
-                            f" ∙ [{publisher_info['name']}]({publisher_info['url']})"
-                        )
+        if resp.display_style in text_renderers.text_styles:
+            return sending.pack_texts(
+                text_renderers.render_verses(
+                    resp.verses, resp.display_style, resp.culture_footer
+                )
+            )
+        elif resp.display_style == "embed":
+            footer = (
+                resp.culture_footer
+                if resp.culture_footer is not None
+                else constants.verse_footer
+            )
 
-                return returning_text
-            return None
+            return [
+                containers.convert_verse_to_container(verse, footer)
+                for verse in resp.verses
+            ]
         return None
     return None
 
 
-async def submit_command_raw(endpoint: str, req_body: dict):
-    """Submits a command to the backend and returns the result."""
+async def submit_command_raw(req_body: dict) -> Response:
+    """Submits a command to the backend and returns the result.
+
+    Raises MalformedResponseError if the backend's answer can't be decoded.
+    """
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            f"{endpoint}/commands/process",
-            json=req_body,
-            headers=aiohttp_headers,
-        ) as resp:
-            resp_text = await resp.text()
-            resp_text = resp_text.replace("\\\\n", "\\n")
+    async with client.post("/commands/process", json=req_body) as resp:
+        resp_raw = await resp.read()
 
-            try:
-                resp_body = json.loads(resp_text)
-                return resp_body
-            except json.JSONDecodeError:
-                logger.error(f"couldn't parse response from backend: {resp_text}")
-                return {"ok": False, "logStatement": "couldn't parse response"}
+    try:
+        return decode_response(codec.loads(resp_raw, unescape_newlines=True))
+    except (codec.JSONDecodeError, MalformedResponseError) as err:
+        metrics.backend_decode_failures_total.labels("/commands/process").inc()
+        logger.error(
+            f"couldn't parse response from backend: {resp_raw.decode(errors='replace')}"
+        )
+        raise MalformedResponseError("couldn't parse response") from err
 
 
 async def submit_verse(rch: disnake.abc.Messageable, user: disnake.abc.User, body: str):
@@ -221,20 +183,13 @@ async def submit_verse(rch: disnake.abc.Messageable, user: disnake.abc.User, bod
     if ctx is None or ctx.channel is None:
         return None
 
-    req_body = {
-        "UserId": user.id,
-        "GuildId": ctx.guild_id,
-        "ChannelId": ctx.channel_id,
-        "ThreadId": ctx.thread_id,
-        "IsThread": ctx.is_thread,
-        "IsBot": user.bot,
-        "IsDM": ctx.is_dm,
-        "Body": body,
-    }
+    # Passive detections aren't worth an error message in every channel during an outage.
+    if client.breaker.is_open:
+        return None
 
-    endpoint = os.environ.get("ENDPOINT", "")
+    req_body = _request_body(ctx, user, body)
 
-    resp_body = await submit_verse_raw(endpoint, req_body)
+    resp_body = await submit_verse_raw(req_body)
 
     if isinstance(resp_body, disnake.ui.Container):
         await sending.safe_send_channel(
@@ -257,123 +212,186 @@ async def submit_verse(rch: disnake.abc.Messageable, user: disnake.abc.User, bod
 
 
 async def submit_verse_raw(
-    endpoint: str, req_body: dict, is_command: bool = False
+    req_body: dict, is_command: bool = False
 ) -> Optional[
     Union[
         disnake.ui.Container, list[str], list[disnake.ui.Container], ComponentPaginator
     ]
 ]:
-    """Submits a verse to the backend and returns the result."""
+    """Submits a verse to the backend and returns the result.
 
-    resp_body = None
+    If the backend can't be reached, commands get an error container back, passive detections get None.
+    """
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            f"{endpoint}/verses/process",
-            json=req_body,
-            headers=aiohttp_headers,
-        ) as resp:
-            resp_body = await resp.json()
+    try:
+        resp = await verse_flights.do(
+            _verse_flight_key(req_body, is_command),
+            lambda: _fetch_verse(req_body, is_command),
+        )
+    except (BackendUnavailableError, MalformedResponseError) as err:
+        logger.error(
+            f"<{req_body['UserId']}@{req_body['GuildId']}#{req_body['ChannelId']}> {err}"
+        )
+        return create_unavailable_container(req_body) if is_command else None
 
-    if resp_body["culture"] is not None:
-        localization = i18n.get_i18n_or_default(resp_body["culture"].replace("-", "_"))
-    else:
-        localization = i18n.get_i18n_or_default("en_US")
+    # Users that have opted out get an empty response.
+    if resp is None:
+        return None
+
+    localization = _localization_for(resp.culture)
 
-    if resp_body["logStatement"]:
+    if resp.log_statement:
         logger.info(
             f"<{req_body['UserId']}@{req_body['GuildId']}#{req_body['ChannelId']}> "
-            + resp_body["logStatement"]
+            + resp.log_statement
         )
 
-    if resp_body["logStatement"]:
-        if "does not support the" in resp_body["logStatement"]:
+        if "does not support the" in resp.log_statement:
             return containers.create_error_container(
-                "Verse Error", resp_body["logStatement"], localization
+                "Verse Error", resp.log_statement, localization
             )
-        elif "too many verses" in resp_body["logStatement"]:
-            return containers.convert_embed_to_container(resp_body["pages"][0])
 
-    if "verses" not in resp_body:
-        if "pages" in resp_body:
-            return containers.convert_embed_to_container(resp_body["pages"][0])
-        return
+    # Errors such as "too many verses" come back as a command response.
+    if isinstance(resp, CommandResponse):
+        if len(resp.pages) > 0:
+            return containers.convert_embed_to_container(resp.pages[0])
+        return None
 
-    verses = resp_body["verses"]
+    verses = resp.verses
     processed_verses = []
+    footer = resp.culture_footer
+
+    if resp.display_style == "embed":
+        if footer is None:
+            footer = constants.verse_footer
 
-    display_style = resp_body["displayStyle"]
-    if display_style == "embed":
-        if resp_body["paginate"] and len(verses) > 1:
+        if resp.paginate and len(verses) > 1:
             components = containers.mass_create_containers(
                 verses,
-                (
-                    resp_body["cultureFooter"]
-                    if resp_body["cultureFooter"] is not None
-                    else constants.verse_footer
-                ),
+                footer,
                 is_verses=True,
+                source=_verse_source + req_body["Body"],
             )
             return ComponentPaginator(components, int(req_body["UserId"]))
         else:
             for verse in verses:
                 processed_verses.append(
-                    containers.convert_verse_to_container(
-                        verse,
-                        (
-                            resp_body["cultureFooter"]
-                            if resp_body["cultureFooter"] is not None
-                            else constants.verse_footer
-                        ),
-                    ),
-                )
-    elif display_style == "blockquote":
-        for verse in verses:
-            reference_title = (
-                verse["reference"]["asString"]
-                + " - "
-                + verse["reference"]["version"]["name"]
-            )
-            verse_title = (
-                ("**" + verse["title"] + "**\n> \n> ")
-                if len(verse["title"]) > 0
-                else ""
-            )
-            verse_text = verse["text"]
-
-            processed_verses.append(
-                f"**{reference_title}**\n\n> {verse_title}{verse_text}\n\n-# {constants.logo_emoji}  {resp_body['cultureFooter']}"
-                + (
-                    f" ∙ [{constants.publisher_to_url[verse['reference']['version']['publisher']]['name']}](<{constants.publisher_to_url[verse['reference']['version']['publisher']]['url']}>)"
-                    if verse["reference"]["version"]["publisher"] is not None
-                    else ""
-                )
-            )
-    elif display_style == "code":
-        for verse in verses:
-            reference_title = (
-                verse["reference"]["asString"]
-                + " - "
-                + verse["reference"]["version"]["name"]
-            )
-            verse_title = (verse["title"] + "\n\n") if len(verse["title"]) > 0 else ""
-            verse_text = verse["text"].replace("*", "")
-
-            processed_verses.append(
-                f"**{reference_title}**\n\n```json\n{verse_title} {verse_text}```\n\n-# {constants.logo_emoji}  {resp_body['cultureFooter']}"
-                + (
-                    f" ∙ [{constants.publisher_to_url[verse['reference']['version']['publisher']]['name']}](<{constants.publisher_to_url[verse['reference']['version']['publisher']]['url']}>)"
-                    if verse["reference"]["version"]["publisher"] is not None
-                    else ""
+                    containers.convert_verse_to_container(verse, footer)
                 )
-            )
+    elif resp.display_style in text_renderers.text_styles:
+        # As few messages as fit, each one costs a call in the channel's rate limit.
+        processed_verses = sending.pack_texts(
+            text_renderers.render_verses(verses, resp.display_style, footer)
+        )
 
     return processed_verses
 
 
-async def check_if_staff(user_id: int):
-    endpoint = os.environ.get("ENDPOINT", "")
+async def fetch_pages(
+    rch: disnake.abc.Messageable, user: disnake.abc.User, source: str
+) -> Optional[Sequence[disnake.ui.Container]]:
+    """Fetches a paginator's pages again from the request they came from (LazyPages.source).
 
+    Returns None if the request doesn't give pages anymore, such as when the backend can't be reached.
+    """
+    kind, body = source[:1], source[1:]
+
+    if kind == _command_source:
+        resp = await submit_command(rch, user, body)
+        return resp if isinstance(resp, containers.LazyPages) else None
+
+    if kind == _verse_source:
+        ctx = await channels.get_channel_context_from_messageable(rch)
+
+        if ctx is None or ctx.channel is None:
+            return None
+
+        resp = await submit_verse_raw(_request_body(ctx, user, body), is_command=True)
+        return resp.pages if isinstance(resp, ComponentPaginator) else None
+
+    return None
+
+
+def create_unavailable_container(req_body: dict) -> disnake.ui.Container:
+    """Creates the error shown when the backend can't be reached."""
+    # Nothing came back to localize with, so use the culture the user last resolved to.
+    localization = _localization_for(command_cache.cache.culture_for(req_body))
+
+    return containers.create_error_container(
+        localization["BACKEND_UNAVAILABLE_TITLE"],
+        localization["BACKEND_UNAVAILABLE_DESC"],
+        localization,
+    )
+
+
+def _request_body(
+    ctx: channels.ChannelContext, user: disnake.abc.User, body: str
+) -> dict:
+    return {
+        "UserId": user.id,
+        "GuildId": ctx.guild_id,
+        "ChannelId": ctx.channel_id,
+        "ThreadId": ctx.thread_id,
+        "IsThread": ctx.is_thread,
+        "IsBot": user.bot,
+        "IsDM": ctx.is_dm,
+        "Body": body,
+    }
+
+
+def _localization_for(culture: Optional[str]) -> dict:
+    if culture is not None:
+        return i18n.get_i18n_or_default(culture.replace("-", "_"))
+
+    return i18n.get_i18n_or_default("en_US")
+
+
+def _verse_flight_key(req_body: dict, is_command: bool) -> tuple:
+    # The backend resolves version, language, display style, pagination, verse numbers and
+    # titles from the user and guild (and ignores user preferences for bots), honours the
+    # user's opt-out and records verse metrics per user, so none of those can be shared
+    # across users. Only a user repeating a reference in the same guild is coalesced.
+    # Commands aren't batched, so they never wait on a passive detection's flight.
+    return (
+        " ".join(req_body["Body"].split()),
+        req_body["UserId"],
+        req_body["GuildId"],
+        req_body["IsBot"],
+        is_command,
+    )
+
+
+async def _fetch_verse(req_body: dict, is_command: bool = False) -> Optional[Response]:
+    # Commands have someone waiting on a deferred response, only passive detections are batched.
+    if verse_batcher.batcher is not None and not is_command:
+        endpoint = verse_batcher.batcher.path
+        data = await verse_batcher.batcher.submit(req_body)
+    else:
+        endpoint = "/verses/process"
+
+        async with client.post(endpoint, json=req_body) as resp:
+            raw = await resp.read()
+
+        if not raw.strip():
+            return None
+
+        try:
+            data = codec.loads(raw)
+        except codec.JSONDecodeError as err:
+            metrics.backend_decode_failures_total.labels(endpoint).inc()
+            raise MalformedResponseError("couldn't parse verse response") from err
+
+    if data is None:
+        return None
+
+    try:
+        return decode_response(data)
+    except MalformedResponseError:
+        metrics.backend_decode_failures_total.labels(endpoint).inc()
+        raise
+
+
+async def check_if_staff(user_id: int):
     req_body = {
         "UserId": user_id,
         "GuildId": 0,
@@ -385,10 +403,8 @@ async def check_if_staff(user_id: int):
         "Body": "",
     }
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            f"{endpoint}/commands/staff_check",
-            json=req_body,
-            headers=aiohttp_headers,
-        ) as resp:
-            return resp
+    async with client.post("/commands/staff_check", json=req_body) as resp:
+        # Read the body while the connection is still ours, so callers
+        # can use `resp.json()` after it has gone back to the pool.
+        await resp.read()
+        return resp
@@ -0,0 +1,357 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+import asyncio
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+from core import codec, metrics
+from logger import VyLogger
+
+logger = VyLogger("default")
+
+# Absolute (monotonic) time by which the current interaction or message must be answered.
+deadline: ContextVar[Optional[float]] = ContextVar("backend_deadline", default=None)
+
+# How long an interaction or message is given to be answered, measured from when it was created.
+# Interaction tokens are valid for 15 minutes, but nobody waits that long for a verse.
+deadline_budget = float(os.environ.get("BACKEND_DEADLINE_BUDGET", "60"))
+
+
+class BackendUnavailableError(Exception):
+    """Raised when the backend can't be reached in time, or the circuit breaker is open."""
+
+
+class CircuitOpenError(BackendUnavailableError):
+    """Raised without making a request while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to the backend after repeated failures.
+    Parameters:
+    ----------
+    failure_threshold: int
+        How many consecutive failures open the circuit.
+    reset_timeout: float
+        How long, in seconds, the circuit stays open before a single probe request is let through.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        elif time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+
+        return "half_open"
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == "open"
+
+    def allow(self) -> bool:
+        state = self.state
+
+        if state == "closed":
+            return True
+        elif state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+
+        return False
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info("backend circuit breaker closed")
+
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probing = False
+
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.error(
+                    f"backend circuit breaker opened after {self.failures} failures"
+                )
+
+            self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """Lets another probe through, for a probe that ended without telling us anything."""
+        self._probing = False
+
+
+def set_deadline(created_at: datetime):
+    """Sets the deadline of the current task from the age of the interaction or message being answered."""
+    age = (datetime.now(timezone.utc) - created_at).total_seconds()
+    deadline.set(time.monotonic() + deadline_budget - max(age, 0.0))
+
+
+class BackendClient:
+    """
+    A long-lived HTTP client for talking to the backend.
+    Parameters:
+    ----------
+    endpoint: str
+        The base URL of the backend, paths passed to `request` are appended to it.
+    token: str
+        The value sent in the Authorization header of every backend request.
+    timeouts: Dict[str, float]
+        Request timeouts in seconds, keyed by path prefix. The longest matching prefix wins.
+    default_timeout: float
+        The timeout for paths that don't match any prefix in `timeouts`.
+    breaker: CircuitBreaker
+        The circuit breaker guarding every request.
+    limit: int
+        The maximum number of connections kept in the pool.
+    limit_per_host: int
+        The maximum number of connections to a single host.
+    dns_ttl: int
+        How long, in seconds, resolved addresses are cached for.
+    keepalive_timeout: float
+        How long, in seconds, an idle connection is kept open for reuse.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        token: str,
+        timeouts: Optional[Dict[str, float]] = None,
+        default_timeout: float = 10.0,
+        breaker: Optional[CircuitBreaker] = None,
+        limit: int = 100,
+        limit_per_host: int = 64,
+        dns_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+    ):
+        self.endpoint = endpoint
+        self.headers = {"Authorization": token}
+        self.timeouts = timeouts or {}
+        self.default_timeout = default_timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # The session is created lazily so that it's always bound to the running loop,
+        # this also covers anything that makes a request before the bot has started.
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+
+        return self._session
+
+    async def open(self):
+        """Opens the connection pool."""
+        _ = self.session
+        logger.info(
+            f"opened backend connection pool (limit={self.limit}, per_host={self.limit_per_host})"
+        )
+
+    async def close(self):
+        """Closes the connection pool and every connection in it."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("closed backend connection pool")
+
+        self._session = None
+
+    def timeout_for(self, path: str) -> Tuple[float, bool]:
+        """Returns the timeout for a request to `path` and whether it was cut short by the deadline."""
+        timeout = self.default_timeout
+        matched = ""
+
+        for prefix, prefix_timeout in self.timeouts.items():
+            if path.startswith(prefix) and len(prefix) > len(matched):
+                timeout = prefix_timeout
+                matched = prefix
+
+        current_deadline = deadline.get()
+
+        if current_deadline is not None:
+            remaining = current_deadline - time.monotonic()
+
+            if remaining < timeout:
+                return remaining, True
+
+        return timeout, False
+
+    @asynccontextmanager
+    async def request(self, method: str, path: str, **kwargs):
+        """Sends an authorized request to `path` on the backend, `json` bodies are serialized with orjson.
+
+        Raises BackendUnavailableError if the backend fails to connect or answer within
+        the timeout for `path`, the current deadline has passed, or the circuit breaker is open.
+        """
+        endpoint = metrics.endpoint_label(path)
+        timeout, is_deadline = self.timeout_for(path)
+
+        if timeout <= 0:
+            metrics.backend_responses_total.labels(endpoint, "deadline").inc()
+            raise BackendUnavailableError(f"deadline exceeded before {method} {path}")
+
+        # Whether this request is the half-open breaker's probe, which has to be released
+        # however it ends.
+        probing = self.breaker.state == "half_open"
+
+        if not self.breaker.allow():
+            metrics.backend_responses_total.labels(endpoint, "circuit_open").inc()
+            raise CircuitOpenError(f"circuit breaker is open, refusing {method} {path}")
+
+        headers = self.headers
+
+        if "json" in kwargs:
+            kwargs["data"] = codec.dumps(kwargs.pop("json"))
+            headers = {**headers, "Content-Type": "application/json"}
+
+        in_flight = metrics.backend_in_flight.labels(endpoint)
+        in_flight.inc()
+        start = time.perf_counter()
+        recorded = False
+
+        try:
+            async with self.session.request(
+                method,
+                f"{self.endpoint}{path}",
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                **kwargs,
+            ) as resp:
+                metrics.backend_responses_total.labels(endpoint, resp.status).inc()
+
+                if resp.status >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+
+                recorded = True
+
+                try:
+                    yield resp
+                except (asyncio.TimeoutError, aiohttp.ClientError) as err:
+                    # Reading or parsing the body failed. The response was already counted
+                    # and its status recorded, so this isn't a failure to connect.
+                    raise BackendUnavailableError(
+                        f"{method} {path} failed reading the response with {err.__class__.__name__}"
+                    ) from err
+        except (asyncio.TimeoutError, aiohttp.ClientError) as err:
+            metrics.backend_responses_total.labels(
+                endpoint,
+                "timeout" if isinstance(err, asyncio.TimeoutError) else "error",
+            ).inc()
+
+            # Running out of our own deadline doesn't say anything about the backend's health.
+            if not (is_deadline and isinstance(err, asyncio.TimeoutError)):
+                self.breaker.record_failure()
+                recorded = True
+
+            raise BackendUnavailableError(
+                f"{method} {path} failed with {err.__class__.__name__}"
+            ) from err
+        finally:
+            # A probe that timed out on our deadline or was cancelled would otherwise keep
+            # the breaker from ever letting another one through.
+            if probing and not recorded:
+                self.breaker.release_probe()
+
+            in_flight.dec()
+            metrics.backend_request_seconds.labels(endpoint, method).observe(
+                time.perf_counter() - start
+            )
+
+    def get(self, path: str, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    async def get_with_retries(
+        self, path: str, retries: int = 2, backoff: float = 0.1, **kwargs
+    ) -> Tuple[int, bytes]:
+        """Sends an idempotent GET, retrying connection failures and 5xx responses with jittered backoff.
+
+        Returns the status and body of the last attempt.
+        """
+        for attempt in range(retries + 1):
+            try:
+                async with self.get(path, **kwargs) as resp:
+                    body = await resp.read()
+
+                    if resp.status < 500 or attempt == retries:
+                        return resp.status, body
+            except CircuitOpenError:
+                raise
+            except BackendUnavailableError:
+                if attempt == retries:
+                    raise
+
+            # Full jitter, so that a burst of failed requests doesn't retry in lockstep.
+            delay = random.uniform(0, backoff * 2**attempt)
+            current_deadline = deadline.get()
+
+            if (
+                current_deadline is not None
+                and time.monotonic() + delay >= current_deadline
+            ):
+                raise BackendUnavailableError(f"deadline exceeded retrying GET {path}")
+
+            await asyncio.sleep(delay)
+
+        raise BackendUnavailableError(f"GET {path} exhausted its retries")
+
+
+client = BackendClient(
+    os.environ.get("ENDPOINT", ""),
+    os.environ.get("ENDPOINT_TOKEN", ""),
+    timeouts={
+        "/commands/process": 20.0,
+        "/commands/staff_check": 5.0,
+        "/verses/process": 15.0,
+        "/verses/batch": 15.0,
+        "/webhooks/process": 10.0,
+        "/experiments/": 3.0,
+        "/stats/process": 10.0,
+    },
+    breaker=CircuitBreaker(
+        failure_threshold=int(os.environ.get("BACKEND_BREAKER_THRESHOLD", "5")),
+        reset_timeout=float(os.environ.get("BACKEND_BREAKER_RESET", "30")),
+    ),
+    limit=int(os.environ.get("BACKEND_POOL_LIMIT", "100")),
+    limit_per_host=int(os.environ.get("BACKEND_POOL_LIMIT_PER_HOST", "64")),
+    dns_ttl=int(os.environ.get("BACKEND_DNS_TTL", "300")),
+)
+
+metrics.backend_circuit_open.set_function(lambda: float(client.breaker.is_open))
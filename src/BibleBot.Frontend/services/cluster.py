@@ -0,0 +1,124 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# The worker's side of cluster mode, see coordinator.py. A worker is started with the
+# shards it owns and asks the coordinator before every IDENTIFY, so the cluster as a
+# whole stays within Discord's IDENTIFY rate limit.
+
+import asyncio
+import os
+from typing import List, Optional, Sequence
+
+import aiohttp
+
+from core import codec
+from logger import VyLogger
+
+logger = VyLogger("default")
+
+# Set by the coordinator for the processes it starts, a standalone bot has none of these.
+coordinator_url: Optional[str] = os.environ.get("CLUSTER_COORDINATOR") or None
+cluster_id: Optional[int] = (
+    int(os.environ["CLUSTER_ID"]) if "CLUSTER_ID" in os.environ else None
+)
+
+enabled = coordinator_url is not None
+
+
+def parse_shard_ids(value: str) -> List[int]:
+    """Parses a contiguous range of shard IDs, written `first-last`."""
+    first, _, last = value.partition("-")
+    return list(range(int(first), int(last or first) + 1))
+
+
+def format_shard_ids(shard_ids: List[int]) -> str:
+    return f"{shard_ids[0]}-{shard_ids[-1]}"
+
+
+def shard_count() -> Optional[int]:
+    value = os.environ.get("SHARD_COUNT")
+    return int(value) if value else None
+
+
+def shard_ids() -> Optional[List[int]]:
+    value = os.environ.get("SHARD_IDS")
+    return parse_shard_ids(value) if value else None
+
+
+async def wait_for_identify(shard_id: int):
+    """Waits until the coordinator lets `shard_id` IDENTIFY."""
+    # The coordinator may be restarting, keep asking rather than IDENTIFY unsynchronized.
+    while True:
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.post(
+                    f"{coordinator_url}/identify/{shard_id}",
+                    timeout=aiohttp.ClientTimeout(total=None, sock_connect=5),
+                ) as resp:
+                    if resp.status == 200:
+                        return
+
+                    logger.warning(
+                        f"coordinator refused IDENTIFY for shard {shard_id + 1} with {resp.status}"
+                    )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            logger.warning(f"couldn't reach coordinator to IDENTIFY: {err}")
+
+        await asyncio.sleep(5)
+
+
+async def request_reshard() -> bool:
+    """Asks the coordinator to check the recommended shard count and reshard the cluster."""
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                f"{coordinator_url}/reshard", timeout=aiohttp.ClientTimeout(total=30)
+            ) as resp:
+                return resp.status == 202
+    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+        logger.error(f"couldn't reach coordinator to reshard: {err}")
+        return False
+
+
+async def invalidate_command_cache(commands: Optional[Sequence[str]] = None) -> bool:
+    """Asks the coordinator to flush `commands`, or every response if None, from every worker's command cache."""
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                f"{coordinator_url}/invalidate",
+                data=codec.dumps(
+                    {"commands": list(commands) if commands is not None else None}
+                ),
+                headers={"Content-Type": "application/json"},
+                timeout=aiohttp.ClientTimeout(total=30),
+            ) as resp:
+                if resp.status != 200:
+                    logger.error(
+                        f"coordinator couldn't flush every worker's command cache: {resp.status}"
+                    )
+
+                return resp.status == 200
+    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+        logger.error(f"couldn't reach coordinator to flush command caches: {err}")
+        return False
+
+
+async def get_stats() -> Optional[dict]:
+    """Returns the guild, user and channel counts of the whole cluster, or None if incomplete."""
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(
+                f"{coordinator_url}/stats", timeout=aiohttp.ClientTimeout(total=30)
+            ) as resp:
+                if resp.status != 200:
+                    return None
+
+                return codec.loads(await resp.read())
+    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+        logger.error(f"couldn't reach coordinator for stats: {err}")
+        return None
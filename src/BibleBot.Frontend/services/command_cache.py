@@ -0,0 +1,161 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from core import metrics
+from core.models import Response
+
+
+class CommandCache:
+    """
+    A bounded TTL/LRU cache for command responses that rarely change.
+    Parameters:
+    ----------
+    ttls: Dict[str, float]
+        The commands that may be cached, mapped to how long (in seconds) a response stays fresh.
+    maxsize: int
+        The maximum number of responses kept, the least recently used is evicted first.
+    max_cultures: int
+        The maximum number of remembered user/guild cultures.
+
+    Backend command responses are localized, so responses are stored per culture. Which culture
+    a user will get is learned from the responses they've had so far, until we've seen one for a
+    user/guild pair their commands always go to the backend.
+    """
+
+    def __init__(
+        self, ttls: Dict[str, float], maxsize: int = 512, max_cultures: int = 50_000
+    ):
+        self.ttls = ttls
+        self.maxsize = maxsize
+        self.max_cultures = max_cultures
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self._entries: OrderedDict[Tuple[str, Optional[str]], Tuple[float, Any]] = (
+            OrderedDict()
+        )
+        self._cultures: OrderedDict[Tuple[int, int, bool], str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, command: str, culture: Optional[str] = None) -> Optional[Any]:
+        if command not in self.ttls:
+            return None
+
+        key = (command, culture)
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+
+            self._miss(command)
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits[command] += 1
+        metrics.command_cache_requests_total.labels(command, "hit").inc()
+        return entry[1]
+
+    def _miss(self, command: str):
+        self.misses[command] += 1
+        metrics.command_cache_requests_total.labels(command, "miss").inc()
+
+    def put(self, command: str, value: Any, culture: Optional[str] = None):
+        ttl = self.ttls.get(command)
+
+        if ttl is None:
+            return
+
+        key = (command, culture)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get_response(self, req_body: dict) -> Optional[Response]:
+        """Returns a fresh cached backend response for a command request, if there is one."""
+        command = req_body["Body"]
+
+        if command not in self.ttls:
+            return None
+
+        culture = self.culture_for(req_body)
+
+        if culture is None:
+            self._miss(command)
+            return None
+
+        return self.get(command, culture)
+
+    def culture_for(self, req_body: dict) -> Optional[str]:
+        """Returns the culture the user/guild of a request last resolved to, if we've seen one."""
+        return self._cultures.get(_culture_key(req_body))
+
+    def put_response(self, req_body: dict, resp: Response):
+        """Remembers the culture of a backend response and caches it if the command allows it."""
+        culture = resp.culture
+
+        if culture is None:
+            return
+
+        key = _culture_key(req_body)
+        self._cultures[key] = culture
+        self._cultures.move_to_end(key)
+
+        while len(self._cultures) > self.max_cultures:
+            self._cultures.popitem(last=False)
+
+        if resp.ok:
+            self.put(req_body["Body"], resp, culture)
+
+    def forget_cultures(
+        self, user_id: Optional[int] = None, guild_id: Optional[int] = None
+    ):
+        """Forgets the remembered cultures of a user or guild, after their language preference changes."""
+        for key in [
+            key
+            for key in self._cultures
+            if (user_id is not None and key[0] == user_id)
+            or (guild_id is not None and key[1] == guild_id)
+        ]:
+            del self._cultures[key]
+
+    def invalidate(self, *commands: str):
+        for key in [key for key in self._entries if key[0] in commands]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+def _culture_key(req_body: dict) -> Tuple[int, int, bool]:
+    return (req_body["UserId"], req_body["GuildId"], req_body["IsBot"])
+
+
+# Version and language lists change when staff reload them, so those are flushed by the staff cog.
+VERSION_COMMANDS = ("+version list", "+version list language")
+
+cache = CommandCache(
+    {
+        "+version list": 3600.0,
+        "+version list language": 3600.0,
+        "+resource": 3600.0,
+        "+language list": 3600.0,
+        "+biblebot": 3600.0,
+        "+invite": 3600.0,
+        "+stats": 60.0,
+        # Fetched from Patreon in the frontend, not the backend.
+        "supporters": 900.0,
+    }
+)
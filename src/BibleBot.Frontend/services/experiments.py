@@ -6,74 +6,103 @@ License, v. 2.0. If a copy of the MPL was not distributed with this file,
 You can obtain one at https://mozilla.org/MPL/2.0/.
 """
 
-import os
-
-import aiohttp
+from core import codec
 from logger import VyLogger
+from services.backend_client import BackendUnavailableError, client
 
 logger = VyLogger("default")
 
-endpoint = os.environ.get("ENDPOINT", "")
-aiohttp_headers = {"Authorization": os.environ.get("ENDPOINT_TOKEN", "")}
+# Experiments are never worth holding up a response for, so every lookup here
+# degrades to "no experiments" when the backend is slow or unavailable.
+
+
+def _decode_active_experiments(
+    status: int, body: bytes, subject: str
+) -> dict[str, str]:
+    if status != 200:
+        logger.error(f"couldn't get active experiments for {subject}: status {status}")
+        return {}
+
+    try:
+        return codec.loads(body)
+    except codec.JSONDecodeError:
+        logger.error(f"couldn't parse active experiments for {subject}")
+        return {}
 
 
 async def get_active_experiments_for_user(user_id: int) -> dict[str, str]:
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            f"{endpoint}/experiments/active_user",
-            headers=aiohttp_headers,
+    try:
+        status, body = await client.get_with_retries(
+            "/experiments/active_user",
             params={"user_id": user_id, "frontend": True},
-        ) as response:
-            return await response.json()
+        )
+    except BackendUnavailableError as err:
+        logger.error(f"couldn't get active experiments for user: {err}")
+        return {}
+
+    return _decode_active_experiments(status, body, "user")
 
 
 async def get_user_frontend_experiments(user_id: int):
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            f"{endpoint}/experiments/active_user",
-            headers=aiohttp_headers,
+    try:
+        status, body = await client.get_with_retries(
+            "/experiments/active_user",
             params={"user_id": user_id, "frontend": True},
-        ) as resp:
-            if resp.status != 200:
-                logger.error("couldn't get user frontend experiments")
-                return None
-            else:
-                return await resp.json()
+        )
+    except BackendUnavailableError as err:
+        logger.error(f"couldn't get user frontend experiments: {err}")
+        return None
+
+    if status != 200:
+        logger.error("couldn't get user frontend experiments")
+        return None
+    else:
+        return codec.loads(body)
 
 
 async def get_active_experiments_for_guild(guild_id: int) -> dict[str, str]:
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            f"{endpoint}/experiments/active_guild",
-            headers=aiohttp_headers,
+    try:
+        status, body = await client.get_with_retries(
+            "/experiments/active_guild",
             params={"guild_id": guild_id, "frontend": True},
-        ) as response:
-            return await response.json()
+        )
+    except BackendUnavailableError as err:
+        logger.error(f"couldn't get active experiments for guild: {err}")
+        return {}
+
+    return _decode_active_experiments(status, body, "guild")
 
 
 async def experiment_helped(experiment_name: str, user_id: int):
-    async with aiohttp.ClientSession() as session:
-        await session.post(
-            f"{endpoint}/experiments/helped",
-            headers=aiohttp_headers,
+    try:
+        async with client.post(
+            "/experiments/helped",
             params={"experiment_name": experiment_name, "user_id": user_id},
-        )
+        ):
+            pass
+    except BackendUnavailableError as err:
+        logger.error(f"couldn't submit experiment feedback: {err}")
 
 
 async def experiment_did_not_help(experiment_name: str, user_id: int):
-    async with aiohttp.ClientSession() as session:
-        await session.post(
-            f"{endpoint}/experiments/did_not_help",
-            headers=aiohttp_headers,
+    try:
+        async with client.post(
+            "/experiments/did_not_help",
             params={"experiment_name": experiment_name, "user_id": user_id},
-        )
+        ):
+            pass
+    except BackendUnavailableError as err:
+        logger.error(f"couldn't submit experiment feedback: {err}")
 
 
 async def feedback_exists(experiment_name: str, user_id: int):
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            f"{endpoint}/experiments/feedback_exists",
-            headers=aiohttp_headers,
+    try:
+        _, body = await client.get_with_retries(
+            "/experiments/feedback_exists",
             params={"experiment_name": experiment_name, "user_id": user_id},
-        ) as response:
-            return await response.text() == "true"
+        )
+    except BackendUnavailableError as err:
+        logger.error(f"couldn't check for experiment feedback: {err}")
+        return False
+
+    return body == b"true"
@@ -0,0 +1,146 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from core import metrics
+from logger import VyLogger
+
+logger = VyLogger("default")
+
+Callback = Callable[[], Awaitable[None]]
+
+
+class ExpiryScheduler:
+    """
+    Expires interactive components (paginators, prompts) from one timer, however many are live.
+    Parameters:
+    ----------
+    resolution: float
+        Deadlines are rounded up to a multiple of this many seconds, so entries that expire
+        close together are expired in one batch.
+
+    Entries are kept in a heap ordered by deadline, and a single timer is armed for the
+    earliest. Rescheduling or cancelling an entry leaves its old heap item behind, which is
+    skipped when it comes up; the heap is compacted when those outnumber the live entries.
+    """
+
+    def __init__(self, resolution: float = 1.0):
+        self.resolution = resolution
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._entries: Dict[Hashable, Tuple[float, int, Callback]] = {}
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_at = math.inf
+        # The loop only keeps weak references to tasks.
+        self._batches: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def heap_size(self) -> int:
+        """Live entries plus the stale heap items left by rescheduling and cancelling."""
+        return len(self._heap)
+
+    def schedule(self, key: Hashable, delay: float, callback: Callback):
+        """Runs `callback` in `delay` seconds, replacing whatever was scheduled for `key`."""
+        deadline = time.monotonic() + delay
+        sequence = next(self._sequence)
+
+        self._entries[key] = (deadline, sequence, callback)
+        heapq.heappush(self._heap, (deadline, sequence, key))
+
+        self._compact_if_stale()
+        self._arm()
+
+    def cancel(self, key: Hashable):
+        if self._entries.pop(key, None) is not None:
+            self._compact_if_stale()
+
+    def _compact_if_stale(self):
+        # Every heap item is either a live entry or stale, left by a reschedule or cancel.
+        stale = len(self._heap) - len(self._entries)
+
+        if stale > max(len(self._entries), 64):
+            self._compact()
+
+    def _compact(self):
+        self._heap = [
+            (deadline, sequence, key)
+            for key, (deadline, sequence, _) in self._entries.items()
+        ]
+        heapq.heapify(self._heap)
+
+    def _arm(self):
+        if not self._heap:
+            return
+
+        fire_at = math.ceil(self._heap[0][0] / self.resolution) * self.resolution
+
+        if fire_at >= self._timer_at:
+            return
+
+        if self._timer is not None:
+            self._timer.cancel()
+
+        loop = asyncio.get_running_loop()
+        # The loop's clock is time.monotonic() too.
+        self._timer = loop.call_at(fire_at, self._fire)
+        self._timer_at = fire_at
+
+    def _fire(self):
+        self._timer = None
+        self._timer_at = math.inf
+
+        now = time.monotonic()
+        due: List[Callback] = []
+
+        while self._heap and self._heap[0][0] <= now:
+            deadline, sequence, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+
+            # Rescheduled or cancelled since this was pushed.
+            if entry is None or entry[1] != sequence:
+                continue
+
+            del self._entries[key]
+            metrics.expiry_lag_seconds.observe(now - deadline)
+            due.append(entry[2])
+
+        if due:
+            metrics.expiry_batch_size.observe(len(due))
+            batch = asyncio.create_task(self._run(due))
+            self._batches.add(batch)
+            batch.add_done_callback(self._batches.discard)
+
+        self._arm()
+
+    @staticmethod
+    async def _run(due: List[Callback]):
+        results = await asyncio.gather(
+            *(callback() for callback in due), return_exceptions=True
+        )
+
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"couldn't expire interactive component: {result}")
+
+
+scheduler = ExpiryScheduler(
+    resolution=float(os.environ.get("EXPIRY_RESOLUTION_MS", "1000")) / 1000
+)
+
+metrics.expiry_entries.set_function(lambda: len(scheduler))
+metrics.expiry_heap_size.set_function(lambda: scheduler.heap_size)
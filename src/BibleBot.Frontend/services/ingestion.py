@@ -0,0 +1,181 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Deque, Optional
+
+from core import metrics
+
+
+class IngestionQueue:
+    """
+    Limits how much passive detection work (verses and resources found in messages) runs at once.
+    Parameters:
+    ----------
+    concurrency: int
+        How many passive detections and application commands may be handled at the same time.
+    reserved: int
+        How many of those slots passive detections may never take, so interactions always find one.
+    max_queued: int
+        How many passive detections may wait for a slot, any more are dropped.
+    max_queued_per_guild: int
+        How many of the waiting detections may come from one guild, so a raid or a very
+        busy server can't take the whole queue.
+
+    Waiting detections are let through round-robin between guilds, and between channels
+    within a guild, in the order they came in within a channel.
+    Interactions never wait here, they have hard response deadlines. They're counted while
+    they run and passive detections only get what they leave over.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 64,
+        reserved: int = 16,
+        max_queued: int = 1000,
+        max_queued_per_guild: int = 50,
+    ):
+        self.concurrency = concurrency
+        self.reserved = reserved
+        self.max_queued = max_queued
+        self.max_queued_per_guild = max_queued_per_guild
+        self.running = 0
+        self.interactions = 0
+        self.queued = 0
+        self.shed = 0
+        # guild ID -> channel ID -> waiting detections
+        self._waiting: OrderedDict[int, OrderedDict[int, Deque[asyncio.Future]]] = (
+            OrderedDict()
+        )
+        self._queued_per_guild: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return self.queued
+
+    def _has_slot(self) -> bool:
+        return (
+            self.running < self.concurrency - self.reserved
+            and self.running + self.interactions < self.concurrency
+        )
+
+    async def run_passive(
+        self,
+        guild_id: Optional[int],
+        channel_id: int,
+        job: Callable[[], Awaitable[None]],
+    ) -> bool:
+        """Runs `job` once it gets a slot, returns False if it was dropped instead."""
+        guild_id = guild_id or 0
+
+        if self.queued == 0 and self._has_slot():
+            self.running += 1
+            metrics.ingestion_wait_seconds.observe(0)
+        else:
+            if self.queued >= self.max_queued:
+                metrics.ingestion_shed_total.labels("queue_full").inc()
+                self.shed += 1
+                return False
+
+            if self._queued_per_guild.get(guild_id, 0) >= self.max_queued_per_guild:
+                metrics.ingestion_shed_total.labels("guild_queue_full").inc()
+                self.shed += 1
+                return False
+
+            await self._wait(guild_id, channel_id)
+
+        try:
+            await job()
+        finally:
+            self.running -= 1
+            self._dispatch()
+
+        return True
+
+    async def _wait(self, guild_id: int, channel_id: int):
+        future = asyncio.get_running_loop().create_future()
+        channels = self._waiting.setdefault(guild_id, OrderedDict())
+        channels.setdefault(channel_id, deque()).append(future)
+        self.queued += 1
+        self._queued_per_guild[guild_id] = self._queued_per_guild.get(guild_id, 0) + 1
+        start = time.monotonic()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                # We were given a slot and cancelled before we could use it, pass it on.
+                self.running -= 1
+                self._dispatch()
+            else:
+                self._dequeued(guild_id)
+
+            raise
+
+        metrics.ingestion_wait_seconds.observe(time.monotonic() - start)
+
+    def _dequeued(self, guild_id: int):
+        self.queued -= 1
+        self._queued_per_guild[guild_id] -= 1
+
+        if self._queued_per_guild[guild_id] == 0:
+            del self._queued_per_guild[guild_id]
+
+    def _next(self) -> Optional[asyncio.Future]:
+        while self._waiting:
+            guild_id, channels = next(iter(self._waiting.items()))
+            channel_id, waiting = next(iter(channels.items()))
+            future = waiting.popleft()
+
+            if waiting:
+                channels.move_to_end(channel_id)
+            else:
+                del channels[channel_id]
+
+            if channels:
+                self._waiting.move_to_end(guild_id)
+            else:
+                del self._waiting[guild_id]
+
+            # Cancelled waiters have already taken themselves out of the counts.
+            if not future.cancelled():
+                self._dequeued(guild_id)
+                return future
+
+        return None
+
+    def _dispatch(self):
+        # Slots are taken on behalf of the waiters being woken, before they get to run.
+        while self._has_slot():
+            future = self._next()
+
+            if future is None:
+                break
+
+            self.running += 1
+            future.set_result(None)
+
+    def interaction_started(self):
+        self.interactions += 1
+
+    def interaction_finished(self):
+        self.interactions = max(self.interactions - 1, 0)
+        self._dispatch()
+
+
+queue = IngestionQueue(
+    concurrency=int(os.environ.get("INGESTION_CONCURRENCY", "64")),
+    reserved=int(os.environ.get("INGESTION_RESERVED", "16")),
+    max_queued=int(os.environ.get("INGESTION_QUEUE_SIZE", "1000")),
+    max_queued_per_guild=int(os.environ.get("INGESTION_GUILD_QUEUE_SIZE", "50")),
+)
+
+metrics.ingestion_running.set_function(lambda: queue.running)
+metrics.ingestion_queued.set_function(lambda: queue.queued)
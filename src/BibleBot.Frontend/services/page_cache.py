@@ -0,0 +1,56 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+
+from core import metrics
+from disnake.ui import Container
+
+
+class PageCache:
+    """
+    A bounded LRU cache of the pages shown by recently used paginators.
+    Parameters:
+    ----------
+    maxsize: int
+        The maximum number of paginators whose pages are kept, the least recently used are
+        evicted first.
+
+    Paginators don't hold their pages, a click finds them here by the owner and key in the
+    button's custom_id, or fetches them again from the backend. However many paginators have
+    been sent, only this many page lists are in memory.
+    """
+
+    def __init__(self, maxsize: int = 2048):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Tuple[int, str], Sequence[Container]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, owner_id: int, key: str) -> Optional[Sequence[Container]]:
+        pages = self._entries.get((owner_id, key))
+
+        if pages is not None:
+            self._entries.move_to_end((owner_id, key))
+
+        return pages
+
+    def put(self, owner_id: int, key: str, pages: Sequence[Container]):
+        self._entries[(owner_id, key)] = pages
+        self._entries.move_to_end((owner_id, key))
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+cache = PageCache(maxsize=int(os.environ.get("PAGE_CACHE_SIZE", "2048")))
+
+metrics.page_cache_entries.set_function(lambda: len(cache))
@@ -0,0 +1,104 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+import hashlib
+import os
+import sys
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from core import metrics
+
+# What a cached container costs besides its text, measured with tracemalloc on verse
+# containers: the Container, its children and their attributes, and the cache's entry.
+_ENTRY_OVERHEAD = 640
+
+_hits = metrics.render_cache_requests_total.labels("hit")
+_misses = metrics.render_cache_requests_total.labels("miss")
+
+
+def key(*parts: Optional[str]) -> bytes:
+    """Hashes everything a render depends on into a compact key."""
+    joined = "\x1f".join(part or "" for part in parts)
+    return hashlib.blake2b(joined.encode(), digest_size=16).digest()
+
+
+def text_size(*texts: str) -> int:
+    """Estimates the memory a render with these texts takes, for RenderCache.put."""
+    return _ENTRY_OVERHEAD + sum(sys.getsizeof(text) for text in texts)
+
+
+class RenderCache:
+    """
+    A byte-capped LRU cache of rendered components, keyed on a hash of what they were rendered from.
+    Parameters:
+    ----------
+    max_bytes: int
+        Roughly how much memory the cached renders may take, the least recently used are
+        evicted first. 0 disables the cache.
+
+    The same daily verse or popular passage is rendered thousands of times an hour in the
+    same version and culture, so a hit is a dictionary lookup instead of a rebuild. Cached
+    renders are shared, whoever gets one must not change it.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, Tuple[Any, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, cache_key: bytes) -> Optional[Any]:
+        entry = self._entries.get(cache_key)
+
+        if entry is None:
+            self.misses += 1
+            _misses.inc()
+            return None
+
+        self._entries.move_to_end(cache_key)
+        self.hits += 1
+        _hits.inc()
+        return entry[0]
+
+    def put(self, cache_key: bytes, value: Any, size: int):
+        if size > self.max_bytes:
+            return
+
+        previous = self._entries.pop(cache_key, None)
+        if previous is not None:
+            self.bytes -= previous[1]
+
+        self._entries[cache_key] = (value, size)
+        self.bytes += size
+
+        while self.bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            metrics.render_cache_evictions_total.inc()
+
+    def hit_ratio(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+
+cache = RenderCache(
+    max_bytes=int(os.environ.get("RENDER_CACHE_MB", "16")) * 1024 * 1024
+)
+
+metrics.render_cache_bytes.set_function(lambda: cache.bytes)
+metrics.render_cache_entries.set_function(lambda: len(cache))
+metrics.render_cache_hit_ratio.set_function(cache.hit_ratio)
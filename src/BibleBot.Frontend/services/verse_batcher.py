@@ -0,0 +1,142 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+import asyncio
+import os
+from typing import List, Optional, Set, Tuple
+
+from core import codec, metrics
+from logger import VyLogger
+from services.backend_client import (
+    BackendClient,
+    BackendUnavailableError,
+    client,
+    deadline,
+)
+
+logger = VyLogger("default")
+
+
+class VerseBatcher:
+    """
+    Collects passive verse detections for a short window and sends them to the backend as one request.
+    Parameters:
+    ----------
+    backend: BackendClient
+        The client used to reach the backend.
+    max_batch: int
+        How many requests are collected before a batch is sent right away.
+    max_delay: float
+        How long, in seconds, the first request of a batch waits for company.
+    path: str
+        The batch endpoint. It takes a JSON array of verse requests and answers with
+        a JSON array of verse responses in the same order.
+
+    Callers get their own response back, batches are answered in the order they were collected,
+    so detections from the same channel are answered in the order they came in.
+    """
+
+    def __init__(
+        self,
+        backend: BackendClient,
+        max_batch: int = 16,
+        max_delay: float = 0.01,
+        path: str = "/verses/batch",
+    ):
+        self.backend = backend
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.path = path
+        self.batches = 0
+        self.batched = 0
+        self._pending: List[Tuple[dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks, and callers wait on these to answer them.
+        self._sends: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def submit(self, req_body: dict) -> dict:
+        """Queues a verse request for the next batch and returns its response."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((req_body, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_delay, self._flush
+            )
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+
+        if batch:
+            send = asyncio.ensure_future(self._send(batch))
+            self._sends.add(send)
+            send.add_done_callback(self._sends.discard)
+
+    async def _send(self, batch: List[Tuple[dict, asyncio.Future]]):
+        # A batch answers many messages, it shouldn't inherit the deadline of whichever filled it.
+        deadline.set(None)
+        self.batches += 1
+        self.batched += len(batch)
+
+        try:
+            async with self.backend.post(
+                self.path, json=[req_body for req_body, _ in batch]
+            ) as resp:
+                raw = await resp.read()
+
+                if resp.status != 200:
+                    raise BackendUnavailableError(
+                        f"POST {self.path} returned {resp.status}"
+                    )
+
+            try:
+                results = codec.loads(raw)
+            except codec.JSONDecodeError:
+                metrics.backend_decode_failures_total.labels(self.path).inc()
+                raise
+
+            if len(results) != len(batch):
+                raise BackendUnavailableError(
+                    f"POST {self.path} answered {len(results)} of {len(batch)} requests"
+                )
+        except Exception as err:
+            # Every caller is waiting on this batch, so nothing may escape without answering them.
+            logger.error(f"couldn't process verse batch: {err}")
+
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(BackendUnavailableError(str(err)))
+
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+# Off by default, the backend has to serve the batch endpoint first.
+batcher: Optional[VerseBatcher] = (
+    VerseBatcher(
+        client,
+        max_batch=int(os.environ.get("VERSE_BATCH_SIZE", "16")),
+        max_delay=float(os.environ.get("VERSE_BATCH_DELAY_MS", "10")) / 1000,
+    )
+    if os.environ.get("VERSE_BATCHING", "").lower() in ("1", "true")
+    else None
+)
@@ -0,0 +1,150 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Deque, List, Optional
+
+import sentry_sdk
+
+from core import metrics
+from logger import VyLogger
+
+logger = VyLogger("default")
+
+_frontend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LoopWatchdog:
+    """
+    Measures how late the event loop runs callbacks, and captures what it was doing when it stalls.
+    Parameters:
+    ----------
+    interval: float
+        How often, in seconds, the loop's lag is sampled.
+    threshold: float
+        How long, in seconds, a single callback may hold the loop before its stack is captured.
+    window: int
+        How many of the latest samples the lag percentiles are taken from.
+
+    Lag is sampled by a task on the loop. Stalls are caught by a thread, since nothing on the
+    loop can run while it's blocked: when the sampler hasn't run for `threshold`, the thread
+    takes the loop thread's stack, logs it and reports it to Sentry, once per stall.
+    """
+
+    def __init__(
+        self, interval: float = 0.1, threshold: float = 0.5, window: int = 600
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.stalls = 0
+        self._last_tick = 0.0
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        if self._task is not None:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def percentile(self, fraction: float) -> float:
+        if not self.samples:
+            return 0.0
+
+        ordered = sorted(self.samples)
+        return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+    async def _sample(self):
+        while True:
+            start = time.monotonic()
+            self._last_tick = start
+            await asyncio.sleep(self.interval)
+
+            lag = max(time.monotonic() - start - self.interval, 0.0)
+            self.samples.append(lag)
+            metrics.event_loop_lag_seconds.observe(lag)
+
+    def _watch(self):
+        reported_tick = None
+
+        while not self._stopped.wait(self.threshold / 2):
+            tick = self._last_tick
+            stalled_for = time.monotonic() - tick - self.interval
+
+            if stalled_for < self.threshold or tick == reported_tick:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+
+            if frame is not None:
+                reported_tick = tick
+                self._report(stalled_for, traceback.extract_stack(frame))
+
+    def _report(self, stalled_for: float, stack: List[traceback.FrameSummary]):
+        self.stalls += 1
+        metrics.event_loop_stalls_total.inc()
+
+        # Stalls are grouped by the innermost line of our own code, which is usually
+        # the one to blame even when the time is spent in a library it called.
+        ours = [
+            frame
+            for frame in stack
+            if frame.filename.startswith(_frontend_dir)
+            and "site-packages" not in frame.filename
+        ]
+        offender = (ours or stack)[-1]
+        location = (
+            f"{os.path.relpath(offender.filename, _frontend_dir)}:{offender.lineno}"
+        )
+        formatted = "".join(traceback.format_list(stack))
+
+        logger.warning(
+            f"event loop blocked for {stalled_for * 1000:.0f}ms in {offender.name} ({location})\n{formatted}"
+        )
+
+        with sentry_sdk.new_scope() as scope:
+            scope.fingerprint = ["event-loop-stall", location]
+            scope.set_extra("stalled_ms", round(stalled_for * 1000))
+            scope.set_extra("stack", formatted)
+            sentry_sdk.capture_message(
+                f"event loop blocked in {offender.name} ({location})", level="warning"
+            )
+
+
+watchdog = LoopWatchdog(
+    interval=float(os.environ.get("LOOP_WATCHDOG_INTERVAL_MS", "100")) / 1000,
+    threshold=float(os.environ.get("LOOP_WATCHDOG_THRESHOLD_MS", "500")) / 1000,
+)
+
+for _quantile in (0.5, 0.95, 0.99, 1.0):
+    metrics.event_loop_lag_recent_seconds.labels(str(_quantile)).set_function(
+        lambda fraction=_quantile: watchdog.percentile(fraction)
+    )
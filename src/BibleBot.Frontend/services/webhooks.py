@@ -6,12 +6,117 @@ License, v. 2.0. If a copy of the MPL was not distributed with this file,
 You can obtain one at https://mozilla.org/MPL/2.0/.
 """
 
+import os
+from collections import OrderedDict
+from typing import Optional, Set, Tuple
+
+import disnake
 from disnake import Guild, Thread
 from disnake.abc import User
 from disnake.channel import StageChannel, TextChannel, VoiceChannel
 from helpers.channels import ChannelContext
 
 
+class OwnedWebhookCache:
+    """
+    A bounded LRU cache of the webhooks the bot owns in each channel.
+    Parameters:
+    ----------
+    maxsize: int
+        The maximum number of channels remembered, the least recently used is evicted first.
+
+    A webhook ID never changes owner, so an ID known to be ours stays ours. Knowing that a
+    channel has no other webhooks of ours is only true until its webhooks change, so that part
+    of an entry is dropped when the gateway tells us they did.
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # channel ID -> (whether the IDs are all of our webhooks there, our webhook IDs)
+        self._channels: OrderedDict[int, Tuple[bool, Set[int]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def lookup(self, channel_id: int, webhook_id: int) -> Optional[bool]:
+        """Returns whether the webhook is ours, or None if we don't know."""
+        entry = self._channels.get(channel_id)
+
+        if entry is not None:
+            complete, webhook_ids = entry
+
+            if webhook_id in webhook_ids or complete:
+                self._channels.move_to_end(channel_id)
+                self.hits += 1
+                return webhook_id in webhook_ids
+
+        self.misses += 1
+        return None
+
+    def set(self, channel_id: int, webhook_ids: Set[int]):
+        """Stores every webhook of ours in a channel, as fetched from Discord."""
+        self._store(channel_id, (True, webhook_ids))
+
+    def add(self, channel_id: int, webhook_id: int):
+        complete, webhook_ids = self._channels.get(channel_id, (False, set()))
+        self._store(channel_id, (complete, webhook_ids | {webhook_id}))
+
+    def discard(self, channel_id: int, webhook_id: int):
+        entry = self._channels.get(channel_id)
+
+        if entry is not None:
+            self._channels[channel_id] = (entry[0], entry[1] - {webhook_id})
+
+    def invalidate(self, channel_id: int):
+        """Forgets that a channel had no other webhooks of ours, keeping the ones we know of."""
+        entry = self._channels.get(channel_id)
+
+        if entry is not None:
+            self._channels[channel_id] = (False, entry[1])
+
+    def _store(self, channel_id: int, entry: Tuple[bool, Set[int]]):
+        self._channels[channel_id] = entry
+        self._channels.move_to_end(channel_id)
+
+        while len(self._channels) > self.maxsize:
+            self._channels.popitem(last=False)
+
+
+owned_webhooks = OwnedWebhookCache(
+    maxsize=int(os.environ.get("WEBHOOK_CACHE_SIZE", "10000"))
+)
+
+
+async def is_own_webhook(
+    channel: disnake.abc.GuildChannel, webhook_id: int, bot_user_id: int
+) -> bool:
+    """Returns whether a message from `webhook_id` in `channel` came from one of our webhooks."""
+    is_own = owned_webhooks.lookup(channel.id, webhook_id)
+
+    if is_own is not None:
+        return is_own
+
+    try:
+        webhooks = await channel.webhooks()
+    except (
+        AttributeError,
+        disnake.errors.Forbidden,
+        disnake.errors.DiscordServerError,
+    ):
+        return False
+
+    webhook_ids = {
+        webhook.id
+        for webhook in webhooks
+        if webhook.user is not None and webhook.user.id == bot_user_id
+    }
+    owned_webhooks.set(channel.id, webhook_ids)
+
+    return webhook_id in webhook_ids
+
+
 async def remove_webhooks(user: User, guild: Guild):
     webhooks = await guild.webhooks()
 
@@ -21,6 +126,7 @@ async def remove_webhooks(user: User, guild: Guild):
                 await webhook.delete(
                     reason=f"User ID {user.id} performed a command that removes BibleBot-related webhooks."
                 )
+                owned_webhooks.discard(webhook.channel_id, webhook.id)
 
 
 async def create_webhook(ctx: ChannelContext):
@@ -43,4 +149,7 @@ async def create_webhook(ctx: ChannelContext):
             )
             webhook_service_body = f"{webhook.id}/{webhook.token}"
 
+    if webhook is not None:
+        owned_webhooks.add(webhook.channel_id, webhook.id)
+
     return webhook_service_body
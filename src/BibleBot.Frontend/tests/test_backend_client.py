@@ -0,0 +1,112 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+import asyncio
+import time
+
+import pytest
+from services.backend_client import (
+    BackendClient,
+    BackendUnavailableError,
+    CircuitBreaker,
+    deadline,
+)
+
+
+class _Request:
+    def __init__(self, enter):
+        self.enter = enter
+
+    async def __aenter__(self):
+        return await self.enter()
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Session:
+    closed = False
+
+    def __init__(self, enter):
+        self.enter = enter
+
+    def request(self, *args, **kwargs):
+        return _Request(self.enter)
+
+
+def _half_open_client(enter) -> BackendClient:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    breaker.opened_at -= breaker.reset_timeout
+
+    backend = BackendClient("http://backend", "token", breaker=breaker)
+    backend._session = _Session(enter)
+    return backend
+
+
+@pytest.mark.asyncio
+async def test_probe_released_after_deadline_timeout():
+    async def enter():
+        raise asyncio.TimeoutError()
+
+    backend = _half_open_client(enter)
+    token = deadline.set(time.monotonic() + 1)
+
+    try:
+        with pytest.raises(BackendUnavailableError):
+            async with backend.get("/verses/process"):
+                pass
+    finally:
+        deadline.reset(token)
+
+    assert backend.breaker.state == "half_open"
+    assert backend.breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_probe_released_after_cancellation():
+    started = asyncio.Event()
+
+    async def enter():
+        started.set()
+        await asyncio.Event().wait()
+
+    backend = _half_open_client(enter)
+
+    async def probe():
+        async with backend.get("/verses/process"):
+            pass
+
+    task = asyncio.create_task(probe())
+    await started.wait()
+    assert not backend.breaker.allow()
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert backend.breaker.state == "half_open"
+    assert backend.breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_body_failure_not_counted_as_backend_failure():
+    class Response:
+        status = 200
+
+    async def enter():
+        return Response()
+
+    backend = _half_open_client(enter)
+
+    with pytest.raises(BackendUnavailableError, match="reading the response"):
+        async with backend.get("/verses/process"):
+            raise asyncio.TimeoutError()
+
+    assert backend.breaker.state == "closed"
+    assert backend.breaker.failures == 0
@@ -0,0 +1,33 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+from prometheus_client import REGISTRY
+from services.command_cache import CommandCache
+
+
+def _requests(command: str, result: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "biblebot_frontend_command_cache_requests_total",
+        {"command": command, "result": result},
+    )
+    return value or 0.0
+
+
+def test_hits_and_misses_are_exported_per_command():
+    cache = CommandCache({"+version list": 60.0})
+    hits, misses = _requests("+version list", "hit"), _requests("+version list", "miss")
+
+    assert cache.get("+version list", "en-US") is None
+    cache.put("+version list", "versions", "en-US")
+    assert cache.get("+version list", "en-US") == "versions"
+
+    assert _requests("+version list", "hit") == hits + 1
+    assert _requests("+version list", "miss") == misses + 1
+    # Commands that aren't cached don't get a label.
+    assert cache.get("+search love") is None
+    assert _requests("+search love", "miss") == 0.0
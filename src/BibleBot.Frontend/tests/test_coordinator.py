@@ -0,0 +1,70 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+from core import codec
+from coordinator import Coordinator, Worker
+
+
+async def _worker_server(received: list, status: int = 204) -> web.AppRunner:
+    async def invalidate(request: web.Request) -> web.Response:
+        received.append(codec.loads(await request.read()))
+        return web.Response(status=status)
+
+    app = web.Application()
+    app.router.add_post("/invalidate", invalidate)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner
+
+
+def _running_worker(cluster_id: int, runner: web.AppRunner) -> Worker:
+    port = runner.addresses[0][1]
+    worker = Worker(cluster_id, [cluster_id], port)
+    worker.process = SimpleNamespace(returncode=None, pid=cluster_id)
+    return worker
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_every_worker():
+    received = [[], []]
+    runners = [await _worker_server(worker) for worker in received]
+    coordinator = Coordinator("token", workers=2)
+    coordinator.workers = [
+        _running_worker(index, runner) for index, runner in enumerate(runners)
+    ]
+
+    try:
+        body = codec.dumps({"commands": ["+version list"]})
+        assert await coordinator.invalidate(body)
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+    assert received == [[{"commands": ["+version list"]}]] * 2
+
+
+@pytest.mark.asyncio
+async def test_invalidation_fails_if_a_worker_does_not_apply_it():
+    received = []
+    healthy = await _worker_server(received)
+    failing = await _worker_server([], status=500)
+    coordinator = Coordinator("token", workers=2)
+    coordinator.workers = [_running_worker(0, healthy), _running_worker(1, failing)]
+
+    try:
+        assert not await coordinator.invalidate(codec.dumps({"commands": None}))
+    finally:
+        await healthy.cleanup()
+        await failing.cleanup()
+
+    assert received == [{"commands": None}]
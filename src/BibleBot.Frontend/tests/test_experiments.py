@@ -0,0 +1,29 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+import pytest
+from services import experiments
+
+
+@pytest.mark.parametrize(
+    "status, body, expected",
+    [
+        (200, b'{"search": "b"}', {"search": "b"}),
+        (503, b"<html>Service Unavailable</html>", {}),
+        (200, b"<html>not json</html>", {}),
+    ],
+)
+@pytest.mark.asyncio
+async def test_active_experiments_degrade_to_none(monkeypatch, status, body, expected):
+    async def get_with_retries(path, **kwargs):
+        return status, body
+
+    monkeypatch.setattr(experiments.client, "get_with_retries", get_with_retries)
+
+    assert await experiments.get_active_experiments_for_user(1) == expected
+    assert await experiments.get_active_experiments_for_guild(1) == expected
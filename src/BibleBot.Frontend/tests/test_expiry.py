@@ -0,0 +1,61 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+import asyncio
+
+import pytest
+from services.expiry import ExpiryScheduler
+
+
+async def _noop():
+    pass
+
+
+@pytest.mark.asyncio
+async def test_rescheduling_keeps_the_heap_bounded():
+    scheduler = ExpiryScheduler()
+
+    for click in range(10_000):
+        scheduler.schedule(click % 10, 60, _noop)
+
+    assert len(scheduler) == 10
+    assert scheduler.heap_size <= 2 * 64 + 10
+
+
+@pytest.mark.asyncio
+async def test_cancelling_keeps_the_heap_bounded():
+    scheduler = ExpiryScheduler()
+
+    for key in range(10_000):
+        scheduler.schedule(key, 60, _noop)
+
+    # Answered prompts, with nothing scheduled after them.
+    for key in range(10_000):
+        scheduler.cancel(key)
+
+    assert len(scheduler) == 0
+    assert scheduler.heap_size <= 64 + 1
+
+
+@pytest.mark.asyncio
+async def test_only_the_latest_schedule_of_a_key_runs():
+    scheduler = ExpiryScheduler(resolution=0.01)
+    ran = []
+
+    async def expire(name):
+        ran.append(name)
+
+    scheduler.schedule("paginator", 0.01, lambda: expire("first"))
+    scheduler.schedule("paginator", 0.02, lambda: expire("second"))
+    scheduler.schedule("prompt", 0.01, lambda: expire("prompt"))
+    scheduler.cancel("prompt")
+
+    await asyncio.sleep(0.1)
+
+    assert ran == ["second"]
+    assert len(scheduler) == 0
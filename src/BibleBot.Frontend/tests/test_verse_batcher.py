@@ -0,0 +1,79 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+import asyncio
+import gc
+from contextlib import asynccontextmanager
+
+import pytest
+from core import codec
+from services.backend_client import BackendUnavailableError
+from services.verse_batcher import VerseBatcher
+
+
+class _Response:
+    def __init__(self, status: int, body: bytes):
+        self.status = status
+        self.body = body
+
+    async def read(self) -> bytes:
+        return self.body
+
+
+class _Backend:
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.release = asyncio.Event()
+
+    @asynccontextmanager
+    async def post(self, path: str, json: list):
+        # Holds the batch in flight until the test lets it through.
+        await self.release.wait()
+        yield _Response(self.status, codec.dumps([{"Echo": req} for req in json]))
+
+
+async def _submit_batch(batcher: VerseBatcher, count: int) -> list:
+    callers = [
+        asyncio.ensure_future(batcher.submit({"Body": str(index)}))
+        for index in range(count)
+    ]
+    await asyncio.sleep(0)
+    return callers
+
+
+@pytest.mark.asyncio
+async def test_in_flight_batch_survives_garbage_collection():
+    backend = _Backend()
+    batcher = VerseBatcher(backend, max_batch=4)
+
+    callers = await _submit_batch(batcher, 4)
+    assert len(batcher._sends) == 1
+
+    gc.collect()
+    backend.release.set()
+    results = await asyncio.wait_for(asyncio.gather(*callers), timeout=1)
+
+    assert [result["Echo"]["Body"] for result in results] == ["0", "1", "2", "3"]
+    assert not batcher._sends
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_answers_every_caller():
+    backend = _Backend(status=503)
+    batcher = VerseBatcher(backend, max_batch=4)
+
+    callers = await _submit_batch(batcher, 4)
+
+    gc.collect()
+    backend.release.set()
+    results = await asyncio.wait_for(
+        asyncio.gather(*callers, return_exceptions=True), timeout=1
+    )
+
+    assert all(isinstance(result, BackendUnavailableError) for result in results)
+    assert not batcher._sends
@@ -6,10 +6,8 @@ License, v. 2.0. If a copy of the MPL was not distributed with this file,
 You can obtain one at https://mozilla.org/MPL/2.0/.
 """
 
-import asyncio
 import time
-from dataclasses import dataclass, field
-from typing import Dict, Optional
+from functools import partial
 
 from core import constants
 from core.i18n import bb_i18n
@@ -30,24 +28,34 @@ from disnake import (
 from disnake.interactions import ApplicationCommandInteraction, MessageInteraction
 from disnake.ui import ActionRow, Button, Container
 from disnake.ui._types import MessageComponents
+from helpers import custom_ids
+from helpers.custom_ids import ComponentState
 from services import backend
+from services.expiry import scheduler
 from ui import renderers
 
 i18n = bb_i18n()
 
 
-@dataclass
-class ConfirmationPromptState:
-    author: User | Member
-    message: Message
-    on_confirm_command: str
-    created_at: float = field(default_factory=time.time)
-    task: Optional[asyncio.Task] = field(default=None)
-    localization: Dict[str, str] = field(default_factory=Dict[str, str])
+def _rejection(localization) -> Container:
+    return renderers.create_error_container(
+        localization["CONFIRMATION_REJECTED_TITLE"],
+        localization["CONFIRMATION_REJECTED_DESC"],
+        localization,
+    )
 
 
 class ConfirmationPrompt:
-    _registry: Dict[int, ConfirmationPromptState] = {}
+    """
+    Asks the author to confirm a command before it's submitted.
+    Parameters:
+    ----------
+    on_confirm_command: str
+        The command submitted if the author confirms, it's signed into the buttons' custom_ids.
+    author: User | Member
+        The only user who can answer.
+    """
+
     _timeout = 20.0
 
     def __init__(self, on_confirm_command: str, author: User | Member, localization):
@@ -55,10 +63,7 @@ class ConfirmationPrompt:
         self.on_confirm_command = on_confirm_command
         self.localization = localization
 
-    def _render(self, response=None) -> MessageComponents:
-        if response is not None:
-            return [response]
-
+    def _render(self) -> MessageComponents:
         container = Container()
         container.accent_color = 16776960
 
@@ -86,15 +91,21 @@ class ConfirmationPrompt:
             )
         )
 
+        state = ComponentState(
+            self.author.id,
+            self.on_confirm_command,
+            expires_at=int(time.time() + self._timeout),
+        )
+
         yes_button = Button(
             emoji="✅",
             style=ButtonStyle.green,
-            custom_id="confirmation:yes",
+            custom_id=custom_ids.encode("confirmation:yes", state),
         )
         no_button = Button(
             emoji="✖️",
             style=ButtonStyle.red,
-            custom_id="confirmation:no",
+            custom_id=custom_ids.encode("confirmation:no", state),
         )
 
         row = ActionRow(yes_button, no_button)
@@ -120,85 +131,44 @@ class ConfirmationPrompt:
         else:
             msg = await sendable.send(components=components)
 
-        self._registry[msg.id] = ConfirmationPromptState(
-            author=self.author,
-            on_confirm_command=self.on_confirm_command,
-            message=msg,
-            task=asyncio.create_task(self._auto_disable_runner(msg.id)),
-            localization=self.localization,
+        scheduler.schedule(
+            msg.id, self._timeout, partial(self._expire, msg, self.localization)
         )
 
         return msg
 
     @classmethod
     async def handle_click(cls, inter: MessageInteraction):
-        state = cls._registry.get(inter.message.id)
+        state = custom_ids.decode(inter.data.custom_id)
         if state is None:
             return
 
-        localization = state.localization
+        localization = i18n.get_i18n_or_default(inter.locale.name)
 
-        if inter.author.id != state.author.id:
+        if inter.author.id != state.owner_id:
             await inter.send(localization["PAGINATOR_FORBIDDEN"], ephemeral=True)
             return
 
-        if state.task and not state.task.done():
-            state.task.cancel()
+        scheduler.cancel(inter.message.id)
 
-        components_to_send = None
-
-        custom_id = inter.data.custom_id
-        if custom_id == "confirmation:yes":
+        name = custom_ids.name_of(inter.data.custom_id)
+        # A prompt that expired while no process was around to reject it is rejected now.
+        if state.expired or name == "confirmation:no":
+            components_to_send = _rejection(localization)
+        elif name == "confirmation:yes":
             components_to_send = await backend.submit_command(
-                inter.channel, state.author, state.on_confirm_command
-            )
-        elif custom_id == "confirmation:no":
-            components_to_send = renderers.create_error_container(
-                localization["CONFIRMATION_REJECTED_TITLE"],
-                localization["CONFIRMATION_REJECTED_DESC"],
-                localization,
+                inter.channel, inter.author, state.key
             )
         else:
             return
 
         await inter.followup.edit_message(
-            inter.message.id,
-            components=cls(
-                state.on_confirm_command, state.author, localization
-            )._render(response=components_to_send),
+            inter.message.id, components=[components_to_send]
         )
 
-    @classmethod
-    async def _auto_disable_runner(cls, message_id: int):
+    @staticmethod
+    async def _expire(message: Message, localization):
         try:
-            state = cls._registry.get(message_id)
-            if not state:
-                return
-
-            while True:
-                now = time.time()
-                remaining = cls._timeout - (now - state.created_at)
-
-                if remaining <= 0:
-                    break
-
-                await asyncio.sleep(min(remaining, 5))
-
-            components_to_send = renderers.create_error_container(
-                state.localization["CONFIRMATION_REJECTED_TITLE"],
-                state.localization["CONFIRMATION_REJECTED_DESC"],
-                state.localization,
-            )
-
-            disabled = cls(
-                state.on_confirm_command, state.author, state.localization
-            )._render(response=components_to_send)
-
-            try:
-                await state.message.edit(components=disabled)
-            except Exception:
-                pass
-
-            cls._registry.pop(message_id, None)
-        except asyncio.CancelledError:
-            return
+            await message.edit(components=[_rejection(localization)])
+        except Exception:
+            pass
@@ -6,10 +6,8 @@ License, v. 2.0. If a copy of the MPL was not distributed with this file,
 You can obtain one at https://mozilla.org/MPL/2.0/.
 """
 
-import asyncio
 import time
-from dataclasses import dataclass, field
-from typing import Dict, Optional
+from functools import partial
 
 from core import constants
 from core.i18n import bb_i18n
@@ -30,26 +28,30 @@ from disnake import (
 from disnake.interactions import ApplicationCommandInteraction, MessageInteraction
 from disnake.ui import ActionRow, Button, Container
 from disnake.ui._types import MessageComponents
+from helpers import custom_ids
+from helpers.custom_ids import ComponentState
 from services import experiments
+from services.expiry import scheduler
 from ui import renderers
 
 i18n = bb_i18n()
 
 
-@dataclass
-class HelpfulnessPromptState:
+class HelpfulnessPrompt:
+    """
+    Asks the author whether an experiment helped them.
+    Parameters:
+    ----------
     author: User | Member
-    message: Message
+        The only user who can answer.
     experiment_name: str
+        The experiment the answer is recorded for, it's signed into the buttons' custom_ids.
     title: str
+        The prompt's title.
     description: str
-    created_at: float = field(default_factory=time.time)
-    task: Optional[asyncio.Task] = field(default=None)
-    localization: Dict[str, str] = field(default_factory=Dict[str, str])
-
+        The prompt's question.
+    """
 
-class HelpfulnessPrompt:
-    _registry: Dict[int, HelpfulnessPromptState] = {}
     _timeout = 20.0
 
     def __init__(
@@ -66,10 +68,7 @@ class HelpfulnessPrompt:
         self.title = title
         self.description = description
 
-    def _render(self, response=None) -> MessageComponents:
-        if response is not None:
-            return [response]
-
+    def _render(self) -> MessageComponents:
         container = Container()
         container.accent_color = 16776960
 
@@ -86,15 +85,21 @@ class HelpfulnessPrompt:
             )
         )
 
+        state = ComponentState(
+            self.author.id,
+            self.experiment_name,
+            expires_at=int(time.time() + self._timeout),
+        )
+
         yes_button = Button(
             emoji="✅",
             style=ButtonStyle.green,
-            custom_id="helpfulness:yes",
+            custom_id=custom_ids.encode("helpfulness:yes", state),
         )
         no_button = Button(
             emoji="✖️",
             style=ButtonStyle.red,
-            custom_id="helpfulness:no",
+            custom_id=custom_ids.encode("helpfulness:no", state),
         )
 
         row = ActionRow(yes_button, no_button)
@@ -120,32 +125,36 @@ class HelpfulnessPrompt:
         else:
             msg = await sendable.send(components=components)
 
-        self._registry[msg.id] = HelpfulnessPromptState(
-            author=self.author,
-            message=msg,
-            experiment_name=self.experiment_name,
-            title=self.title,
-            description=self.description,
-            task=asyncio.create_task(self._auto_disable_runner(msg.id)),
-            localization=self.localization,
-        )
+        scheduler.schedule(msg.id, self._timeout, partial(self._expire, msg))
 
         return msg
 
     @classmethod
     async def handle_click(cls, inter: MessageInteraction):
-        state = cls._registry.get(inter.message.id)
+        state = custom_ids.decode(inter.data.custom_id)
         if state is None:
             return
 
-        localization = state.localization
+        localization = i18n.get_i18n_or_default(inter.locale.name)
 
-        if inter.author.id != state.author.id:
+        if inter.author.id != state.owner_id:
             await inter.send(localization["PAGINATOR_FORBIDDEN"], ephemeral=True)
             return
 
-        if state.task and not state.task.done():
-            state.task.cancel()
+        scheduler.cancel(inter.message.id)
+
+        # Expired while no process was around to remove it.
+        if state.expired:
+            await cls._expire(inter.message)
+            return
+
+        name = custom_ids.name_of(inter.data.custom_id)
+        if name == "helpfulness:yes":
+            await experiments.experiment_helped(state.key, state.owner_id)
+        elif name == "helpfulness:no":
+            await experiments.experiment_did_not_help(state.key, state.owner_id)
+        else:
+            return
 
         components_to_send = renderers.create_success_container(
             "Thanks!",
@@ -153,48 +162,13 @@ class HelpfulnessPrompt:
             localization,
         )
 
-        custom_id = inter.data.custom_id
-        if custom_id == "helpfulness:yes":
-            await experiments.experiment_helped(state.experiment_name, state.author.id)
-        elif custom_id == "helpfulness:no":
-            await experiments.experiment_did_not_help(
-                state.experiment_name, state.author.id
-            )
-        else:
-            return
-
         await inter.followup.edit_message(
-            inter.message.id,
-            components=cls(
-                state.author,
-                state.experiment_name,
-                state.title,
-                state.description,
-                localization,
-            )._render(response=components_to_send),
+            inter.message.id, components=[components_to_send]
         )
 
-    @classmethod
-    async def _auto_disable_runner(cls, message_id: int):
+    @staticmethod
+    async def _expire(message: Message):
         try:
-            state = cls._registry.get(message_id)
-            if not state:
-                return
-
-            while True:
-                now = time.time()
-                remaining = cls._timeout - (now - state.created_at)
-
-                if remaining <= 0:
-                    break
-
-                await asyncio.sleep(min(remaining, 5))
-
-            try:
-                await state.message.delete()
-            except Exception:
-                pass
-
-            cls._registry.pop(message_id, None)
-        except asyncio.CancelledError:
-            return
+            await message.delete()
+        except Exception:
+            pass
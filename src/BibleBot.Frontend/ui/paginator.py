@@ -6,11 +6,14 @@ License, v. 2.0. If a copy of the MPL was not distributed with this file,
 You can obtain one at https://mozilla.org/MPL/2.0/.
 """
 
-import asyncio
+import base64
+import hashlib
+import secrets
 import time
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from functools import partial
+from typing import Awaitable, Callable, Optional, Sequence
 
+from core import metrics
 from core.i18n import bb_i18n
 from disnake import (
     ButtonStyle,
@@ -21,22 +24,38 @@ from disnake import (
     TextChannel,
     Thread,
     VoiceChannel,
+    abc,
 )
 from disnake.interactions import ApplicationCommandInteraction, MessageInteraction
-from disnake.ui import ActionRow, Button, Container
+from disnake.ui import ActionRow, Button, Container, components_from_message
 from disnake.ui._types import MessageComponents
+from helpers import custom_ids
+from helpers.custom_ids import ComponentState
+from services.expiry import scheduler
+from services.page_cache import cache as page_cache
+from ui.renderers import LazyPages
 
 i18n = bb_i18n()
 
+# Fetches a paginator's pages again from their source, see backend.fetch_pages.
+PageFetcher = Callable[
+    [abc.Messageable, abc.User, str], Awaitable[Optional[Sequence[Container]]]
+]
 
-@dataclass
-class PaginationState:
-    author_id: int
-    message: Message
-    index: int = 0
-    pages: List[Container] = field(default_factory=list)
-    last_interacted: float = field(default_factory=time.time)
-    task: Optional[asyncio.Task] = field(default=None)
+# Keys of pages that can't be fetched again, only found in the page cache.
+_cached_only = "#"
+
+_from_cache = metrics.paginator_page_lookups_total.labels("cache")
+_from_backend = metrics.paginator_page_lookups_total.labels("backend")
+_missing = metrics.paginator_page_lookups_total.labels("missing")
+
+
+def _without_navigation(message: Message) -> MessageComponents:
+    return [
+        component
+        for component in components_from_message(message)
+        if not isinstance(component, ActionRow)
+    ]
 
 
 class ComponentPaginator:
@@ -44,36 +63,58 @@ class ComponentPaginator:
     Paginator for containers.
     Parameters:
     ----------
-    pages: List[Container]
-        List of containers which are in the paginator. Paginator starts from first container.
+    pages: Sequence[Container]
+        The containers which are in the paginator, a list or renderers.LazyPages. Paginator starts from first container.
     author: int
         The ID of the author who can interact with the buttons.
+
+    Nothing about a sent paginator is kept in memory besides its pages in the page cache.
+    The owner, page index, expiry and where the pages came from are signed into the
+    buttons' custom_ids, so a click works in any process, even after a restart, as long
+    as its pages are cached or can be fetched again.
     """
 
-    _registry: Dict[int, PaginationState] = {}  # message_id -> pagination state
     _timeout = 180.0
 
-    def __init__(self, pages: List[Container], author_id: int):
+    def __init__(self, pages: Sequence[Container], author_id: int):
         self.pages = pages
         self.author_id = author_id
 
-    def _render(self, index: int, disabled: bool = False) -> MessageComponents:
-        if disabled:
-            return [self.pages[index]]
+    def _key(self) -> str:
+        source = self.pages.source if isinstance(self.pages, LazyPages) else None
 
-        previous_button = Button(
-            emoji="⬅️",
-            style=ButtonStyle.secondary,
-            custom_id="pagination:prev",
-        )
-        next_button = Button(
-            emoji="➡️",
-            style=ButtonStyle.secondary,
-            custom_id="pagination:next",
+        if source is not None and custom_ids.fits("pagination:next", source):
+            return source
+
+        # The same long request from the same user gets the same key, so the cache keeps
+        # one copy of its pages.
+        if source is not None:
+            digest = hashlib.blake2b(source.encode(), digest_size=9).digest()
+            return _cached_only + base64.urlsafe_b64encode(digest).decode()
+
+        return _cached_only + secrets.token_urlsafe(9)
+
+    @classmethod
+    def _render(
+        cls, pages: Sequence[Container], index: int, owner_id: int, key: str
+    ) -> MessageComponents:
+        # The timeout counts from the last time a page was shown.
+        state = ComponentState(owner_id, key, index, int(time.time() + cls._timeout))
+
+        navigation = ActionRow(
+            Button(
+                emoji="⬅️",
+                style=ButtonStyle.secondary,
+                custom_id=custom_ids.encode("pagination:prev", state),
+            ),
+            Button(
+                emoji="➡️",
+                style=ButtonStyle.secondary,
+                custom_id=custom_ids.encode("pagination:next", state),
+            ),
         )
 
-        row = ActionRow(previous_button, next_button)
-        return [self.pages[index], row]
+        return [pages[index], navigation]
 
     async def send(
         self,
@@ -88,78 +129,81 @@ class ComponentPaginator:
             | ApplicationCommandInteraction
         ),
     ):
-        components = self._render(0)
+        key = self._key()
+        page_cache.put(self.author_id, key, self.pages)
+        components = self._render(self.pages, 0, self.author_id, key)
 
         if isinstance(sendable, (MessageInteraction, ApplicationCommandInteraction)):
             msg = await sendable.followup.send(components=components, wait=True)
         else:
             msg = await sendable.send(components=components)
 
-        self._registry[msg.id] = PaginationState(
-            author_id=self.author_id,
-            pages=self.pages,
-            index=0,
-            message=msg,
-            task=asyncio.create_task(self._auto_disable_runner(msg.id)),
-        )
+        scheduler.schedule(msg.id, self._timeout, partial(self._expire, msg))
 
         return msg
 
     @classmethod
-    async def handle_click(cls, inter: MessageInteraction):
-        localization = i18n.get_i18n_or_default(inter.locale.name)
-
-        state = cls._registry.get(inter.message.id)
+    async def handle_click(cls, inter: MessageInteraction, fetch_pages: PageFetcher):
+        state = custom_ids.decode(inter.data.custom_id)
         if state is None:
             return
 
-        if inter.author.id != state.author_id:
+        if inter.author.id != state.owner_id:
+            localization = i18n.get_i18n_or_default(inter.locale.name)
             await inter.send(localization["PAGINATOR_FORBIDDEN"], ephemeral=True)
             return
 
-        state.last_interacted = time.time()
-        if state.task and not state.task.done():
-            state.task.cancel()
-        state.task = asyncio.create_task(cls._auto_disable_runner(inter.message.id))
+        pages = None if state.expired else await cls._pages(inter, state, fetch_pages)
+
+        # Expired while no process was around to remove the buttons, or its pages are gone.
+        if not pages:
+            scheduler.cancel(inter.message.id)
+            await inter.followup.edit_message(
+                inter.message.id, components=_without_navigation(inter.message)
+            )
+            return
 
-        custom_id = inter.data.custom_id
-        if custom_id == "pagination:prev":
-            state.index = (state.index - 1) % len(state.pages)
-        elif custom_id == "pagination:next":
-            state.index = (state.index + 1) % len(state.pages)
+        name = custom_ids.name_of(inter.data.custom_id)
+        if name == "pagination:prev":
+            index = (state.index - 1) % len(pages)
+        elif name == "pagination:next":
+            index = (state.index + 1) % len(pages)
         else:
             return
 
-        await inter.followup.edit_message(
+        msg = await inter.followup.edit_message(
             inter.message.id,
-            components=cls(state.pages, state.author_id)._render(state.index),
+            components=cls._render(pages, index, state.owner_id, state.key),
         )
+        scheduler.schedule(msg.id, cls._timeout, partial(cls._expire, msg))
 
     @classmethod
-    async def _auto_disable_runner(cls, message_id: int):
-        try:
-            state = cls._registry.get(message_id)
-            if not state:
-                return
+    async def _pages(
+        cls, inter: MessageInteraction, state: ComponentState, fetch_pages: PageFetcher
+    ) -> Optional[Sequence[Container]]:
+        pages = page_cache.get(state.owner_id, state.key)
 
-            while True:
-                now = time.time()
-                remaining = cls._timeout - (now - state.last_interacted)
+        if pages is not None:
+            _from_cache.inc()
+            return pages
 
-                if remaining <= 0:
-                    break
+        if state.key.startswith(_cached_only):
+            _missing.inc()
+            return None
 
-                await asyncio.sleep(min(remaining, 5))
+        pages = await fetch_pages(inter.channel, inter.author, state.key)
 
-            disabled = cls(state.pages, state.author_id)._render(
-                state.index, disabled=True
-            )
+        if pages is None:
+            _missing.inc()
+            return None
 
-            try:
-                await state.message.edit(components=disabled)
-            except Exception:
-                pass
+        _from_backend.inc()
+        page_cache.put(state.owner_id, state.key, pages)
+        return pages
 
-            cls._registry.pop(message_id, None)
-        except asyncio.CancelledError:
-            return
+    @staticmethod
+    async def _expire(message: Message):
+        try:
+            await message.edit(components=_without_navigation(message))
+        except Exception:
+            pass
@@ -6,34 +6,69 @@ License, v. 2.0. If a copy of the MPL was not distributed with this file,
 You can obtain one at https://mozilla.org/MPL/2.0/.
 """
 
+from collections import OrderedDict
+from collections.abc import Sequence as SequenceABC
+from typing import Any, Callable, Optional, Sequence, Union
+
 from core import constants
+from core.models import EmbedPage, Verse
 from disnake import SeparatorSpacing
 from disnake.ui import Container, Section, Separator, TextDisplay, Thumbnail
+from services import render_cache
 
 
 @staticmethod
-def convert_verse_to_container(verse, localization) -> Container:
+def convert_verse_to_container(verse: Verse, localization: str) -> Container:
+    # The returned container may be shared with other messages, it must not be changed.
+    version = verse.reference.version
+    cache_key = render_cache.key(
+        "verse",
+        verse.reference.as_string,
+        version.name,
+        version.publisher,
+        verse.title,
+        verse.text,
+        localization,
+        constants.version,
+    )
+
+    container = render_cache.cache.get(cache_key)
+
+    if container is None:
+        container = _build_verse_container(verse, localization)
+        render_cache.cache.put(
+            cache_key,
+            container,
+            render_cache.text_size(
+                *(
+                    child.content
+                    for child in container.children
+                    if hasattr(child, "content")
+                )
+            ),
+        )
+
+    return container
+
+
+def _build_verse_container(verse: Verse, localization: str) -> Container:
     container = Container()
 
     container.accent_color = 6709986
 
-    reference_title = (
-        verse["reference"]["asString"] + " - " + verse["reference"]["version"]["name"]
-    )
-
-    container.children.append(TextDisplay(f"### {reference_title}"))
+    container.children.append(TextDisplay(f"### {verse.reference_title}"))
 
-    if len(verse["title"]) > 0:
-        container.children.append(TextDisplay(f"**{verse['title']}**"))
+    if len(verse.title) > 0:
+        container.children.append(TextDisplay(f"**{verse.title}**"))
 
-    container.children.append(TextDisplay(f"{verse['text']}"))
+    container.children.append(TextDisplay(f"{verse.text}"))
 
     container.children.append(Separator(divider=True, spacing=SeparatorSpacing.large))
 
-    if verse["reference"]["version"]["publisher"] is not None:
-        publisher_info = constants.publisher_to_url[
-            verse["reference"]["version"]["publisher"]
-        ]
+    publisher = verse.reference.version.publisher
+
+    if publisher is not None:
+        publisher_info = constants.publisher_to_url.get(publisher)
 
         if publisher_info is not None:
             container.children.append(
@@ -58,48 +93,48 @@ def convert_verse_to_container(verse, localization) -> Container:
 
 
 @staticmethod
-def convert_embed_to_container(internal_embed) -> Container:
+def convert_embed_to_container(internal_embed: EmbedPage) -> Container:
     container = Container()
     section = None
     section_text = ""
 
-    container.accent_color = internal_embed["color"]
+    container.accent_color = internal_embed.color
 
-    if internal_embed["thumbnail"] is not None:
-        section = Section(accessory=Thumbnail(media=internal_embed["thumbnail"]["url"]))
+    if internal_embed.thumbnail_url is not None:
+        section = Section(accessory=Thumbnail(media=internal_embed.thumbnail_url))
 
-    if internal_embed["url"] is not None:
-        title = TextDisplay(f"### [{internal_embed['title']}]({internal_embed['url']})")
+    if internal_embed.url is not None:
+        title = TextDisplay(f"### [{internal_embed.title}]({internal_embed.url})")
     else:
-        title = TextDisplay(f"### {internal_embed['title']}")
+        title = TextDisplay(f"### {internal_embed.title}")
 
     if section is None:
         container.children.append(title)
     else:
         section_text += title.content
 
-    if internal_embed["description"] is not None:
-        description = TextDisplay(f"{internal_embed['description']}")
+    if internal_embed.description is not None:
+        description = TextDisplay(f"{internal_embed.description}")
 
         if section is None:
             container.children.append(description)
         else:
             section_text += f"\n\n{description.content}"
 
-    if internal_embed["fields"] is not None:
+    if internal_embed.fields is not None:
         if section is None and len(container.children) > 0:
             container.children.append(
                 Separator(divider=False, spacing=SeparatorSpacing.small)
             )
 
-        for field in internal_embed["fields"]:
-            field_name = TextDisplay(f"**{field['name']}**")
-            field_value = TextDisplay(f"{field['value']}")
+        for field in internal_embed.fields:
+            field_name = TextDisplay(f"**{field.name}**")
+            field_value = TextDisplay(f"{field.value}")
 
             if section is None:
                 container.children.append(field_name)
                 container.children.append(field_value)
-                if field["add_separator_after"]:
+                if field.add_separator_after:
                     container.children.append(
                         Separator(divider=True, spacing=SeparatorSpacing.large)
                     )
@@ -114,9 +149,7 @@ def convert_embed_to_container(internal_embed) -> Container:
     container.children.append(Separator(divider=True, spacing=SeparatorSpacing.large))
 
     container.children.append(
-        TextDisplay(
-            f"-# {constants.logo_emoji}  **{internal_embed['footer']['text']}**"
-        )
+        TextDisplay(f"-# {constants.logo_emoji}  **{internal_embed.footer_text}**")
     )
 
     return container
@@ -163,13 +196,73 @@ def create_success_container(title, description, localization) -> Container:
 
 
 @staticmethod
-def mass_create_containers(pages, localization, is_verses=False) -> list[Container]:
-    containers = []
+def mass_create_containers(
+    pages: Sequence[Union[EmbedPage, Verse]],
+    localization,
+    is_verses=False,
+    source: Optional[str] = None,
+) -> "LazyPages":
+    # Each page is only rendered when it's shown.
+    if is_verses:
+        return LazyPages(
+            pages,
+            lambda verse: convert_verse_to_container(verse, localization),
+            source=source,
+        )
 
-    for page in pages:
-        if is_verses:
-            containers.append(convert_verse_to_container(page, localization))
+    return LazyPages(pages, convert_embed_to_container, source=source)
+
+
+class LazyPages(SequenceABC):
+    """
+    Pages that are only rendered into containers when they're shown.
+    Parameters:
+    ----------
+    pages: Sequence[Any]
+        The raw pages, such as EmbedPages or Verses, which take far less memory than their containers.
+    render: Callable[[Any], Container]
+        Renders a raw page into its container.
+    cache_size: int
+        How many rendered pages are kept, so going back and forth doesn't render them again.
+    source: Optional[str]
+        The request the pages came from, for fetching them again (see backend.fetch_pages).
+
+    Most users never go past the first page of a /search or resource result, so the rest
+    are never rendered.
+    """
+
+    def __init__(
+        self,
+        pages: Sequence[Any],
+        render: Callable[[Any], Container],
+        cache_size: int = 3,
+        source: Optional[str] = None,
+    ):
+        self.pages = pages
+        self.render = render
+        self.cache_size = cache_size
+        self.source = source
+        self._rendered: OrderedDict[int, Container] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self.pages)
+
+        container = self._rendered.get(index)
+
+        if container is None:
+            container = self.render(self.pages[index])
+            self._rendered[index] = container
+
+            while len(self._rendered) > self.cache_size:
+                self._rendered.popitem(last=False)
         else:
-            containers.append(convert_embed_to_container(page))
+            self._rendered.move_to_end(index)
 
-    return containers
+        return container
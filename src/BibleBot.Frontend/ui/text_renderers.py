@@ -0,0 +1,82 @@
+"""
+Copyright (C) 2016-2026 Kerygma Digital Co.
+
+This Source Code Form is subject to the terms of the Mozilla Public
+License, v. 2.0. If a copy of the MPL was not distributed with this file,
+You can obtain one at https://mozilla.org/MPL/2.0/.
+"""
+
+# Renders verses as plain message text, for the "blockquote" and "code" display styles.
+#
+# Everything that doesn't depend on the verse is worked out once: the publisher links and,
+# the first time a footer is seen, the footer line. Each style is a single f-string over
+# those and the verse's own fields, which CPython builds in one pass, like a join.
+
+from typing import Callable, Dict, Iterable, List, Optional
+
+from core import constants
+from core.models import Verse
+
+text_styles = ("blockquote", "code")
+
+_publisher_suffixes: Dict[str, str] = {
+    publisher: f" ∙ [{info['name']}](<{info['url']}>)"
+    for publisher, info in constants.publisher_to_url.items()
+    if info is not None
+}
+
+
+# Culture footer -> its footer line. There's one footer per language and bot version.
+_footer_lines: Dict[str, str] = {}
+
+
+def _footer_line(footer: str) -> str:
+    line = _footer_lines.get(footer)
+
+    if line is None:
+        line = _footer_lines[footer] = f"\n\n-# {constants.logo_emoji}  {footer}"
+
+    return line
+
+
+def _blockquote(verse: Verse, footer_line: str, publisher_suffix: str) -> str:
+    title = f"**{verse.title}**\n> \n> " if verse.title else ""
+    # Every line has to be quoted, not only the first.
+    text = verse.text.replace("\n", "\n> ")
+
+    return (
+        f"**{verse.reference_title}**\n\n> {title}{text}{footer_line}{publisher_suffix}"
+    )
+
+
+def _code(verse: Verse, footer_line: str, publisher_suffix: str) -> str:
+    title = f"{verse.title}\n\n" if verse.title else ""
+    text = verse.text.replace("*", "")
+
+    return f"**{verse.reference_title}**\n\n```json\n{title} {text}```{footer_line}{publisher_suffix}"
+
+
+_templates: Dict[str, Callable[[Verse, str, str], str]] = {
+    "blockquote": _blockquote,
+    "code": _code,
+}
+
+
+def render_verses(
+    verses: Iterable[Verse], display_style: str, footer: Optional[str]
+) -> List[str]:
+    """Renders each verse as the text of one message, in `display_style`.
+
+    `footer` is the response's culture footer, the default footer is used without one.
+    """
+    template = _templates[display_style]
+    footer_line = _footer_line(footer if footer is not None else constants.verse_footer)
+
+    return [
+        template(
+            verse,
+            footer_line,
+            _publisher_suffixes.get(verse.reference.version.publisher, ""),
+        )
+        for verse in verses
+    ]